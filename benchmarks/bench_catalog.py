@@ -0,0 +1,176 @@
+"""
+Katalog stanica: učitavanje, pretraga i izmena jedne stanice na 1k/10k/50k
+
+    python -m benchmarks.bench_catalog [--sizes 1000 10000 50000]
+
+Tri varijante istog kataloga (50 kategorija, stanica u 1-3 kategorije):
+"staro" je dict listi i ceo stations.json sa indent=2 na svaku izmenu,
+"json" je StationCatalog u sekciji "stations", "sqlite" je SqliteCatalog
+(tabele + FTS5 u settings.db). Učitavanje je ono što meni traži na startu:
+novo skladište, kategorije i stanice prve kategorije. Izmena je
+add_station()/remove_station() + save_stations() + izvoz u stations.json,
+kao da je svaka izmena sama u svom EXPORT_DELAY_MS prozoru (najgori slučaj).
+Izvoz se piše u pozadinskom thread-u, pa je u vremenu izmene ono što plaća
+GUI thread (pokretanje i kraj izvoza); "petlja" je najduža pauza Qt petlje
+dok izvoz radi (GIL).
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import app, summary
+from PyQt6.QtCore import QEventLoop
+from traywave.core.settings import SettingsStore
+from traywave.core.stations import StationsManager
+
+WORDS = ("radio fm jazz rock dance deep house classic lounge chill hits pop trance techno smooth "
+         "soul funk metal indie news talk beograd berlin paris wave sun night city love").split()
+QUERIES = ("jazz", "deep house", "beo", "night city", "nema takve")
+EDITS = 20
+
+
+def make_catalog(n: int, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    categories = {f"Žanr {i}": [] for i in range(50)}
+    names = list(categories)
+    for i in range(n):
+        name = " ".join(rng.sample(WORDS, 3)) + f" {i}"
+        url = f"http://s{i % 997}.example.net:8000/stream{i}"
+        for category in rng.sample(names, rng.choice((1, 1, 2, 3))):
+            categories[category].append([name, url])
+    return categories
+
+
+def timed(func, repeat: int = 1):
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples, result
+
+
+def bench_legacy(categories: dict, directory: str) -> dict:
+    path = os.path.join(directory, "stations.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(categories, f, indent=2, ensure_ascii=False)
+
+    def load():
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    load_ms, data = timed(load)
+
+    def search():
+        return [[s for stations in data.values() for s in stations if q in s[0].lower()][:50]
+                for q in QUERIES]
+
+    search_ms, _ = timed(search, 3)
+    counter = iter(range(10 ** 9))
+
+    def save():
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def add():
+        i = next(counter)
+        data["Žanr 3"].append([f"nova {i}", f"http://nova.example/{i}"])
+        save()
+
+    def remove():
+        data["Žanr 3"].pop(0)
+        save()
+
+    add_ms, _ = timed(add, EDITS)
+    remove_ms, _ = timed(remove, EDITS)
+    return {"load": load_ms, "search": [ms / len(QUERIES) for ms in search_ms], "add": add_ms,
+            "remove": remove_ms, "stall": None, "bytes": os.path.getsize(path)}
+
+
+def bench_backend(categories: dict, directory: str, backend: str) -> dict:
+    path = os.path.join(directory, "settings.db")
+    settings = SettingsStore(path)
+    settings.put("config", {"catalog_backend": backend})
+    manager = StationsManager(config_dir=directory, settings=settings)
+    manager.catalog.import_categories(categories)
+    manager.save_stations()
+    manager.flush()
+    settings.close()
+
+    def load():
+        store = SettingsStore(path)
+        fresh = StationsManager(config_dir=directory, settings=store)
+        first = fresh.get_categories()[0]
+        fresh.get_stations(first)
+        return fresh
+
+    load_ms, manager = timed(load)
+    search_ms, _ = timed(lambda: [manager.search(q, 50) for q in QUERIES], 3)
+    counter = iter(range(10 ** 9))
+    stalls = []
+
+    def with_export(edit):
+        def run():
+            started = time.perf_counter()
+            edit()
+            manager.save_stations()
+            manager._export_in_background()  # isto što radi tajmer
+            gui = time.perf_counter() - started
+            last = time.perf_counter()
+            while manager._export_thread is not None:
+                started = time.perf_counter()
+                app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 5)
+                if manager._export_thread is None:
+                    gui += time.perf_counter() - started  # _finish_export() kroz signal
+                time.sleep(0.001)
+                now = time.perf_counter()
+                stalls.append((now - last) * 1000)
+                last = now
+            return gui * 1000
+        return run
+
+    def add():
+        i = next(counter)
+        assert manager.add_station("Žanr 3", f"nova {i}", f"http://nova.example/{i}")
+
+    def remove():
+        assert manager.remove_station("Žanr 3", 0)
+
+    add_ms = [with_export(add)() for _ in range(EDITS)]
+    remove_ms = [with_export(remove)() for _ in range(EDITS)]
+    assert not manager._export_pending
+    manager.settings.close()
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+               if name.startswith("settings.db"))
+    return {"load": load_ms, "search": [ms / len(QUERIES) for ms in search_ms], "add": add_ms,
+            "remove": remove_ms, "stall": max(stalls, default=0.0), "bytes": size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    print(f"pretraga: prosek po upitu {QUERIES}, izmena: {EDITS} puta, vreme u ms\n")
+    for n in args.sizes:
+        categories = make_catalog(n)
+        for backend in ("staro", "json", "sqlite"):
+            directory = tempfile.mkdtemp(prefix="traywave-catalog-")
+            if backend == "staro":
+                result = bench_legacy(categories, directory)
+            else:
+                result = bench_backend(categories, directory, backend)
+            stall = f"  petlja max {result['stall']:.1f}" if result["stall"] is not None else ""
+            print(f"{n:>6} {backend:<7} učitavanje {result['load'][0]:8.1f}  "
+                  f"na disku {result['bytes'] / 1e6:6.2f} MB")
+            print(f"{'':>6} {'':<7} pretraga   {summary(result['search'])}")
+            print(f"{'':>6} {'':<7} dodavanje  {summary(result['add'])}{stall}")
+            print(f"{'':>6} {'':<7} brisanje   {summary(result['remove'])}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Charset ICY naslova: keširana odluka po stanici protiv detekcije za svaki blok
+
+    python -m benchmarks.bench_charset [--blocks 200000]
+
+Za svaki codec (utf-8, cp1250, iso-8859-2) ista lista EX-YU naslova ide kroz:
+StationDecoder (detekcija na prvih SAMPLE_BLOCKS blokova, posle jedan
+decode()), detect_charset() za svaki blok, i stari decode("utf-8",
+errors="ignore") koji je brz ali gubi š/č/ć/ž. Kolona "tačno" je udeo
+blokova dekodiranih u originalni tekst.
+"""
+import argparse
+import time
+
+from traywave.core.charset import StationDecoder, detect_charset
+
+TITLES = [
+    "Zdravko Čolić - Pođoh u grad",
+    "Đorđe Balašević - Računajte na nas",
+    "Šaban Šaulić - Željo moja",
+    "Bajaga i Instruktori - Moji drugovi",
+    "Neda Ukraden - Ćao ćao",
+    "Riblja Čorba - Ostani đubre do kraja",
+    "Električni Orgazam - Igra rokenrol cela Jugoslavija",
+]
+
+
+def cached(data):
+    decoder = StationDecoder("bench")
+    return [decoder.decode(block) for block in data]
+
+
+def per_block(data):
+    return [block.decode(detect_charset(block), errors="replace") for block in data]
+
+
+def legacy(data):
+    return [block.decode("utf-8", errors="ignore") for block in data]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=200000)
+    args = parser.parse_args()
+
+    texts = [f"StreamTitle='{TITLES[i % len(TITLES)]}';" for i in range(args.blocks)]
+    print(f"{args.blocks} metadata blokova po codec-u\n")
+    print(f"{'codec':<12} {'način':<22} {'µs/blok':>8} {'tačno':>8}")
+    for codec in ("utf-8", "cp1250", "iso-8859-2"):
+        data = [text.encode(codec) for text in texts]
+        results = {}
+        for label, decode in (("keširana odluka", cached), ("detekcija po bloku", per_block),
+                              ("utf-8 ignore (staro)", legacy)):
+            started = time.perf_counter()
+            decoded = decode(data)
+            elapsed = time.perf_counter() - started
+            correct = sum(a == b for a, b in zip(decoded, texts)) / len(texts)
+            results[label] = elapsed
+            print(f"{codec:<12} {label:<22} {elapsed / len(data) * 1e6:8.2f} {correct:8.1%}")
+        speedup = results["detekcija po bloku"] / results["keširana odluka"]
+        print(f"{'':<12} keširana odluka je {speedup:.1f}x brža od detekcije po bloku\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+ConfigManager pod točkićem miša: set_volume() pozivi protiv upisa u SQLite
+
+    python -m benchmarks.bench_config [--seconds 3]
+
+AudioEngine.set_volume() se zove na svaki tick točkića (eventFilter u
+tray-u) i svaki korak slidera. "sinhrono" je staro ponašanje - upis cele
+sekcije na svaki poziv, na GUI thread-u; "write-behind" je ConfigManager
+koji upisuje najviše jednom na FLUSH_MS iz pozadinskog thread-a. Broje se
+stvarni commit-i SettingsStore-a i vreme set_volume() poziva.
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.common import null_engine, summary
+from traywave.core.engine import ConfigManager
+from traywave.core.settings import SettingsStore, shared_settings
+
+
+class SyncConfigManager(ConfigManager):
+    """Staro ponašanje: svaki set() odmah upisuje"""
+
+    def set(self, key: str, value):
+        super().set(key, value)
+        self.flush()
+
+
+def spam(engine, seconds: float, ticks_per_second: float):
+    settings = engine.config.settings
+    gap = 1 / ticks_per_second if ticks_per_second else 0
+    call_ms = []
+    commits = settings.commits
+    started = time.monotonic()
+    tick = 0
+    while time.monotonic() - started < seconds:
+        before = time.perf_counter()
+        engine.set_volume(tick % 101)
+        call_ms.append((time.perf_counter() - before) * 1000)
+        tick += 1
+        if gap:
+            time.sleep(max(0.0, started + tick * gap - time.monotonic()))
+    elapsed = time.monotonic() - started
+    engine.config.close()
+    return call_ms, (settings.commits - commits) / elapsed, (tick - 1) % 101
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = null_engine()
+        engine.config.close()
+        settings = shared_settings()
+        for ticks in (60, 250, 0):
+            for label, manager in (("sinhrono", SyncConfigManager), ("write-behind", ConfigManager)):
+                engine.config = manager(settings)
+                call_ms, commits, last = spam(engine, args.seconds, ticks)
+                stored = SettingsStore(settings.path)
+                persisted = stored.get("config")["volume"] == last
+                stored.close()
+                rows.append((ticks, label, call_ms, commits, persisted))
+        engine.shutdown()
+
+    print(f"{args.seconds:.0f} s točkića po prolazu, write-behind FLUSH_MS = {ConfigManager.FLUSH_MS}\n")
+    for ticks, label, call_ms, commits, persisted in rows:
+        rate = f"{ticks}/s" if ticks else "bez pauze"
+        print(f"{rate:<10} {label:<13} {len(call_ms) / args.seconds:8.0f} set_volume()/s  "
+              f"{commits:8.1f} commit/s  poziv {summary(call_ms)} ms"
+              f"{'' if persisted else '  POSLEDNJA VREDNOST NIJE NA DISKU'}")
+
+
+if __name__ == "__main__":
+    main()
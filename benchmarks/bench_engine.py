@@ -0,0 +1,70 @@
+"""
+AudioEngine kroz null backend i lokalni lažni Icecast: vreme do zvuka
+
+    python -m benchmarks.bench_engine [--plays 40]
+
+Null plejer troši tačno connect_ms + buffer_ms do Buffered, pa je razlika
+do izmerenog vremena ono što dodaje engine (resolver, probe, sesije,
+Qt signali). Hladan start je nov plejer za stanicu, topao je plejer koji
+je PlayerPool već napunio (prewarm iz menija).
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.common import null_engine, pump, summary, wait_until
+from tests.fakeserver import FakeIcecast
+
+
+def playing(engine, url: str) -> bool:
+    active = engine._active
+    return (active is not None and active.url == url and active.buffered_at is not None
+            and engine.is_playing())
+
+
+def measure(engine, urls, warm: bool):
+    call_ms, ttfa_ms = [], []
+    for url in urls:
+        if warm:
+            engine.player_pool.warm(url)
+            wait_until(lambda: engine.player_pool._entries[url].is_buffered)
+        started = time.monotonic()
+        engine.play(url, url.rsplit("/", 1)[-1])
+        call_ms.append((time.monotonic() - started) * 1000)
+        if not wait_until(lambda: playing(engine, url)):
+            raise RuntimeError(f"{url} nije zasvirao")
+        ttfa_ms.append((time.monotonic() - started) * 1000)
+        pump(engine.PLAY_COALESCE_MS / 1000)  # sledeći play() ne sme da se spoji sa ovim
+    return call_ms, ttfa_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--plays", type=int, default=40)
+    args = parser.parse_args()
+
+    rows = []
+    for content_type in ("audio/mpeg", "application/ogg"):
+        server = FakeIcecast(content_type=content_type, rate=32000).start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine = null_engine(warm_pool_size=2)
+            backend = engine._ensure_backend()
+            floor = backend.connect_ms + backend.buffer_ms
+            cold = measure(engine, [server.url(f"/cold{i}") for i in range(args.plays)], warm=False)
+            warm = measure(engine, [server.url(f"/warm{i}") for i in range(args.plays)], warm=True)
+            engine.shutdown()
+        server.stop()
+        rows.append((content_type, "hladan", cold, floor))
+        rows.append((content_type, "topao", warm, 0))
+
+    print(f"null backend: connect + buffer = {floor} ms po hladnom startu, {args.plays} stanica\n")
+    for content_type, kind, (call_ms, ttfa_ms), floor in rows:
+        overhead = [ms - floor for ms in ttfa_ms]
+        print(f"{content_type:<16} {kind:<7} play() poziv   {summary(call_ms)}")
+        print(f"{'':<16} {'':<7} do zvuka       {summary(ttfa_ms)}")
+        print(f"{'':<16} {'':<7} engine dodaje  {summary(overhead)}")
+
+
+if __name__ == "__main__":
+    main()
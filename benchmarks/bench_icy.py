@@ -0,0 +1,130 @@
+"""
+ICY demuxer: MB/s parsiranja, IcyDemuxer naspram starog MetadataWorker.run
+
+    python -m benchmarks.bench_icy [--mb 64]
+
+Stari parser je verna kopija petlje iz MetadataWorker.run (buffer += chunk,
+pa buffer = buffer[n:] za svaki deo intervala), bez mreže i dekodiranja
+naslova - meri se samo razdvajanje audio/metadata. Oba dobijaju iste komade
+slučajne veličine (kao read-ovi sa socket-a, do 4 KB ili do 64 KB). Kolona
+"blokova" pokazuje i ispravnost: stari parser gubi sinhronizaciju kad komad
+završi tačno pre length bajta i posle toga čita audio kao metadata blokove.
+"""
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from traywave.core.icy import IcyDemuxer
+from tests.fakeserver import icy_block
+
+CHUNKS = (4096, 65536)  # iter_content(chunk_size=4096) u starom worker-u; veliki read
+
+
+def chunk_sizes(total: int, chunk: int, seed: int = 2) -> List[int]:
+    """Veličine read-ova kao sa mreže: uglavnom pun chunk, ponekad manje"""
+    rng = random.Random(seed)
+    sizes = []
+    while total > 0:
+        size = chunk if rng.random() < 0.7 else rng.randint(1, chunk)
+        sizes.append(size)
+        total -= size
+    return sizes
+
+
+def make_stream(metaint: int, total: int, seed: int = 1) -> bytes:
+    """Stream od ~total bajtova; naslov na svaki četvrti interval, inače prazan blok"""
+    rng = random.Random(seed)
+    audio = rng.getrandbits(8 * metaint).to_bytes(metaint, "little")
+    out = bytearray()
+    block = 0
+    while len(out) < total:
+        out += audio
+        out += icy_block(f"Artist {block} - Song {block}" if block % 4 == 0 else None)
+        block += 1
+    return bytes(out)
+
+
+def legacy_parse(stream: bytes, metaint: int, sizes: List[int]) -> List[bytes]:
+    """Petlja iz starog MetadataWorker.run"""
+    blocks = []
+    buffer = b''
+    bytes_until_metadata = metaint
+    pos = 0
+    for size in sizes:
+        buffer += stream[pos:pos + size]
+        pos += size
+        while len(buffer) >= bytes_until_metadata:
+            buffer = buffer[bytes_until_metadata:]
+            if len(buffer) < 1:
+                break
+            meta_length = buffer[0] * 16
+            buffer = buffer[1:]
+            if meta_length > 0:
+                if len(buffer) >= meta_length:
+                    blocks.append(buffer[:meta_length])
+                    buffer = buffer[meta_length:]
+                    bytes_until_metadata = metaint
+                else:
+                    bytes_until_metadata = 0
+                    break
+            else:
+                bytes_until_metadata = metaint
+    return blocks
+
+
+def demuxer_chunks(stream: bytes, metaint: int, sizes: List[int]) -> List[bytes]:
+    """IcyDemuxer sa istim komadima"""
+    demuxer = IcyDemuxer(metaint, on_audio=lambda view: None)
+    view = memoryview(stream)
+    blocks = []
+    pos = 0
+    for size in sizes:
+        blocks += demuxer.feed(view[pos:pos + size])
+        pos += size
+    return blocks
+
+
+def demuxer_read_size(stream: bytes, metaint: int, sizes: List[int]) -> List[bytes]:
+    """IcyDemuxer kako ga čita MetadataService - jedan read po intervalu"""
+    demuxer = IcyDemuxer(metaint, on_audio=lambda view: None)
+    view = memoryview(stream)
+    blocks = []
+    pos = 0
+    while pos < len(view):
+        size = demuxer.next_read_size()
+        blocks += demuxer.feed(view[pos:pos + size])
+        pos += size
+    return blocks
+
+
+def measure(parse: Callable, stream: bytes, metaint: int, sizes: List[int], repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        blocks = parse(stream, metaint, sizes)
+        best = min(best, time.perf_counter() - started)
+    return len(stream) / best / 1e6, len(blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mb", type=int, default=64, help="veličina streama u MB")
+    args = parser.parse_args()
+
+    print(f"{'metaint':>8} {'read':>6} {'parser':<28} {'MB/s':>9} {'blokova':>12}")
+    for metaint in (8192, 16000):
+        stream = make_stream(metaint, args.mb * 1024 * 1024)
+        expected = len(IcyDemuxer(metaint).feed(stream))
+        for chunk in CHUNKS:
+            sizes = chunk_sizes(len(stream), chunk)
+            for name, parse in (("stari MetadataWorker.run", legacy_parse),
+                                ("IcyDemuxer, isti komadi", demuxer_chunks)):
+                mb_s, blocks = measure(parse, stream, metaint, sizes)
+                print(f"{metaint:>8} {chunk // 1024:>4} K {name:<28} {mb_s:>9.1f} {blocks:>6}/{expected}")
+        mb_s, blocks = measure(demuxer_read_size, stream, metaint, [])
+        print(f"{metaint:>8} {'-':>6} {'IcyDemuxer, next_read_size':<28} {mb_s:>9.1f} {blocks:>6}/{expected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Multimedia stek: AudioEngine() i play -> stop -> oslobađanje, vreme i RSS
+
+    python -m benchmarks.bench_media [--cycles 5] [--idle 0.3] [--backend null]
+
+AudioEngine() ne pravi backend ni plejere - oni nastaju na prvi play() i
+nestaju media_idle_release_s posle stop-a (_release_media). Meri se uvoz
+engine modula, prvi i ponovljeni AudioEngine(), pa ciklusi play -> stop ->
+oslobađanje: vreme do zvuka, RSS dok svira i RSS posle oslobađanja (ako
+raste iz ciklusa u ciklus, nešto ostaje iza plejera).
+
+U ovom okruženju PyQt6.QtMultimedia nije instaliran, pa se meri null
+backend: brojevi pokazuju trošak engine-a, sesija i relay-a, a ne
+QMediaPlayer/FFmpeg/PulseAudio. --backend qt ili mpv meri pravi stek tamo
+gde postoji (nedostupan backend pada na null, uz napomenu u izlazu).
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import shutil
+import time
+
+from benchmarks.common import pump, summary, wait_until
+from tests.fakeserver import FakeIcecast
+
+
+def rss_mb() -> float:
+    """Trenutni RSS procesa (Linux /proc)"""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def pick_backend(name: str) -> str:
+    if name == "qt":
+        try:
+            import PyQt6.QtMultimedia  # noqa: F401
+        except ImportError:
+            print("⚠️  PyQt6.QtMultimedia nije dostupan - merim null backend")
+            return "null"
+    if name == "mpv" and shutil.which("mpv") is None:
+        print("⚠️  mpv nije pronađen - merim null backend")
+        return "null"
+    return name
+
+
+def make_engine(backend: str, idle: float):
+    from traywave.core.engine import AudioEngine
+    from traywave.core.settings import shared_settings
+    shared_settings().put("config", {"backend": backend, "timeshift_minutes": 0,
+                                     "media_idle_release_s": idle})
+    return AudioEngine()
+
+
+def playing(engine) -> bool:
+    active = engine._active
+    return active is not None and active.buffered_at is not None and engine.is_playing()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--idle", type=float, default=0.3, help="media_idle_release_s")
+    parser.add_argument("--backend", default="null", choices=("null", "qt", "mpv"))
+    args = parser.parse_args()
+    backend = pick_backend(args.backend)
+
+    server = FakeIcecast(rate=32000).start()
+    cycles = []
+    backend_name = backend
+    with contextlib.redirect_stdout(io.StringIO()):
+        before = rss_mb()
+        started = time.perf_counter()
+        import traywave.core.engine  # noqa: F401
+        import_ms, import_rss = (time.perf_counter() - started) * 1000, rss_mb() - before
+
+        before = rss_mb()
+        started = time.perf_counter()
+        engine = make_engine(backend, args.idle)
+        first_ms, first_rss = (time.perf_counter() - started) * 1000, rss_mb() - before
+        engine.shutdown()
+
+        again_ms = []
+        for _ in range(10):
+            started = time.perf_counter()
+            make_engine(backend, args.idle).shutdown()
+            again_ms.append((time.perf_counter() - started) * 1000)
+        pump(0.1)
+
+        engine = make_engine(backend, args.idle)
+        gc.collect()
+        idle_rss = rss_mb()
+        for _ in range(args.cycles):
+            started = time.perf_counter()
+            engine.play(server.url(), "Bench")
+            if not wait_until(lambda: playing(engine)):
+                raise RuntimeError("stanica nije zasvirala")
+            play_ms = (time.perf_counter() - started) * 1000
+            pump(0.5)
+            playing_rss = rss_mb()
+            backend_name = engine.backend.name
+
+            started = time.perf_counter()
+            engine.stop()
+            if not wait_until(lambda: engine.backend is None, timeout=args.idle + 5):
+                raise RuntimeError("backend nije oslobođen")
+            release_s = time.perf_counter() - started
+            pump(0.1)
+            gc.collect()
+            cycles.append((play_ms, playing_rss, release_s, rss_mb()))
+        engine.shutdown()
+    server.stop()
+
+    print(f"backend: {backend_name}, media_idle_release_s = {args.idle}\n")
+    print(f"uvoz traywave.core.engine  {import_ms:8.1f} ms  RSS +{import_rss:6.1f} MB")
+    print(f"prvi AudioEngine()         {first_ms:8.1f} ms  RSS +{first_rss:6.1f} MB")
+    print(f"ponovljen AudioEngine()    {summary(again_ms)} ms")
+    print(f"\nRSS posle AudioEngine(), pre prvog play(): {idle_rss:6.1f} MB")
+    for i, (play_ms, playing_rss, release_s, released_rss) in enumerate(cycles, 1):
+        print(f"ciklus {i}: do zvuka {play_ms:7.1f} ms  svira {playing_rss:6.1f} MB  "
+              f"oslobođeno posle {release_s:5.2f} s  {released_rss:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
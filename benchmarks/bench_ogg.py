@@ -0,0 +1,78 @@
+"""
+OggPageParser na višesatnom FLAC-in-Ogg snimku (ulančan stream, pesma po pesma)
+
+    python -m benchmarks.bench_ogg [--hours 3] [--read 16384]
+
+Snimak je sintetički, ali u obliku kakav Icecast šalje za FLAC: za svaku
+pesmu BOS + STREAMINFO, VORBIS_COMMENT (svaka peta sa omotom od 200 KB) i
+audio stranice od ~8 KB do EOS-a, 1411 kbps, pesme od 4 minuta. Pesme se
+prave jedna po jedna, pa ceo snimak nikad nije u memoriji. tracemalloc
+meri koliko je parser zauzeo - audio stranice se ne kopiraju.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from traywave.core.ogg import OggPageParser, comments_to_title
+from tests.oggdata import audio_page, track_headers
+
+BITRATE = 1411 * 1000 // 8  # bajtova u sekundi
+TRACK_SECONDS = 240
+PAGE_PAYLOAD = 8000
+
+
+def track_bytes(index: int, payload: bytes) -> bytes:
+    serial = 5000 + index
+    pages = TRACK_SECONDS * BITRATE // PAGE_PAYLOAD
+    picture = 200 * 1024 if index % 5 == 0 else 0
+    out = [track_headers("flac", serial, f"Artist {index}", f"Title {index}", picture)]
+    page = audio_page(serial, 2, payload)
+    out += [page] * (pages - 1)
+    out.append(audio_page(serial, 1 + pages, payload, last=True))
+    return b"".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--read", type=int, default=16384, help="veličina read-a u bajtovima")
+    args = parser.parse_args()
+
+    payload = random.Random(3).getrandbits(8 * PAGE_PAYLOAD).to_bytes(PAGE_PAYLOAD, "little")
+    tracks = max(1, int(args.hours * 3600 // TRACK_SECONDS))
+    ogg = OggPageParser()
+    titles = []
+    total = 0
+    parse_seconds = 0.0
+    for index in range(tracks):
+        data = memoryview(track_bytes(index, payload))
+        started = time.perf_counter()
+        for pos in range(0, len(data), args.read):
+            for comments in ogg.feed(data[pos:pos + args.read]):
+                titles.append(comments_to_title(comments))
+        parse_seconds += time.perf_counter() - started
+        total += len(data)
+
+    assert titles == [(f"Artist {i}", f"Title {i}") for i in range(tracks)], "pogrešni naslovi"
+    hours = total / BITRATE / 3600
+    print(f"snimak: {hours:.1f} h FLAC @ 1411 kbps, {total / 1e6:.0f} MB, {tracks} pesama, "
+          f"read {args.read} B")
+    print(f"parsiranje: {parse_seconds:.2f} s = {total / parse_seconds / 1e6:.0f} MB/s, "
+          f"{parse_seconds / hours * 1000:.0f} ms CPU po satu streama "
+          f"({parse_seconds / (hours * 3600) * 100:.3f} % jednog jezgra)")
+    print(f"stranica: {ogg.pages}, resync: {ogg.resyncs}, naslova: {len(titles)}")
+
+    # Memorija posebno - tracemalloc usporava parsiranje
+    for index, label in ((0, "pesma sa omotom od 200 KB"), (1, "pesma bez omota")):
+        data = memoryview(track_bytes(index, payload))
+        tracemalloc.start()
+        for pos in range(0, len(data), args.read):
+            ogg.feed(data[pos:pos + args.read])
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"memorija parsera, {label} ({len(data) / 1e6:.0f} MB): vrh {peak / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
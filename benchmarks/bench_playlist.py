@@ -0,0 +1,111 @@
+"""
+PlaylistResolver: razrešavanje na svakom play() protiv keša razrešenih URL-ova
+
+    python -m benchmarks.bench_playlist [--rtt 40] [--plays 10]
+
+Lokalni lažni Icecast glumi udaljen server: svaki zahtev (redirekcija,
+playlista, stream) kasni --rtt ms pre odgovora. "bez keša" je ono što je
+plejer radio na svakom play() - prati redirekcije i playliste pa otvara
+stream; "iz keša" je lookup() + otvaranje direktnog URL-a. Vreme je do
+headera streama, tj. do trenutka kad plejer može da počne da baferuje.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import time
+
+from benchmarks.common import summary
+from traywave.core.http_stream import open_stream
+from traywave.core.playlist import PlaylistResolver
+from traywave.core.settings import shared_settings
+from tests.fakeserver import FakeIcecast
+
+
+def scenarios(server: FakeIcecast):
+    stream = server.url("/direct.mp3")
+    server.add_playlist("/radio.pls", f"[playlist]\nNumberOfEntries=1\nFile1={stream}\n")
+    server.add_playlist("/radio.m3u", "#EXTM3U\n#EXTINF:-1,Radio\n/direct.mp3\n", "audio/x-mpegurl")
+    server.add_playlist("/radio.xspf", f"<playlist><trackList><track><location>{stream}</location>"
+                        "</track></trackList></playlist>", "application/xspf+xml")
+    server.add_playlist("/radio.m3u8", "#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=128000\nlow.m3u8\n",
+                        "application/vnd.apple.mpegurl")
+    server.add_redirect("/chain/1", "/radio.pls")
+    server.add_redirect("/chain/2", "/chain/1")
+    server.add_redirect("/chain/3", "/chain/2")
+    server.add_playlist("/nested.m3u", "/chain/2\n", "audio/x-mpegurl")
+    return [
+        ("direktan stream", stream),
+        (".pls", server.url("/radio.pls")),
+        (".m3u", server.url("/radio.m3u")),
+        (".xspf", server.url("/radio.xspf")),
+        (".m3u8 (HLS)", server.url("/radio.m3u8")),
+        ("3x302 -> .pls", server.url("/chain/3")),
+        (".m3u -> 2x302 -> .pls", server.url("/nested.m3u")),
+    ]
+
+
+async def open_headers(url: str):
+    response = await open_stream(url, {"Icy-MetaData": "1"})
+    response.close(abort=True)
+
+
+async def per_play(url: str):
+    # resolve_url se zaustavlja na headerima krajnjeg streama - isto što i plejer
+    await PlaylistResolver.resolve_url(url)
+
+
+async def cached(resolver: PlaylistResolver, url: str):
+    await open_headers(resolver.lookup(url) or url)
+
+
+async def measure(server, resolver, plays: int):
+    rows = []
+    for label, url in scenarios(server):
+        before = len(server.requests)
+        await per_play(url)
+        hops = len(server.requests) - before
+        cold = []
+        for _ in range(plays):
+            started = time.perf_counter()
+            await per_play(url)
+            cold.append((time.perf_counter() - started) * 1000)
+        await resolver.resolve_now(url)
+        warm = []
+        for _ in range(plays):
+            started = time.perf_counter()
+            await cached(resolver, url)
+            warm.append((time.perf_counter() - started) * 1000)
+        rows.append((label, hops, cold, warm))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rtt", type=float, default=40.0, help="kašnjenje svakog zahteva (ms)")
+    parser.add_argument("--plays", type=int, default=10)
+    args = parser.parse_args()
+
+    server = FakeIcecast(header_delay=args.rtt / 1000).start()
+    resolver = PlaylistResolver(None, settings=shared_settings())
+    with contextlib.redirect_stdout(io.StringIO()):
+        rows = asyncio.run(measure(server, resolver, args.plays))
+    server.stop()
+
+    url = next(iter(resolver._cache))
+    started = time.perf_counter()
+    for _ in range(100000):
+        resolver.lookup(url)
+    lookup_us = (time.perf_counter() - started) / 100000 * 1e6
+
+    print(f"RTT {args.rtt:.0f} ms po zahtevu, {args.plays} play()-a po scenariju (ms do headera streama)\n")
+    for label, hops, cold, warm in rows:
+        saved = statistics.median(cold) - statistics.median(warm)
+        print(f"{label:<24} {hops} zahteva  bez keša {summary(cold)}")
+        print(f"{'':<24} {'':<9} iz keša  {summary(warm)}  ({-saved:+.0f} ms)")
+    print(f"\nlookup() iz keša: {lookup_us:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+StreamRecorder: propusnost snimanja sa lokalnog Icecast-a na FLAC bitrate-u
+
+    python -m benchmarks.bench_recorder [--seconds 5] [--burst-mb 256]
+
+Tri prolaza kroz MetadataService sa snimačem: ICY stream u realnom vremenu
+na 1411 kbps (nov fajl na svaku pesmu), FLAC bez tempa (server šalje koliko
+može, jedan fajl + .cue) i ICY bez tempa sa čestim promenama naslova.
+write() je ono što plaća petlja servisa (tj. playback put) po chunk-u -
+pisanje na disk je u writer thread-u. "odbačeno" mora da bude 0.
+"""
+import argparse
+import contextlib
+import io
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import pump, wait_until
+from traywave.core.metadata_service import MetadataService
+from traywave.core.recorder import StreamRecorder
+from tests.fakeserver import FakeIcecast
+
+FLAC_RATE = 1411 * 1000 // 8
+
+
+def run(service, server, codec: str, nbytes: int):
+    directory = tempfile.mkdtemp(prefix="traywave-rec-")
+    recorder = StreamRecorder(directory, "Bench", codec=codec)
+    spent = [0.0, 0]
+    write = recorder.write
+
+    def timed_write(data):
+        started = time.perf_counter()
+        write(data)
+        spent[0] += time.perf_counter() - started
+        spent[1] += 1
+
+    recorder.write = timed_write
+    started = time.perf_counter()
+    session_id, _ = service.open_session(server.url(), lambda *args: None, recorder=recorder)
+    wait_until(lambda: recorder.bytes_written >= nbytes, timeout=600)
+    service.close_session(session_id)
+    recorder.stop()
+    recorder.wait()
+    elapsed = time.perf_counter() - started
+    stats = recorder.get_stats()
+    shutil.rmtree(directory, ignore_errors=True)
+    pump(0.05)
+    return stats, elapsed, spent[0] / max(1, spent[1]) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="trajanje prolaza u realnom vremenu")
+    parser.add_argument("--burst-mb", type=int, default=256)
+    args = parser.parse_args()
+
+    burst = args.burst_mb * 1024 * 1024
+    passes = [
+        ("ICY 1411 kbps, realno vreme", dict(metaint=16000, rate=FLAC_RATE, title_every=20),
+         "mp3", int(FLAC_RATE * args.seconds)),
+        ("FLAC bez tempa, .cue", dict(metaint=16000, content_type="audio/flac", title_every=200),
+         "flac", burst),
+        ("ICY bez tempa, seče fajlove", dict(metaint=16000, title_every=200), "mp3", burst),
+    ]
+    service = MetadataService()
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for label, options, codec, nbytes in passes:
+            server = FakeIcecast(**options).start()
+            rows.append((label, *run(service, server, codec, nbytes)))
+            server.stop()
+        service.shutdown()
+
+    for label, stats, elapsed, write_us in rows:
+        rate = stats["bytes"] / elapsed
+        print(f"{label:<30} {stats['bytes'] / 1e6:7.1f} MB za {elapsed:5.2f} s = {rate / 1e6:6.1f} MB/s "
+              f"({rate / FLAC_RATE:5.0f}x FLAC), fajlova {len(stats['files'])}, "
+              f"odbačeno {stats['dropped_bytes']} B, write() {write_us:.1f} µs/chunk")
+
+
+if __name__ == "__main__":
+    main()
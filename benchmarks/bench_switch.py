@@ -0,0 +1,108 @@
+"""
+Prebacivanje stanica: klik kroz 50 stanica na sporom lokalnom Icecast-u
+
+    python -m benchmarks.bench_switch [--stations 50] [--header-delay 0.2]
+
+Ogg stanice šalju ~2 KB/s, pa metadata sesija uvek visi u read-u kad se
+stanica promeni - to je slučaj u kom je stari metadata_worker.wait(1000)
+zamrzavao tray. Meri se trajanje play() poziva, najduža pauza Qt petlje
+(QTimer od 5 ms, sve preko toga je zamrznut GUI) i da li posle klikanja
+ostaje samo jedna sesija i jedna otvorena konekcija ka serveru (server
+šalje blokove od 256 B, pa prekinutu konekciju primeti odmah).
+
+Dva tempa: "korak" klikne posle isteka PLAY_COALESCE_MS (svaka stanica se
+zaista pokrene i otvori sesiju), "brzo" klikne na 30 ms (klikovi se spajaju).
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from PyQt6.QtCore import QTimer
+
+from benchmarks.common import null_engine, pump, summary, wait_until
+from tests.fakeserver import FakeIcecast
+from tests.oggdata import chained_track
+
+PAYLOAD = bytes(range(256)) * 16
+
+
+class LoopMonitor:
+    """Beleži razmake između tick-ova Qt tajmera (koliko je petlja stajala)"""
+
+    def __init__(self, interval_ms: int = 5):
+        self.interval_ms = interval_ms
+        self.gaps = []
+        self._last = None
+        self._timer = QTimer()
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+
+    def _tick(self):
+        now = time.monotonic()
+        if self._last is not None:
+            self.gaps.append((now - self._last) * 1000)
+        self._last = now
+
+    def start(self):
+        self._last = None
+        self.gaps = []
+        self._timer.start()
+
+    def stop(self) -> float:
+        self._timer.stop()
+        return max(self.gaps, default=0.0)
+
+
+def click_through(engine, server, urls, pause: float, monitor: LoopMonitor):
+    call_ms = []
+    monitor.start()
+    for url in urls:
+        started = time.monotonic()
+        engine.play(url, url.rsplit("/", 1)[-1])
+        call_ms.append((time.monotonic() - started) * 1000)
+        pump(pause)
+    max_gap = monitor.stop()
+    last = urls[-1]
+    settled = wait_until(lambda: engine.current_url == last and engine.metadata_service.session_count() == 1
+                         and server.open_connections <= 1, timeout=5)
+    return call_ms, max_gap, settled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stations", type=int, default=50)
+    parser.add_argument("--header-delay", type=float, default=0.2,
+                        help="koliko server kasni sa headerima (s)")
+    args = parser.parse_args()
+
+    body = b"".join(chained_track("vorbis", 100 + i, "Izvođač", f"Pesma {i}", 40, PAYLOAD)
+                    for i in range(3))
+    server = FakeIcecast(content_type="application/ogg", body=body, rate=2000, metaint=256,
+                         header_delay=args.header_delay).start()
+    monitor = LoopMonitor()
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = null_engine(warm_pool_size=0)
+        step = engine.PLAY_COALESCE_MS / 1000 + args.header_delay + 0.1
+        for label, pause in (("korak", step), ("brzo", 0.03)):
+            urls = [server.url(f"/{label}{i}.ogg") for i in range(args.stations)]
+            before = server.connections
+            call_ms, max_gap, settled = click_through(engine, server, urls, pause, monitor)
+            rows.append((label, pause, call_ms, max_gap, settled,
+                         server.connections - before, engine.metadata_service.session_count(),
+                         server.open_connections))
+        engine.shutdown()
+    server.stop()
+
+    print(f"{args.stations} stanica, Ogg ~2 KB/s, headeri kasne {args.header_delay * 1000:.0f} ms, "
+          f"Qt tajmer {monitor.interval_ms} ms\n")
+    for label, pause, call_ms, max_gap, settled, connections, sessions, still_open in rows:
+        print(f"{label:<6} klik na {pause * 1000:4.0f} ms  play() {summary(call_ms)}")
+        print(f"{'':<6} najduža pauza Qt petlje {max_gap:.1f} ms, konekcija ka serveru {connections}, "
+              f"posle: {sessions} sesija, {still_open} otvorenih konekcija"
+              f"{'' if settled else '  (NIJE se smirilo za 5 s)'}")
+
+
+if __name__ == "__main__":
+    main()
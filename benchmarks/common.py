@@ -0,0 +1,47 @@
+"""
+Zajedničko za benchmark-e: privremen HOME, Qt petlja bez ekrana, null engine
+"""
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["HOME"] = tempfile.mkdtemp(prefix="traywave-bench-")  # ne dira pravi ~/.config
+
+from PyQt6.QtCore import QCoreApplication, QEventLoop
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+def pump(seconds: float):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 5)
+        time.sleep(0.001)
+
+
+def wait_until(predicate, timeout: float = 10.0) -> bool:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 5)
+        time.sleep(0.0005)
+    return bool(predicate())
+
+
+def null_engine(**config):
+    """AudioEngine sa null backend-om; config dopunjuje podrazumevani"""
+    from traywave.core.engine import AudioEngine
+    from traywave.core.settings import shared_settings
+    shared_settings().put("config", {"backend": "null", "timeshift_minutes": 0, **config})
+    return AudioEngine()
+
+
+def summary(samples: List[float]) -> str:
+    """'p50 12.3  p95 20.1  max 25.0' (ms)"""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return f"p50 {statistics.median(ordered):7.2f}  p95 {p95:7.2f}  max {ordered[-1]:7.2f}"
@@ -0,0 +1,72 @@
+"""
+Zajednički fixture-i: Qt petlja bez ekrana, izolovan HOME, lažni Icecast
+"""
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt6.QtCore import QCoreApplication, QEventLoop
+
+from tests.fakeserver import FakeIcecast
+
+
+def pump(app, seconds: float):
+    """Vrti Qt petlju zadato vreme (signali iz drugih thread-ova, tajmeri)"""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+        time.sleep(0.002)
+
+
+def wait_until(app, predicate, timeout: float = 5.0) -> bool:
+    """Vrti petlju dok predicate() ne postane tačan (ili ne istekne timeout)"""
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        pump(app, 0.005)
+    return bool(predicate())
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    """shared_settings() u privremenom HOME-u, bez stanja prethodnog testa"""
+    import traywave.core.settings as settings_module
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(settings_module, "_shared", None)
+    store = settings_module.shared_settings()
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def fake_icecast():
+    """fake_icecast(**opcije) -> pokrenut FakeIcecast, gasi se posle testa"""
+    servers = []
+
+    def start(**options) -> FakeIcecast:
+        server = FakeIcecast(**options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def engine(qapp, settings):
+    """AudioEngine sa null backend-om (bez zvuka), bez time-shift-a"""
+    from traywave.core.engine import AudioEngine
+    settings.put("config", {"backend": "null", "timeshift_minutes": 0})
+    audio_engine = AudioEngine()
+    yield audio_engine
+    audio_engine.shutdown()
+    pump(qapp, 0.02)
@@ -0,0 +1,213 @@
+"""
+Lokalni lažni Icecast server za testove i benchmark-e (bez interneta)
+"""
+import asyncio
+import random
+import socket
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+def icy_block(title: Optional[str], charset: str = "utf-8") -> bytes:
+    """Length bajt + metadata blok (prazan blok je samo b"\\0")"""
+    if title is None:
+        return b"\0"
+    meta = f"StreamTitle='{title}';".encode(charset)
+    meta += b"\0" * (-len(meta) % 16)
+    return bytes([len(meta) // 16]) + meta
+
+
+class FakeIcecast:
+    """Icecast/Shoutcast server na 127.0.0.1 u svom thread-u
+
+    /stream (i svaka putanja koja nije playlista ili redirekcija) šalje
+    audio iz ponavljajućeg pseudo-slučajnog bafera, sa ICY metadata
+    blokom na svakih metaint bajtova kad klijent pošalje Icy-MetaData: 1.
+    Naslov (kodiran u charset) se menja na svakih title_every blokova.
+    rate (bajtova/s) drži tempo pravog streama, None šalje koliko klijent
+    prima. Sa body se umesto toga u krug šalju ti bajtovi (npr. ulančan
+    Ogg), bez ICY metadata.
+    """
+
+    def __init__(self, metaint: int = 8192, content_type: str = "audio/mpeg",
+                 bitrate: Optional[int] = 128, rate: Optional[int] = None,
+                 titles: Optional[List[str]] = None, title_every: int = 1,
+                 header_delay: float = 0.0, extra_headers: Optional[Dict[str, str]] = None,
+                 body: Optional[bytes] = None, charset: str = "utf-8", seed: int = 1):
+        self.metaint = metaint
+        self.body = body
+        self.content_type = content_type
+        self.bitrate = bitrate
+        self.rate = rate
+        self.titles = titles or [f"Artist {i} - Song {i}" for i in range(1000)]
+        self.title_every = title_every
+        self.charset = charset
+        self.header_delay = header_delay
+        self.extra_headers = extra_headers or {}
+        size = 1 << 18
+        self.audio = random.Random(seed).getrandbits(8 * size).to_bytes(size, "little")
+        self.playlists: Dict[str, Tuple[str, bytes]] = {}  # putanja -> (content-type, telo)
+        self.redirects: Dict[str, str] = {}                # putanja -> Location
+        self.connections = 0
+        self.open_connections = 0  # trenutno otvorene (zatvorene sesije se ne broje)
+        self.requests: List[str] = []
+        self.port = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    # === API ===
+
+    def start(self) -> "FakeIcecast":
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, "127.0.0.1", 0))
+            self.port = self._server.sockets[0].getsockname()[1]
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="fake-icecast", daemon=True)
+        self._thread.start()
+        started.wait(5)
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+
+        async def close():
+            self._server.close()
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop.close()
+        self._loop = None
+
+    def url(self, path: str = "/stream") -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def add_playlist(self, path: str, body: str, content_type: str = "audio/x-scpls") -> str:
+        self.playlists[path] = (content_type, body.encode("utf-8"))
+        return self.url(path)
+
+    def add_redirect(self, path: str, location: str) -> str:
+        self.redirects[path] = location
+        return self.url(path)
+
+    def audio_bytes(self, n: int, offset: int = 0) -> bytes:
+        """Prvih n audio bajtova koje šalje svaka konekcija (od offset-a)"""
+        size = len(self.audio)
+        out = bytearray()
+        while len(out) < n:
+            start = (offset + len(out)) % size
+            out += self.audio[start:start + n - len(out)]
+        return bytes(out)
+
+    def stream_bytes(self, n_blocks: int) -> bytes:
+        """Tačno ono što klijent sa Icy-MetaData: 1 dobije za n_blocks intervala"""
+        out = bytearray()
+        for i in range(n_blocks):
+            out += self.audio_bytes(self.metaint, i * self.metaint)
+            out += icy_block(self._title(i), self.charset)
+        return bytes(out)
+
+    def record(self, nbytes: int, path: str = "/stream",
+               metadata: bool = True) -> Tuple[Dict[str, str], bytes]:
+        """Snimi (headeri, telo) pravom konekcijom, kako stižu sa socket-a"""
+        with socket.create_connection(("127.0.0.1", self.port), timeout=5) as sock:
+            request = f"GET {path} HTTP/1.0\r\nHost: 127.0.0.1\r\n"
+            if metadata:
+                request += "Icy-MetaData: 1\r\n"
+            sock.sendall((request + "\r\n").encode())
+            raw = bytearray()
+            while b"\r\n\r\n" not in raw:
+                raw += sock.recv(4096)
+            head, _, body = bytes(raw).partition(b"\r\n\r\n")
+            body = bytearray(body)
+            while len(body) < nbytes:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                body += chunk
+        headers = {}
+        for line in head.decode("latin-1").split("\r\n")[1:]:
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        return headers, bytes(body[:nbytes])
+
+    # === INTERNO ===
+
+    def _title(self, block: int) -> Optional[str]:
+        if block % self.title_every:
+            return None  # isti naslov - server šalje prazan blok
+        return self.titles[(block // self.title_every) % len(self.titles)]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self.open_connections += 1
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            line, *header_lines = request.decode("latin-1").split("\r\n")
+            path = line.split(" ")[1]
+            self.requests.append(path)
+            metadata = any(h.lower().replace(" ", "") == "icy-metadata:1" for h in header_lines)
+            if self.header_delay:
+                await asyncio.sleep(self.header_delay)
+
+            if path in self.redirects:
+                writer.write(f"HTTP/1.1 302 Found\r\nLocation: {self.redirects[path]}\r\n"
+                             f"Content-Length: 0\r\nConnection: close\r\n\r\n".encode())
+                await writer.drain()
+                return
+            if path in self.playlists:
+                content_type, body = self.playlists[path]
+                writer.write(f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+                             f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+                await writer.drain()
+                return
+            await self._stream(writer, metadata)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # klijent je otišao ili se server gasi (stop())
+        finally:
+            self.open_connections -= 1
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter, metadata: bool):
+        metadata = metadata and self.body is None
+        head = f"ICY 200 OK\r\nContent-Type: {self.content_type}\r\nicy-name: Fake\r\n"
+        if self.bitrate:
+            head += f"icy-br: {self.bitrate}\r\n"
+        for key, value in self.extra_headers.items():
+            head += f"{key}: {value}\r\n"
+        if metadata:
+            head += f"icy-metaint: {self.metaint}\r\n"
+        writer.write((head + "\r\n").encode())
+
+        if self.body is not None:
+            offset = 0
+            while True:
+                data = self.body[offset:offset + self.metaint]
+                offset = (offset + len(data)) % len(self.body)
+                writer.write(data)
+                await writer.drain()
+                await asyncio.sleep(len(data) / self.rate if self.rate else 0)
+
+        block = 0
+        while True:
+            data = self.audio_bytes(self.metaint, block * self.metaint)
+            if metadata:
+                data += icy_block(self._title(block), self.charset)
+            writer.write(data)
+            await writer.drain()
+            block += 1
+            await asyncio.sleep(self.metaint / self.rate if self.rate else 0)
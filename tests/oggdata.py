@@ -0,0 +1,75 @@
+"""
+Sintetički Ogg streamovi (Vorbis/Opus/FLAC) za testove i benchmark-e
+"""
+import struct
+from typing import List
+
+from traywave.core.ogg import FLAG_BOS, FLAG_CONTINUED, FLAG_EOS
+
+
+def ogg_pages(serial: int, sequence: int, flags: int, packets: List[bytes], granule: int = 0) -> bytes:
+    """Paketi u jednoj ili više stranica (najviše 255 segmenata po stranici)
+
+    CRC se ne računa - parser ga ne proverava, kao ni plejer za relay.
+    Header stranice imaju granule 0, audio stranice pozitivan.
+    """
+    lacing = bytearray()
+    body = bytearray()
+    for packet in packets:
+        n = len(packet)
+        while n >= 255:
+            lacing.append(255)
+            n -= 255
+        lacing.append(n)
+        body += packet
+    pages = []
+    while True:
+        segments, lacing = lacing[:255], lacing[255:]
+        size = sum(segments)
+        chunk, body = body[:size], body[size:]
+        page_flags = flags if not pages else (flags & ~FLAG_BOS) | FLAG_CONTINUED
+        if lacing:
+            page_flags &= ~FLAG_EOS
+        pages.append(b"OggS" + struct.pack("<BBqIII", 0, page_flags, granule, serial, sequence, 0)
+                     + bytes([len(segments)]) + bytes(segments) + bytes(chunk))
+        sequence += 1
+        if not lacing:
+            return b"".join(pages)
+
+
+def vorbis_comment(artist: str, title: str, picture_bytes: int = 0) -> bytes:
+    vendor = b"traywave-test"
+    items = [f"ARTIST={artist}".encode(), f"TITLE={title}".encode()]
+    if picture_bytes:
+        items.append(b"METADATA_BLOCK_PICTURE=" + b"x" * picture_bytes)
+    return (struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", len(items))
+            + b"".join(struct.pack("<I", len(item)) + item for item in items))
+
+
+def track_headers(codec: str, serial: int, artist: str, title: str,
+                  picture_bytes: int = 0) -> bytes:
+    """BOS stranica + comment header jedne pesme u ulančanom streamu"""
+    comment = vorbis_comment(artist, title, picture_bytes)
+    if codec == "vorbis":
+        return (ogg_pages(serial, 0, FLAG_BOS, [b"\x01vorbis" + b"\0" * 23])
+                + ogg_pages(serial, 1, 0, [b"\x03vorbis" + comment, b"\x05vorbis" + b"\0" * 100]))
+    if codec == "opus":
+        return (ogg_pages(serial, 0, FLAG_BOS, [b"OpusHead" + b"\x01\x02" + b"\0" * 9])
+                + ogg_pages(serial, 1, 0, [b"OpusTags" + comment]))
+    # FLAC: mapping header + STREAMINFO, pa VORBIS_COMMENT blok (tip 4, poslednji)
+    streaminfo = b"\x7fFLAC\x01\x00\x02fLaC" + b"\x00\x00\x00\x22" + b"\0" * 34
+    block = bytes([0x84]) + len(comment).to_bytes(3, "big") + comment
+    return ogg_pages(serial, 0, FLAG_BOS, [streaminfo]) + ogg_pages(serial, 1, 0, [block])
+
+
+def audio_page(serial: int, sequence: int, payload: bytes, last: bool = False) -> bytes:
+    return ogg_pages(serial, sequence, FLAG_EOS if last else 0, [payload], granule=sequence * 960)
+
+
+def chained_track(codec: str, serial: int, artist: str, title: str, audio_pages: int,
+                  payload: bytes, picture_bytes: int = 0) -> bytes:
+    """Cela pesma: headeri, audio_pages audio stranica, EOS"""
+    out = bytearray(track_headers(codec, serial, artist, title, picture_bytes))
+    for i in range(audio_pages):
+        out += audio_page(serial, 2 + i, payload, last=i == audio_pages - 1)
+    return bytes(out)
@@ -0,0 +1,136 @@
+"""
+Katalog stanica: StationCatalog zapisi i StationsManager na oba backend-a
+"""
+import json
+import os
+import threading
+
+import pytest
+
+from traywave.core.catalog import StationCatalog, normalize_name, normalize_url
+from traywave.core.catalog_sqlite import SqliteCatalog
+from traywave.core.engine import ConfigManager
+from traywave.core.settings import SettingsStore
+from traywave.core.stations import StationsManager
+from tests.conftest import wait_until
+
+CATEGORIES = {
+    "Domaće": [["Radio S", "HTTP://Stream.Radios.rs:80/s1"], ["Naxi", "http://naxi.rs/live"]],
+    "Rock": [["Radio S", "http://stream.radios.rs/s1"], ["Rock Radio", "http://rock.example/"]],
+}
+
+
+def test_normalize_url_and_name():
+    assert normalize_url("HTTP://Stream.Radios.rs:80/s1#x") == "http://stream.radios.rs/s1"
+    assert normalize_url("https://a.example:8443") == "https://a.example:8443/"
+    assert normalize_name("  Radio \t S\n") == "radio s"
+
+
+def test_records_roundtrip_keeps_keys():
+    catalog = StationCatalog.from_categories(CATEGORIES)
+    records = catalog.to_records()
+    assert records["version"] == 3 and len(records["stations"]) == 3
+    assert records["stations"][0]["key"] == "http://stream.radios.rs/s1"  # URL kako je prvi put viđen
+
+    loaded = StationCatalog.from_records(records)
+    assert loaded.to_categories() == catalog.to_categories()
+    assert loaded.find_url("http://stream.radios.rs:80/s1").tags == {"Domaće", "Rock"}
+
+
+def test_version_2_records_are_normalized_on_load():
+    records = StationCatalog.from_categories(CATEGORIES).to_records()
+    records["version"] = 2
+    for record in records["stations"]:
+        record.pop("key", None)
+    loaded = StationCatalog.from_records(records)
+    assert loaded.find_url("http://stream.radios.rs/s1").name == "Radio S"
+
+
+def test_name_index_follows_edits_after_load():
+    catalog = StationCatalog.from_records(StationCatalog.from_categories(CATEGORIES).to_records())
+    catalog.add("Novi  Talas", "http://novi.example/", "Rock")
+    assert catalog.has_name_in("novi talas", "Rock")
+    assert [s.url for s in catalog.find_name("RADIO S")] == ["HTTP://Stream.Radios.rs:80/s1"]
+
+    catalog.remove_at("Rock", 2)
+    assert not catalog.find_name("Novi Talas")
+    catalog.remove_category("Domaće")
+    catalog.remove_at("Rock", 0)
+    assert not catalog.find_name("Radio S") and len(catalog) == 1
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_manager_edits_persist_on_both_backends(qapp, settings, backend):
+    settings.put("config", {"catalog_backend": backend})
+    manager = StationsManager(settings=settings)
+    manager.catalog.import_categories(CATEGORIES)
+    assert manager.add_station("Rock", "Jazz FM", "http://jazz.example/")
+    assert not manager.add_station("Rock", "jazz  fm", "http://other.example/")  # isto ime
+    assert manager.remove_station("Domaće", 1)
+    manager.save_stations()
+    manager.flush()
+
+    reloaded = StationsManager(settings=SettingsStore(settings.path))
+    try:
+        assert reloaded.get_categories() == ["Domaće", "Rock"]
+        assert reloaded.get_stations("Domaće") == [("Radio S", "HTTP://Stream.Radios.rs:80/s1")]
+        assert [s.name for s in reloaded.search("jazz")] == ["Jazz FM"]
+        assert {s.name for s in reloaded.search("rock")} == {"Radio S", "Rock Radio", "Jazz FM"}
+        assert reloaded.find_station("http://naxi.rs/live") is None
+    finally:
+        reloaded.settings.close()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_export_runs_off_the_gui_thread(qapp, settings, backend):
+    settings.put("config", {"catalog_backend": backend})
+    manager = StationsManager(settings=settings)
+    manager.catalog.import_categories(CATEGORIES)
+    manager._export_timer.setInterval(10)
+    release, writers = threading.Event(), []
+    write_export = manager._write_export
+
+    def slow_write(categories, path):
+        writers.append(threading.current_thread())
+        release.wait(5)
+        return write_export(categories, path)
+
+    manager._write_export = slow_write
+    manager.save_stations()
+    assert wait_until(qapp, lambda: writers, timeout=5)
+    # Izmena dok se izvoz piše: taj izvoz je zastareo, sledeći je na čekanju
+    assert manager.add_station("Rock", "Jazz FM", "http://jazz.example/")
+    manager.save_stations()
+    release.set()
+
+    assert wait_until(qapp, lambda: not manager._export_pending, timeout=5)
+    assert len(writers) == 2 and threading.main_thread() not in writers
+    with open(manager.stations_file, encoding="utf-8") as f:
+        exported = json.load(f)
+    assert ["Jazz FM", "http://jazz.example/"] in exported["Rock"]
+    assert manager._read_if_changed() is None  # sopstveni izvoz se ne uvozi
+
+
+def test_switching_catalog_backend_in_config_json_keeps_stations(qapp, settings):
+    manager = StationsManager(settings=settings)
+    manager.catalog.import_categories(CATEGORIES)
+    assert manager.add_station("Rock", "Jazz FM", "http://jazz.example/")
+    manager.save_stations()
+    manager.flush()
+    expected = manager.catalog.to_categories()
+    ConfigManager(settings).close()  # polazna tačka za config.json
+
+    for backend, kind, mtime in (("sqlite", SqliteCatalog, 1000), ("json", StationCatalog, 2000)):
+        path = os.path.join(settings.config_dir, "config.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"catalog_backend": backend}, f)
+        os.utime(path, (mtime, mtime))
+        store = SettingsStore(settings.path)  # sledeći start
+        try:
+            ConfigManager(store).close()
+            reloaded = StationsManager(settings=store)
+            assert isinstance(reloaded.catalog, kind)
+            assert reloaded.catalog.to_categories() == expected
+            assert [s.name for s in reloaded.search("jazz")] == ["Jazz FM"]
+        finally:
+            store.close()
@@ -0,0 +1,87 @@
+"""
+Charset ICY naslova: detekcija po stanici, keširana odluka, fallback
+"""
+import pytest
+
+from traywave.core.charset import (MAX_ASCII_BLOCKS, SAMPLE_BLOCKS, CharsetRegistry,
+                                   StationDecoder, detect_charset)
+from tests.conftest import wait_until
+
+TITLES = [
+    "Zdravko Čolić - Pođoh u grad",
+    "Đorđe Balašević - Računajte na nas",
+    "Šaban Šaulić - Željo moja",
+    "Neda Ukraden - Ćao ćao",
+    "Riblja Čorba - Ostani đubre do kraja",
+]
+
+
+def blocks(codec: str, n: int = 10):
+    return [f"StreamTitle='{TITLES[i % len(TITLES)]}';".encode(codec) for i in range(n)]
+
+
+@pytest.mark.parametrize("codec", ["utf-8", "cp1250", "iso-8859-2"])
+def test_detect_charset_reads_ex_yu_letters(codec):
+    for data in blocks(codec, len(TITLES)):
+        assert data.decode(detect_charset(data)) == data.decode(codec)
+
+
+def test_decoder_decides_after_sample_blocks(settings):
+    registry = CharsetRegistry(settings)
+    decoder = registry.decoder_for("http://naxi/live")
+    decoded = [decoder.decode(data) for data in blocks("cp1250")]
+
+    assert decoded == [f"StreamTitle='{TITLES[i % len(TITLES)]}';" for i in range(10)]
+    assert decoder.codec == "cp1250"
+    assert settings.get("charsets") == {"http://naxi/live": "cp1250"}
+    # Odluka je pala posle SAMPLE_BLOCKS blokova, ostali su jedan decode() poziv
+    assert not decoder.votes and SAMPLE_BLOCKS < 10
+
+
+def test_decision_survives_restart(settings):
+    CharsetRegistry(settings).remember("http://tdi/live", "cp1250")
+    decoder = CharsetRegistry(settings).decoder_for("http://tdi/live")
+    assert decoder.codec == "cp1250"
+    assert decoder.decode(blocks("cp1250", 1)[0]) == f"StreamTitle='{TITLES[0]}';"
+
+
+def test_ascii_only_station_settles_on_utf8(settings):
+    decoder = CharsetRegistry(settings).decoder_for("http://ascii/live")
+    for i in range(MAX_ASCII_BLOCKS):
+        text = f"StreamTitle='Artist {i} - Song';"
+        assert decoder.decode(text.encode()) == text
+    assert decoder.codec == "utf-8"
+
+
+def test_station_switching_encoder_falls_back_then_redecides(settings):
+    decoder = CharsetRegistry(settings).decoder_for("http://cool/live")
+    for data in blocks("cp1250", SAMPLE_BLOCKS):
+        decoder.decode(data)
+    assert decoder.codec == "cp1250"
+
+    # Stanica pređe na UTF-8: svaki blok je i dalje ispravno dekodiran
+    for data in blocks("utf-8", 4):
+        assert decoder.decode(data) == data.decode("utf-8")
+    assert decoder.codec == "utf-8"
+    assert settings.get("charsets") == {"http://cool/live": "utf-8"}
+
+
+def test_corrupt_block_does_not_flip_decision():
+    decoder = StationDecoder("http://x", codec="utf-8")
+    assert decoder.decode(b"StreamTitle='\xff\xfe';")  # nešto se prikaže
+    assert decoder.codec == "utf-8" and decoder.errors == 1
+
+
+def test_metadata_service_decodes_cp1250_titles(qapp, settings, fake_icecast):
+    from traywave.core.metadata_service import MetadataService
+    server = fake_icecast(metaint=1024, rate=64000, titles=TITLES, charset="cp1250")
+    service = MetadataService(CharsetRegistry(settings))
+    seen = []
+    session_id, _ = service.open_session(server.url(), lambda _, record: seen.append(record.raw))
+    try:
+        assert wait_until(qapp, lambda: len(seen) >= len(TITLES), timeout=8)
+    finally:
+        service.close_session(session_id)
+        wait_until(qapp, lambda: server.open_connections == 0, timeout=2)
+        service.shutdown()
+    assert [f"StreamTitle='{title}';" for title in TITLES] == seen[:len(TITLES)]
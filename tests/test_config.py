@@ -0,0 +1,101 @@
+"""
+ConfigManager: write-behind upis, spajanje izmena, flush na izlasku
+"""
+import json
+import os
+import time
+
+from traywave.core.engine import ConfigManager
+from traywave.core.settings import SettingsStore
+
+
+def test_wheel_spam_is_one_write_per_window(settings):
+    config = ConfigManager(settings, flush_ms=200)
+    try:
+        before = settings.commits
+        for value in range(100):
+            config.set("volume", value)
+        assert settings.commits == before  # set() ne piše na pozivajućem thread-u
+        time.sleep(0.5)
+        assert settings.commits == before + 1
+        assert settings.get("config")["volume"] == 99
+    finally:
+        config.close()
+
+
+def test_close_flushes_pending_changes(settings):
+    config = ConfigManager(settings, flush_ms=60000)
+    config.set("volume", 17)
+    config.set_sleep_timer(30, True)
+    config.close()
+
+    reopened = SettingsStore(settings.path)
+    try:
+        stored = reopened.get("config")
+        assert (stored["volume"], stored["sleep_minutes"], stored["sleep_quit_on_expire"]) == (17, 30, True)
+    finally:
+        reopened.close()
+
+
+def test_flush_without_changes_does_not_write(settings):
+    config = ConfigManager(settings)
+    try:
+        before = settings.commits
+        config.flush()
+        assert settings.commits == before
+    finally:
+        config.close()
+
+
+def write_config_file(settings, values: dict, mtime: float):
+    path = os.path.join(settings.config_dir, "config.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(values, f)
+    os.utime(path, (mtime, mtime))
+
+
+def test_config_json_edits_override_stored_config(settings):
+    write_config_file(settings, {"volume": 80, "backend": "qt"}, 1000)
+    config = ConfigManager(settings)  # nadogradnja: fajl je polazna tačka, ne uvozi se
+    try:
+        assert config.get("volume") == 50
+        config.set("volume", 30)
+
+        write_config_file(settings, {"volume": 80, "backend": "null", "warm_pool_size": 0}, 2000)
+        assert config.import_config_file() == ["backend", "warm_pool_size"]
+        assert (config.get("volume"), config.get("backend"), config.get("warm_pool_size")) == (30, "null", 0)
+        assert config.import_config_file() == []  # isti fajl
+    finally:
+        config.close()
+
+    reopened = SettingsStore(settings.path)
+    try:
+        assert reopened.get("config")["backend"] == "null"
+    finally:
+        reopened.close()
+
+
+def test_config_json_created_later_is_applied(settings):
+    ConfigManager(settings).close()
+    write_config_file(settings, {"media_idle_release_s": 5}, 1000)
+    config = ConfigManager(settings)
+    try:
+        assert config.get("media_idle_release_s") == 5
+    finally:
+        config.close()
+
+
+def test_migrated_config_json_is_not_applied_twice(tmp_path):
+    with open(tmp_path / "config.json", "w", encoding="utf-8") as f:
+        json.dump({"volume": 80}, f)
+    store = SettingsStore(str(tmp_path / "settings.db"))
+    config = ConfigManager(store)
+    try:
+        assert config.get("volume") == 80
+        config.set("volume", 20)
+        config.close()
+        config = ConfigManager(store)
+        assert config.get("volume") == 20
+    finally:
+        config.close()
+        store.close()
@@ -0,0 +1,166 @@
+"""
+AudioEngine kroz null backend i lažni Icecast (bez zvuka i interneta)
+"""
+import json
+import os
+import time
+
+import traywave.core.engine as engine_module
+from traywave.core.backends.null import NullBackend
+from tests.conftest import pump, wait_until
+
+
+def playing(engine) -> bool:
+    active = engine._active
+    return active is not None and active.buffered_at is not None and engine.is_playing()
+
+
+def test_play_buffers_and_probes_stream(qapp, engine, fake_icecast):
+    server = fake_icecast(bitrate=192)
+    url = server.url()
+    engine.play(url, "Fake")
+
+    assert wait_until(qapp, lambda: playing(engine))
+    assert engine.backend.name == "null"
+    assert engine.player.source == url
+    # Headere donosi resolver u pozadini - plejer ih nije čekao
+    assert wait_until(qapp, lambda: engine.probes.get(url) is not None)
+    assert wait_until(qapp, lambda: engine.stream_details() == "MP3 · 192 kbps")
+    assert engine.current_bitrate == "192 kbps"
+
+
+def test_player_title_reaches_callbacks(qapp, engine, fake_icecast):
+    server = fake_icecast()
+    titles = []
+    engine.on_metadata_changed(lambda artist, title: titles.append((artist, title)))
+    engine.play(server.url(), "Fake")
+    assert wait_until(qapp, lambda: playing(engine))
+
+    engine.player.inject_title("Bajaga - Plavi safir")
+    assert wait_until(qapp, lambda: ("Bajaga", "Plavi safir") in titles)
+    assert (engine.current_artist, engine.current_song) == ("Bajaga", "Plavi safir")
+
+
+def test_ogg_titles_come_from_metadata_service(qapp, engine, fake_icecast):
+    server = fake_icecast(content_type="application/ogg", rate=64000, metaint=4000)
+    titles = []
+    engine.on_metadata_changed(lambda artist, title: title and titles.append((artist, title)))
+    engine.play(server.url(), "Ogg")
+
+    assert wait_until(qapp, lambda: titles, timeout=8)
+    artist, title = titles[0]
+    assert f"{artist} - {title}" in server.titles
+    assert engine._active.session_id is not None
+
+
+def test_switch_does_not_leak_titles_from_previous_station(qapp, engine, fake_icecast):
+    first = fake_icecast(content_type="application/ogg", rate=64000, metaint=4000,
+                         titles=[f"Prva {i} - Pesma {i}" for i in range(100)])
+    second = fake_icecast(content_type="application/ogg", rate=64000, metaint=4000,
+                          titles=[f"Druga {i} - Pesma {i}" for i in range(100)])
+    seen = []
+    engine.on_metadata_changed(lambda artist, title: artist and seen.append(artist))
+
+    engine.play(first.url(), "Prva")
+    assert wait_until(qapp, lambda: seen, timeout=8)
+    pump(qapp, engine.PLAY_COALESCE_MS / 1000)
+    engine.play(second.url(), "Druga")
+    switched = len(seen)
+
+    assert wait_until(qapp, lambda: any(a.startswith("Druga") for a in seen[switched:]), timeout=8)
+    pump(qapp, 0.5)
+    assert all(artist.startswith("Druga") for artist in seen[switched:])
+    assert engine.current_station == "Druga"
+
+
+def test_switching_slow_stations_does_not_block_or_leave_sessions(qapp, engine, fake_icecast):
+    # Sesija visi u read-u (2 KB/s) kad se stanica promeni - play() to ne sme da čeka
+    server = fake_icecast(content_type="application/ogg", rate=2000, metaint=256)
+    engine.player_pool.size = 0  # utišani plejeri u pool-u namerno drže svoje sesije
+    for i in range(4):
+        url = server.url(f"/s{i}.ogg")
+        started = time.monotonic()
+        engine.play(url, f"S{i}")
+        assert time.monotonic() - started < 0.1
+        assert wait_until(qapp, lambda: engine._active.session_id is not None, timeout=5)
+        pump(qapp, engine.PLAY_COALESCE_MS / 1000)
+
+    assert wait_until(qapp, lambda: engine.metadata_service.session_count() == 1
+                      and server.open_connections == 1, timeout=5)
+
+
+def test_rapid_play_calls_are_coalesced(qapp, engine, fake_icecast):
+    servers = [fake_icecast() for _ in range(5)]
+    started = []
+    original = engine._start_playback
+
+    def record(url, *args, **kwargs):
+        started.append(url)
+        return original(url, *args, **kwargs)
+
+    engine._start_playback = record
+    for server in servers:
+        engine.play(server.url(), "S")
+    pump(qapp, engine.PLAY_COALESCE_MS / 1000 + 0.1)
+
+    assert started == [servers[0].url(), servers[-1].url()]
+    assert wait_until(qapp, lambda: playing(engine) and engine.player.source == servers[-1].url())
+
+
+def test_volume_and_mute_reach_null_player(qapp, engine, fake_icecast):
+    server = fake_icecast()
+    engine.play(server.url(), "Fake")
+    assert wait_until(qapp, lambda: playing(engine))
+
+    engine.set_volume(40)
+    assert engine.get_volume() == 40
+    assert engine.player.volume() > 0
+    assert not engine.player.is_muted()
+    assert engine.toggle_mute() is True
+    assert engine.player.is_muted()
+    engine.toggle_mute()
+    assert not engine.player.is_muted()
+
+
+def test_stop_releases_media_stack(qapp, engine, fake_icecast):
+    server = fake_icecast()
+    engine.config.set("media_idle_release_s", 0.1)
+    engine.play(server.url(), "Fake")
+    assert wait_until(qapp, lambda: playing(engine))
+
+    engine.stop()
+    assert engine.player is None and engine.current_url is None
+    assert wait_until(qapp, lambda: engine.backend is None)
+
+
+def test_backend_is_chosen_in_config_json(qapp, engine, fake_icecast, monkeypatch):
+    requested = []
+
+    def create_backend(name, config=None):
+        requested.append(name)
+        return NullBackend()
+
+    monkeypatch.setattr(engine_module, "create_backend", create_backend)
+    server = fake_icecast()
+    engine.play(server.url(), "Fake")
+    assert wait_until(qapp, lambda: playing(engine))
+    engine.stop()
+
+    with open(os.path.join(engine.config.config_dir, "config.json"), "w", encoding="utf-8") as f:
+        json.dump({"backend": "mpv", "mpv_path": "/opt/mpv/bin/mpv"}, f)
+    assert engine.config.import_config_file() == ["backend", "mpv_path"]
+    engine.play(server.url(), "Fake")
+    assert wait_until(qapp, lambda: playing(engine))
+    assert requested == ["null", "mpv"]
+
+
+def test_player_error_triggers_reconnect(qapp, engine, fake_icecast):
+    server = fake_icecast()
+    engine.play(server.url(), "Fake")
+    assert wait_until(qapp, lambda: playing(engine))
+
+    failed_at = time.monotonic()
+    engine.player.fail("veza prekinuta")
+    assert wait_until(qapp, lambda: engine.get_reconnect_stats()["reconnects"] >= 1, timeout=8)
+    assert wait_until(qapp, lambda: playing(engine), timeout=8)
+    assert time.monotonic() - failed_at < 8
@@ -0,0 +1,153 @@
+"""
+IcyDemuxer: isti audio i naslovi bez obzira gde padnu granice chunk-ova
+"""
+import random
+
+import pytest
+
+from traywave.core.icy import IcyDemuxer, IcyState, parse_stream_title
+from tests.fakeserver import icy_block
+
+
+def demux(stream: bytes, metaint: int, chunk_sizes):
+    """(audio, metadata blokovi) kad se stream hrani u zadatim komadima"""
+    audio = bytearray()
+    demuxer = IcyDemuxer(metaint, on_audio=audio.extend)
+    blocks = []
+    pos = 0
+    for size in chunk_sizes:
+        if pos >= len(stream):
+            break
+        blocks += demuxer.feed(stream[pos:pos + size])
+        pos += size
+    if pos < len(stream):
+        blocks += demuxer.feed(stream[pos:])
+    return bytes(audio), blocks
+
+
+def reference(stream: bytes, metaint: int):
+    return demux(stream, metaint, [len(stream)])
+
+
+def titles(blocks):
+    return [parse_stream_title(block.rstrip(b"\0").decode("utf-8")) for block in blocks]
+
+
+def synthetic_stream(rng: random.Random, metaint: int, intervals: int):
+    """(stream, audio, naslovi): prazni blokovi, UTF-8, blokovi do 255*16 bajtova"""
+    stream, audio, expected = bytearray(), bytearray(), []
+    for i in range(intervals):
+        chunk = rng.getrandbits(8 * metaint).to_bytes(metaint, "little")
+        audio += chunk
+        stream += chunk
+        kind = rng.random()
+        if kind < 0.4:
+            stream += icy_block(None)
+            continue
+        if kind < 0.9:
+            title = f"Izvođač {i} - Pesma {'š' * rng.randint(0, 40)} {i}"
+        else:
+            title = f"Long {i} " + "x" * rng.randint(3000, 4030)  # skoro pun blok (max 255 * 16)
+        stream += icy_block(title)
+        expected.append(title)
+    tail = rng.randint(0, metaint - 1)
+    chunk = rng.getrandbits(8 * tail).to_bytes(tail, "little") if tail else b""
+    audio += chunk
+    stream += chunk
+    return bytes(stream), bytes(audio), expected
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_chunk_sizes_match_single_chunk(seed):
+    rng = random.Random(seed)
+    metaint = rng.choice([1, 2, 7, 16, 100, 1024, 8192])
+    stream, audio, expected = synthetic_stream(rng, metaint, rng.randint(1, 25))
+    ref_audio, ref_blocks = reference(stream, metaint)
+    assert ref_audio == audio
+    assert titles(ref_blocks) == expected
+
+    max_chunk = rng.choice([1, 3, 17, metaint + 1, 4096])
+    sizes = [rng.randint(1, max_chunk) for _ in range(len(stream))]
+    assert demux(stream, metaint, sizes) == (ref_audio, ref_blocks)
+
+
+def test_every_single_split_point():
+    """Podela na svakom bajtu: u audio delu, tačno oko length bajta, usred bloka"""
+    rng = random.Random(7)
+    metaint = 32
+    stream, audio, expected = synthetic_stream(rng, metaint, 8)
+    ref = reference(stream, metaint)
+    for split in range(len(stream) + 1):
+        assert demux(stream, metaint, [split, len(stream)]) == ref, split
+
+
+def test_splits_around_length_byte_and_inside_metadata():
+    metaint = 16
+    stream = bytes(range(metaint)) + icy_block("A - B") + bytes(range(metaint)) + icy_block(None)
+    ref = reference(stream, metaint)
+    length_at = metaint
+    for sizes in (
+        [length_at, 1],                  # chunk se završava pre length bajta
+        [length_at + 1],                 # ... odmah posle njega
+        [length_at - 1, 1, 1],           # length bajt sam u chunk-u
+        [length_at + 1, 5, 3],           # usred metadata bloka
+        [length_at + 1, 16, 1],          # blok tačno do kraja, pa sledeći audio
+    ):
+        assert demux(stream, metaint, sizes) == ref, sizes
+    assert titles(ref[1]) == ["A - B"]
+
+
+def test_on_metadata_fires_between_audio_before_and_after_block():
+    metaint = 16
+    stream = bytes(16) + icy_block("A - B") + bytes([1]) * 16 + icy_block("C - D") + bytes([2]) * 16
+    events = []
+    demuxer = IcyDemuxer(metaint, on_audio=lambda data: events.append(bytes(data)),
+                         on_metadata=lambda block: events.extend(titles([block])))
+    demuxer.feed(stream)  # jedan chunk preko obe granice
+    audio = b"".join(event for event in events if isinstance(event, bytes))
+    assert audio == bytes(16) + bytes([1]) * 16 + bytes([2]) * 16
+    assert [event for event in events if isinstance(event, str)] == ["A - B", "C - D"]
+    assert events.index("A - B") == 1 and events.index("C - D") == 3
+
+
+def test_next_read_size_reads_whole_intervals():
+    """Čitanje po next_read_size() ne deli nijedan blok i ne gubi sinhronizaciju"""
+    rng = random.Random(3)
+    metaint = 1000
+    stream, audio, expected = synthetic_stream(rng, metaint, 30)
+    got = bytearray()
+    demuxer = IcyDemuxer(metaint, on_audio=got.extend)
+    blocks, pos = [], 0
+    while pos < len(stream):
+        size = demuxer.next_read_size()
+        blocks += demuxer.feed(stream[pos:pos + size])
+        pos += size
+        assert demuxer.state in (IcyState.AUDIO, IcyState.META)
+    assert bytes(got) == audio
+    assert titles(blocks) == expected
+
+
+@pytest.mark.parametrize("metaint,title_every", [(8192, 1), (16000, 3), (333, 1)])
+def test_recorded_stream(fake_icecast, metaint, title_every):
+    """Stream snimljen sa socket-a lokalnog servera, pa isečen na slučajne komade"""
+    server = fake_icecast(metaint=metaint, title_every=title_every)
+    blocks_wanted = 40
+    expected = server.stream_bytes(blocks_wanted)
+    headers, body = server.record(len(expected))
+    assert int(headers["icy-metaint"]) == metaint
+    assert body == expected
+
+    ref_audio, ref_blocks = reference(body, metaint)
+    assert ref_audio == server.audio_bytes(metaint * blocks_wanted)
+    assert titles(ref_blocks) == [server.titles[block // title_every]
+                                  for block in range(0, blocks_wanted, title_every)]
+
+    rng = random.Random(metaint)
+    for max_chunk in (13, 4096, 65536):
+        sizes = [rng.randint(1, max_chunk) for _ in range(len(body))]
+        assert demux(body, metaint, sizes) == (ref_audio, ref_blocks), max_chunk
+
+
+def test_metaint_must_be_positive():
+    with pytest.raises(ValueError):
+        IcyDemuxer(0)
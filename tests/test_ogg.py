@@ -0,0 +1,99 @@
+"""
+OggPageParser: naslovi iz Vorbis/Opus/FLAC komentara ulančanih streamova
+"""
+import random
+
+import pytest
+
+from traywave.core.ogg import MAX_PACKET_BYTES, OggPageParser, comments_to_title
+from tests.conftest import wait_until
+from tests.oggdata import chained_track, track_headers
+
+PAYLOAD = random.Random(5).getrandbits(8 * 4000).to_bytes(4000, "little")
+
+
+def chained_stream(codecs, audio_pages: int = 5, picture_at=None, picture_bytes: int = 70000):
+    return b"".join(
+        chained_track(codec, 1000 + i, f"Izvođač {i}", f"Pesma {i}", audio_pages, PAYLOAD,
+                      picture_bytes if i == picture_at else 0)
+        for i, codec in enumerate(codecs)
+    )
+
+
+def parse(stream: bytes, sizes):
+    parser = OggPageParser()
+    found, pos = [], 0
+    for size in sizes:
+        if pos >= len(stream):
+            break
+        found += parser.feed(stream[pos:pos + size])
+        pos += size
+    if pos < len(stream):
+        found += parser.feed(stream[pos:])
+    return [comments_to_title(comments) for comments in found], parser
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_chained_codecs_at_random_chunk_sizes(seed):
+    codecs = ["vorbis", "flac", "opus", "flac", "vorbis", "opus"]
+    stream = chained_stream(codecs, picture_at=3)
+    expected = [(f"Izvođač {i}", f"Pesma {i}") for i in range(len(codecs))]
+    rng = random.Random(seed)
+    max_chunk = rng.choice([1, 27, 300, 9000, 65536])
+    titles, parser = parse(stream, [rng.randint(1, max_chunk) for _ in range(len(stream))])
+    assert titles == expected
+    assert parser.resyncs == 0
+
+
+def test_garbage_before_first_page_resyncs():
+    stream = b"HTTP garbage, not Ogg" + chained_stream(["flac", "vorbis"])
+    titles, parser = parse(stream, [7] * len(stream))
+    assert titles == [("Izvođač 0", "Pesma 0"), ("Izvođač 1", "Pesma 1")]
+    assert parser.resyncs > 0
+
+
+def test_oversized_comment_is_truncated_but_title_survives():
+    stream = chained_stream(["flac"], picture_at=0, picture_bytes=MAX_PACKET_BYTES * 2)
+    titles, _ = parse(stream, [65536] * len(stream))
+    assert titles == [("Izvođač 0", "Pesma 0")]
+
+
+def test_audio_pages_are_not_captured():
+    stream = chained_stream(["flac"], audio_pages=50)
+    parser = OggPageParser()
+    parser.feed(stream[:len(stream) // 2])
+    # Header faza je gotova - usred audio stranica ništa se ne skuplja
+    assert parser._capture is None or not parser._capture
+    parser.feed(stream[len(stream) // 2:])
+    assert parser.pages > 50
+    assert not parser._streams  # EOS je oslobodio logički stream
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_header_pages_of_current_link_are_kept(seed):
+    codecs = ["vorbis", "opus", "flac"]
+    stream = chained_stream(codecs, audio_pages=30, picture_at=1)
+    second = len(chained_stream(codecs[:1], audio_pages=30))
+    headers = track_headers("opus", 1001, "Izvođač 1", "Pesma 1", picture_bytes=70000)
+    rng = random.Random(seed)
+    parser = OggPageParser(keep_headers=True)
+    end, pos = second + len(headers) + 10 * 4000, 0
+    while pos < end:
+        size = min(rng.randint(1, 9000), end - pos)
+        parser.feed(stream[pos:pos + size])
+        pos += size
+
+    assert b"".join(parser.header_pages) == headers
+    assert (parser.link_start, parser.headers_end, parser.offset) == (second, second + len(headers), end)
+
+
+def test_engine_reads_ogg_titles_over_single_connection(qapp, engine, fake_icecast):
+    body = chained_stream(["flac", "vorbis", "opus"], audio_pages=20)
+    server = fake_icecast(content_type="application/ogg", body=body, rate=200000, metaint=4096)
+    seen = []
+    engine.on_metadata_changed(lambda artist, title: title and seen.append((artist, title)))
+    engine.play(server.url("/live.ogg"), "Ogg")
+
+    assert wait_until(qapp, lambda: len(seen) >= 3, timeout=8)
+    assert seen[:3] == [(f"Izvođač {i}", f"Pesma {i}") for i in range(3)]
+    assert server.connections == 1
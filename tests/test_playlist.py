@@ -0,0 +1,114 @@
+"""
+PlaylistResolver: .pls/.m3u/.m3u8/.xspf i redirekcije do direktnog streama
+"""
+import asyncio
+
+import pytest
+
+from traywave.core.playlist import PlaylistResolver, is_playlist_url, parse_playlist
+from traywave.core.probe import ProbeCache
+from tests.conftest import wait_until
+
+BASE = "http://radio.example/live/"
+
+
+def test_parse_pls_in_file_order():
+    body = b"[playlist]\nNumberOfEntries=2\nFile2=http://b/2\nTitle1=Radio\nFile1=http://a/1\n"
+    assert parse_playlist(body, BASE) == ["http://a/1", "http://b/2"]
+
+
+def test_parse_m3u_with_relative_entries():
+    body = b"\xef\xbb\xbf#EXTM3U\n#EXTINF:-1,Radio\nstream.mp3\n\n/abs/x.aac\nftp://skip/me\n"
+    assert parse_playlist(body, BASE) == [BASE + "stream.mp3", "http://radio.example/abs/x.aac"]
+
+
+def test_parse_xspf_unescapes_locations():
+    body = (b'<?xml version="1.0"?><playlist version="1" xmlns="http://xspf.org/ns/0/">'
+            b"<trackList><track><location> http://a/b?x=1&amp;y=2 </location></track>"
+            b"</trackList></playlist>")
+    assert parse_playlist(body, BASE) == ["http://a/b?x=1&y=2"]
+
+
+def test_hls_is_left_to_the_player():
+    assert parse_playlist(b"#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=1\nlow.m3u8\n", BASE) is None
+
+
+def test_content_type_wins_over_extension():
+    assert is_playlist_url("http://x/listen", "audio/x-scpls")
+    assert not is_playlist_url("http://x/listen.m3u", "audio/mpeg")
+    assert is_playlist_url("http://x/listen.M3U")
+
+
+@pytest.fixture
+def resolver(settings):
+    return PlaylistResolver(None, settings=settings, probes=ProbeCache(settings))
+
+
+def resolve(resolver, url):
+    return asyncio.run(resolver.resolve_now(url))
+
+
+@pytest.mark.parametrize("kind", ["pls", "m3u", "xspf"])
+def test_resolves_playlist_behind_redirect_chain(resolver, settings, fake_icecast, kind):
+    server = fake_icecast(bitrate=192)
+    stream = server.url("/direct.mp3")
+    bodies = {
+        "pls": ("audio/x-scpls", f"[playlist]\nFile1={stream}\n"),
+        "m3u": ("audio/x-mpegurl", "#EXTM3U\n/direct.mp3\n"),
+        "xspf": ("application/xspf+xml", f"<playlist><trackList><track><location>{stream}"
+                                          "</location></track></trackList></playlist>"),
+    }
+    content_type, body = bodies[kind]
+    server.add_playlist(f"/radio.{kind}", body, content_type)
+    server.add_redirect("/hop", f"/radio.{kind}")
+    start = server.add_redirect("/go", "/hop")
+
+    assert resolve(resolver, start) == stream
+    assert resolver.lookup(start) == stream and resolver.is_fresh(start)
+    assert settings.get("resolved")[start]["target"] == stream
+    # Headeri krajnjeg streama su već u ProbeCache-u
+    assert resolver.probes.get(start).bitrate_text == "192 kbps"
+
+
+def test_cache_survives_restart_and_invalidate_forgets(resolver, settings, fake_icecast):
+    server = fake_icecast()
+    url = server.add_playlist("/radio.pls", f"File1={server.url('/s')}\n")
+    resolve(resolver, url)
+
+    reloaded = PlaylistResolver(None, settings=settings)
+    assert reloaded.lookup(url) == server.url("/s")
+
+    class Service:
+        def call_soon(self, callback, *args):
+            callback(*args)
+
+    reloaded.service = Service()
+    reloaded.invalidate(url)
+    assert reloaded.lookup(url) is None
+    assert url not in settings.get("resolved")
+
+
+def test_failed_resolution_is_cached_negatively(resolver, fake_icecast):
+    server = fake_icecast()
+    url = server.add_playlist("/empty.pls", "[playlist]\nNumberOfEntries=0\n")
+
+    assert resolve(resolver, url) is None
+    assert resolver.is_fresh(url) and resolver.lookup(url) is None
+    resolver._cache[url]["resolved_at"] -= PlaylistResolver.NEGATIVE_TTL + 1
+    assert not resolver.is_fresh(url)
+
+
+def test_engine_plays_direct_url_and_reuses_cache(qapp, engine, fake_icecast):
+    server = fake_icecast()
+    server.add_redirect("/listen.pls", "/real.pls")
+    server.add_playlist("/real.pls", f"[playlist]\nFile1={server.url('/direct')}\n")
+    url, direct = server.url("/listen.pls"), server.url("/direct")
+
+    engine.play(url, "Playlista")
+    assert wait_until(qapp, lambda: engine.player is not None and engine.player.source == direct)
+    fetched = server.requests.count("/real.pls")
+
+    engine.stop()
+    engine.play(url, "Playlista")
+    assert wait_until(qapp, lambda: engine.player is not None and engine.player.source == direct)
+    assert server.requests.count("/real.pls") == fetched  # drugi put iz keša, bez mreže
@@ -0,0 +1,99 @@
+"""
+StreamRecorder kroz MetadataService i lažni Icecast na FLAC bitrate-u
+"""
+import os
+
+import pytest
+
+from traywave.core.metadata_service import MetadataService
+from traywave.core.recorder import StreamRecorder, safe_filename
+from tests.conftest import wait_until
+
+FLAC_RATE = 1411 * 1000 // 8  # bajtova u sekundi (CD kvalitet)
+
+
+@pytest.fixture
+def service(settings):
+    from traywave.core.charset import CharsetRegistry
+    metadata_service = MetadataService(CharsetRegistry(settings))
+    yield metadata_service
+    metadata_service.shutdown()
+
+
+def record(qapp, service, server, recorder, until):
+    """Snimaj dok until() ne postane tačno, pa zatvori sesiju i sačekaj writer"""
+    session_id, _ = service.open_session(server.url(), lambda *args: None, recorder=recorder)
+    try:
+        assert wait_until(qapp, until, timeout=15)
+    finally:
+        service.close_session(session_id)
+        wait_until(qapp, lambda: server.open_connections == 0, timeout=2)
+        recorder.stop()
+    assert recorder.wait(5)
+
+
+def read(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def test_safe_filename():
+    assert safe_filename('AC/DC - Who: "Me"?') == "AC_DC - Who_ _Me_"
+    assert safe_filename(" .. ") == "stream"
+    assert len(safe_filename("x" * 500)) == 120
+
+
+def test_icy_recording_splits_at_title_changes(qapp, service, fake_icecast, tmp_path):
+    server = fake_icecast(metaint=8192, rate=FLAC_RATE, title_every=8)
+    recorder = StreamRecorder(str(tmp_path), "Test", codec="mp3")
+    record(qapp, service, server, recorder, lambda: len(recorder.files) >= 4)
+
+    stats = recorder.get_stats()
+    assert stats["dropped_bytes"] == 0
+    names = [os.path.basename(path) for path in stats["files"]]
+    assert names[1:4] == [f"Artist {i} - Song {i}.mp3" for i in range(3)]
+    # Granica je tačno na metadata bloku: prvi fajl je audio pre prvog naslova
+    sizes = [os.path.getsize(path) for path in stats["files"]]
+    assert sizes[0] == 8192 and sizes[1:3] == [8 * 8192] * 2
+    recorded = b"".join(read(path) for path in stats["files"])
+    assert recorded == server.audio_bytes(len(recorded))
+
+
+def test_flac_recording_keeps_one_file_with_cue(qapp, service, fake_icecast, tmp_path):
+    server = fake_icecast(metaint=16000, content_type="audio/flac", bitrate=1411,
+                          rate=FLAC_RATE, title_every=4)
+    recorder = StreamRecorder(str(tmp_path), "Test", codec="flac")
+    record(qapp, service, server, recorder, lambda: recorder.bytes_written >= 16 * 16000)
+
+    files = recorder.get_stats()["files"]
+    assert len(files) == 1 and files[0].endswith(".flac")
+    data = read(files[0])
+    assert data == server.audio_bytes(len(data))
+    cue = (tmp_path / (os.path.splitext(os.path.basename(files[0]))[0] + ".cue")).read_text()
+    assert 'TITLE "Artist 1 - Song 1"' in cue and "TRACK 03" in cue
+
+
+def test_unpaced_stream_is_written_without_drops(qapp, service, fake_icecast, tmp_path):
+    # Server šalje koliko može - mnogo brže od bilo kog FLAC streama
+    server = fake_icecast(metaint=16000, content_type="audio/flac", title_every=100)
+    recorder = StreamRecorder(str(tmp_path), "Test", codec="flac")
+    record(qapp, service, server, recorder, lambda: recorder.bytes_written >= 32 * 1024 * 1024)
+
+    stats = recorder.get_stats()
+    assert stats["dropped_bytes"] == 0
+    data = read(stats["files"][0])
+    assert len(data) == stats["bytes"] and data == server.audio_bytes(len(data))
+
+
+@pytest.mark.parametrize("content_type,codec,extension", [
+    ("audio/aacp", "aac", "aac"),
+    ("audio/x-unknown", None, "bin"),
+])
+def test_unprobed_codec_comes_from_session_content_type(qapp, service, fake_icecast, tmp_path,
+                                                        content_type, codec, extension):
+    server = fake_icecast(metaint=8192, content_type=content_type, rate=FLAC_RATE, title_every=8)
+    recorder = StreamRecorder(str(tmp_path), "Test")  # bez probe-a
+    record(qapp, service, server, recorder, lambda: len(recorder.files) >= 2)
+
+    assert recorder.codec == codec
+    assert all(path.endswith("." + extension) for path in recorder.get_stats()["files"])
@@ -0,0 +1,78 @@
+"""
+AudioRelay: plejer koji se poveže kasno (ili ponovo) dobija Ogg headere
+"""
+import random
+import socket
+import struct
+
+import pytest
+
+from traywave.core.charset import CharsetRegistry
+from traywave.core.metadata_service import MetadataService
+from traywave.core.ogg import OggPageParser, comments_to_title
+from traywave.core.relay import AudioRelay
+from tests.conftest import wait_until
+from tests.oggdata import chained_track, track_headers
+
+PAYLOAD = random.Random(7).getrandbits(8 * 4000).to_bytes(4000, "little")
+
+
+@pytest.fixture
+def service(settings):
+    metadata_service = MetadataService(CharsetRegistry(settings))
+    yield metadata_service
+    metadata_service.shutdown()
+
+
+def fetch(url: str, nbytes: int) -> bytes:
+    """GET na relay kao plejer, vrati prvih nbytes bajtova tela"""
+    port = int(url.split(":")[2].split("/")[0])
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(b"GET /stream HTTP/1.0\r\n\r\n")
+        data = b""
+        while b"\r\n\r\n" not in data or len(data.partition(b"\r\n\r\n")[2]) < nbytes:
+            chunk = sock.recv(65536)
+            assert chunk, "relay je zatvorio konekciju"
+            data += chunk
+    head, _, body = data.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.0 200")
+    return body[:nbytes]
+
+
+def test_late_and_reconnecting_clients_get_ogg_headers(qapp, service, fake_icecast):
+    body = chained_track("vorbis", 7, "Izvođač", "Pesma", 400, PAYLOAD)
+    server = fake_icecast(content_type="application/ogg", body=body, rate=500000)
+    session_id, url = service.open_session(server.url("/live.ogg"), lambda *args: None, relay=True)
+    relay = service.get_relay(session_id)
+    headers = track_headers("vorbis", 7, "Izvođač", "Pesma")
+    try:
+        # Headeri su davno ispali iz prebuffer-a
+        assert wait_until(qapp, lambda: relay._ogg is not None
+                          and relay._ogg.offset > len(headers) + 4 * AudioRelay.PREBUFFER_BYTES)
+        for _ in range(2):  # kasni klijent, pa ponovo povezan
+            data = fetch(url, len(headers) + 3 * 4100)
+            assert data.startswith(headers)
+            tail = data[len(headers):]
+            assert tail[:4] == b"OggS"  # live deo kreće od cele stranice
+            assert struct.unpack_from("<I", tail, 18)[0] > 20  # sequence: nije početak pesme
+
+            parser = OggPageParser()
+            titles = [comments_to_title(comments) for comments in parser.feed(data)]
+            assert titles == [("Izvođač", "Pesma")] and parser.resyncs == 0
+    finally:
+        service.close_session(session_id)
+        wait_until(qapp, lambda: server.open_connections == 0, timeout=2)
+
+
+def test_client_at_start_gets_stream_once(qapp, service, fake_icecast):
+    body = chained_track("opus", 3, "A", "B", 400, PAYLOAD)
+    server = fake_icecast(content_type="audio/ogg", body=body, rate=100000)
+    session_id, url = service.open_session(server.url("/live.opus"), lambda *args: None, relay=True)
+    relay = service.get_relay(session_id)
+    try:
+        assert wait_until(qapp, lambda: relay._ogg is not None and relay._ogg.header_pages)
+        data = fetch(url, 20000)
+        assert data == body[:20000]  # headeri iz prebuffer-a, bez duplikata
+    finally:
+        service.close_session(session_id)
+        wait_until(qapp, lambda: server.open_connections == 0, timeout=2)
@@ -0,0 +1,34 @@
+"""
+Playback backends - QtMultimedia, mpv (JSON IPC) i null (bez zvuka, za testove)
+"""
+from traywave.core.backends.base import BackendPlayer, MediaStatus, PlaybackBackend, PlaybackState
+
+BACKENDS = ("qt", "mpv", "null")
+
+
+def create_backend(name: str, config=None) -> PlaybackBackend:
+    """Napravi backend po imenu (nepoznat ili nedostupan -> qt)
+
+    Ime je ključ "backend" iz ConfigManager-a (settings.db, menja se kroz
+    config.json); AudioEngine ga čita na prvi play() posle stop-a.
+    Implementacije se uvoze tek ovde, pa QtMultimedia (i FFmpeg/PulseAudio)
+    ne učitava ako se koristi mpv ili null.
+    """
+    get = config.get if config is not None else (lambda key, default=None: default)
+    if name == "null":
+        from traywave.core.backends.null import NullBackend
+        return NullBackend()
+    if name == "mpv":
+        from traywave.core.backends.mpv import MpvBackend
+        backend = MpvBackend(get("mpv_path", "mpv") or "mpv", get("mpv_args", []))
+        if backend.available():
+            return backend
+        print(f"⚠️  mpv nije pronađen ({backend.executable}), koristim QtMultimedia")
+    elif name != "qt":
+        print(f"⚠️  Nepoznat backend '{name}', koristim QtMultimedia")
+    from traywave.core.backends.qt import QtBackend
+    return QtBackend()
+
+
+__all__ = ["BACKENDS", "BackendPlayer", "MediaStatus", "PlaybackBackend", "PlaybackState",
+           "create_backend"]
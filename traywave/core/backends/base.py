@@ -0,0 +1,136 @@
+"""
+Playback backend interfejs - AudioEngine ne zna da li svira Qt, mpv ili ništa
+"""
+import enum
+from abc import ABC, ABCMeta, abstractmethod
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class PlaybackState(enum.Enum):
+    Stopped = 0
+    Playing = 1
+    Paused = 2
+
+
+class MediaStatus(enum.Enum):
+    """Stanje izvora i bafera (isti redosled kao QMediaPlayer.MediaStatus)"""
+    NoMedia = 0
+    Loading = 1
+    Loaded = 2
+    Stalled = 3
+    Buffering = 4
+    Buffered = 5
+    EndOfMedia = 6
+    Invalid = 7
+
+
+class _BackendPlayerMeta(type(QObject), ABCMeta):
+    """QObject metaklasa + ABCMeta (apstraktne metode za QObject podklase)"""
+
+
+class BackendPlayer(QObject, metaclass=_BackendPlayerMeta):
+    """Jedan stream: izvor, reprodukcija, jačina, naslov i stanje bafera
+
+    Svaki plejer ima svoju jačinu i mute - aktivni svira na jačini engine-a,
+    zagrejani u pool-u su utišani. Signali se emituju iz GUI thread-a.
+    Implementacija kojoj fali neka od apstraktnih metoda pada već pri
+    pravljenju plejera, ne usred reprodukcije.
+    """
+
+    state_changed = pyqtSignal(object)   # PlaybackState
+    status_changed = pyqtSignal(object)  # MediaStatus
+    title_changed = pyqtSignal(str)      # naslov iz streama (ako ga backend čita)
+    error = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._state = PlaybackState.Stopped
+        self._status = MediaStatus.NoMedia
+        self._volume = 1.0
+        self._muted = False
+        self._title = ""
+
+    # === API ===
+
+    @abstractmethod
+    def set_source(self, url: str):
+        ...
+
+    @abstractmethod
+    def play(self):
+        ...
+
+    @abstractmethod
+    def pause(self):
+        ...
+
+    @abstractmethod
+    def stop(self):
+        ...
+
+    @abstractmethod
+    def release(self):
+        """Ugasi plejer i oslobodi resurse (posle ovoga se ne koristi)"""
+
+    def set_volume(self, volume: float):
+        """Jačina 0.0 - 1.0"""
+        self._volume = max(0.0, min(1.0, volume))
+        self._apply_volume()
+
+    def volume(self) -> float:
+        return self._volume
+
+    def set_muted(self, muted: bool):
+        self._muted = muted
+        self._apply_volume()
+
+    def is_muted(self) -> bool:
+        return self._muted
+
+    def state(self) -> PlaybackState:
+        return self._state
+
+    def status(self) -> MediaStatus:
+        return self._status
+
+    def is_playing(self) -> bool:
+        return self._state == PlaybackState.Playing
+
+    def title(self) -> str:
+        """Poslednji naslov koji je backend pročitao iz streama"""
+        return self._title
+
+    # === ZA IMPLEMENTACIJE ===
+
+    @abstractmethod
+    def _apply_volume(self):
+        """Primeni self._volume i self._muted na izlaz"""
+
+    def _set_state(self, state: PlaybackState):
+        if state != self._state:
+            self._state = state
+            self.state_changed.emit(state)
+
+    def _set_status(self, status: MediaStatus):
+        if status != self._status:
+            self._status = status
+            self.status_changed.emit(status)
+
+    def _set_title(self, title: str):
+        if title and title != self._title:
+            self._title = title
+            self.title_changed.emit(title)
+
+
+class PlaybackBackend(ABC):
+    """Fabrika plejera jedne implementacije"""
+
+    name = ""
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def create_player(self) -> BackendPlayer:
+        ...
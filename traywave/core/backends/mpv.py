@@ -0,0 +1,220 @@
+"""
+mpv backend - eksterni mpv proces kojim se upravlja preko JSON IPC socketa
+"""
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import List, Optional
+
+from PyQt6.QtCore import QProcess, QTimer
+from PyQt6.QtNetwork import QLocalSocket
+
+from traywave.core.backends.base import BackendPlayer, MediaStatus, PlaybackBackend, PlaybackState
+
+_ids = itertools.count(1)
+_exiting = set()  # procesi koji se gase - referenca da ih QProcess destruktor ne ubije
+
+# observe_property id -> ime
+_OBSERVED = {1: "metadata", 2: "paused-for-cache"}
+
+
+class MpvPlayer(BackendPlayer):
+    """Jedan 'mpv --idle' proces bez videa, jedan stream
+
+    Komande idu kao JSON linije preko QLocalSocket-a (Unix socket, na
+    Windows-u named pipe), pa sve radi u Qt petlji bez dodatnih thread-ova.
+    Dok se socket ne poveže komande čekaju u redu.
+    """
+
+    CONNECT_RETRY_MS = 50
+    CONNECT_TIMEOUT_MS = 5000
+    QUIT_TIMEOUT_MS = 1000
+
+    def __init__(self, executable: str, extra_args: Optional[List[str]] = None):
+        super().__init__()
+        name = f"traywave-mpv-{os.getpid()}-{next(_ids)}"
+        if sys.platform == "win32":
+            self._server = name
+            ipc_path = rf"\\.\pipe\{name}"
+        else:
+            self._server = os.path.join(tempfile.gettempdir(), f"{name}.sock")
+            ipc_path = self._server
+
+        self.source: Optional[str] = None
+        self._loaded_source: Optional[str] = None
+        self._released = False
+        self._pending: List[bytes] = []
+        self._buffer = bytearray()
+        self._buffered_once = False
+
+        self._socket = QLocalSocket()
+        self._socket.connected.connect(self._on_connected)
+        self._socket.readyRead.connect(self._on_ready_read)
+
+        self._connect_attempts = 0
+        self._connect_timer = QTimer()
+        self._connect_timer.setInterval(self.CONNECT_RETRY_MS)
+        self._connect_timer.timeout.connect(self._try_connect)
+
+        self._process = QProcess()
+        self._process.errorOccurred.connect(self._on_process_error)
+        self._process.finished.connect(self._on_process_finished)
+        self._process.start(executable, [
+            "--idle=yes", "--no-video", "--no-terminal", "--no-config",
+            "--audio-display=no", "--cache=yes",
+            f"--input-ipc-server={ipc_path}",
+        ] + list(extra_args or []))
+        self._connect_timer.start()
+
+    # === API ===
+
+    def set_source(self, url: str):
+        self.source = url
+        self._title = ""
+        self._loaded_source = None
+        if self._state == PlaybackState.Playing:
+            self._load()
+
+    def play(self):
+        if self.source is None:
+            return
+        if self._loaded_source != self.source or self._status in (MediaStatus.EndOfMedia, MediaStatus.Invalid):
+            self._load()
+        self._send("set_property", "pause", False)
+        self._set_state(PlaybackState.Playing)
+
+    def pause(self):
+        self._send("set_property", "pause", True)
+        self._set_state(PlaybackState.Paused)
+
+    def stop(self):
+        self._send("stop")
+        self._loaded_source = None
+        self._set_state(PlaybackState.Stopped)
+
+    def release(self):
+        self._released = True
+        self._connect_timer.stop()
+        self._send("quit")
+        self._socket.disconnectFromServer()
+        process = self._process
+        if process.state() == QProcess.ProcessState.NotRunning:
+            return
+        _exiting.add(process)
+        process.finished.connect(lambda *args: _exiting.discard(process))
+        # Ako mpv ne izađe sam (socket nije stigao da se poveže) - ubij ga
+        QTimer.singleShot(self.QUIT_TIMEOUT_MS, lambda: process.state() != QProcess.ProcessState.NotRunning
+                          and process.kill())
+
+    # === IPC ===
+
+    def _apply_volume(self):
+        self._send("set_property", "volume", round(self._volume * 100, 1))
+        self._send("set_property", "mute", self._muted)
+
+    def _load(self):
+        self._loaded_source = self.source
+        self._buffered_once = False
+        self._send("loadfile", self.source, "replace")
+        self._set_status(MediaStatus.Loading)
+
+    def _send(self, *command):
+        line = json.dumps({"command": list(command)}).encode("utf-8") + b"\n"
+        if self._socket.state() == QLocalSocket.LocalSocketState.ConnectedState:
+            self._socket.write(line)
+        else:
+            self._pending.append(line)
+
+    def _try_connect(self):
+        if self._socket.state() != QLocalSocket.LocalSocketState.UnconnectedState:
+            return
+        self._connect_attempts += 1
+        if self._connect_attempts * self.CONNECT_RETRY_MS > self.CONNECT_TIMEOUT_MS:
+            self._connect_timer.stop()
+            self._fail("mpv IPC socket did not come up")
+            return
+        self._socket.connectToServer(self._server)
+
+    def _on_connected(self):
+        self._connect_timer.stop()
+        for property_id, name in _OBSERVED.items():
+            self._socket.write(json.dumps({"command": ["observe_property", property_id, name]}).encode() + b"\n")
+        pending, self._pending = self._pending, []
+        for line in pending:
+            self._socket.write(line)
+
+    def _on_ready_read(self):
+        self._buffer += bytes(self._socket.readAll())
+        while b"\n" in self._buffer:
+            line, _, rest = bytes(self._buffer).partition(b"\n")
+            self._buffer = bytearray(rest)
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if "event" in message:
+                self._on_event(message)
+
+    def _on_event(self, message: dict):
+        event = message["event"]
+        if event == "start-file":
+            self._set_status(MediaStatus.Loading)
+        elif event == "file-loaded":
+            self._set_status(MediaStatus.Loaded)
+            self._set_status(MediaStatus.Buffering)
+        elif event == "playback-restart":
+            self._buffered_once = True
+            self._set_status(MediaStatus.Buffered)
+        elif event == "end-file":
+            reason = message.get("reason")
+            if reason == "eof":
+                self._set_status(MediaStatus.EndOfMedia)
+            elif reason == "error":
+                self._fail(message.get("file_error") or "mpv playback error")
+        elif event == "property-change":
+            self._on_property(message.get("name"), message.get("data"))
+
+    def _on_property(self, name: Optional[str], data):
+        if name == "metadata" and isinstance(data, dict):
+            # mpv vraća ključeve kako ih server pošalje (icy-title, Title...)
+            lowered = {str(key).lower(): value for key, value in data.items()}
+            title = lowered.get("icy-title") or lowered.get("title") or ""
+            if isinstance(title, str):
+                self._set_title(title)
+        elif name == "paused-for-cache" and data is not None:
+            if data:
+                self._set_status(MediaStatus.Stalled if self._buffered_once else MediaStatus.Buffering)
+            elif self._buffered_once:
+                self._set_status(MediaStatus.Buffered)
+
+    # === PROCES ===
+
+    def _fail(self, message: str):
+        self._set_status(MediaStatus.Invalid)
+        self.error.emit(message)
+
+    def _on_process_error(self, error):
+        if not self._released:
+            self._fail(f"mpv process error: {error.name}")
+
+    def _on_process_finished(self, *args):
+        self._connect_timer.stop()
+        if not self._released:
+            self._fail("mpv exited")
+
+
+class MpvBackend(PlaybackBackend):
+    name = "mpv"
+
+    def __init__(self, executable: str = "mpv", extra_args: Optional[List[str]] = None):
+        self.executable = executable
+        self.extra_args = extra_args or []
+
+    def available(self) -> bool:
+        return shutil.which(self.executable) is not None
+
+    def create_player(self) -> BackendPlayer:
+        return MpvPlayer(self.executable, self.extra_args)
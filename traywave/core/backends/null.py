@@ -0,0 +1,103 @@
+"""
+Null backend - bez zvuka i mreže, deterministički (testovi i benchmark logike engine-a)
+"""
+from typing import Optional
+
+from PyQt6.QtCore import QTimer
+
+from traywave.core.backends.base import BackendPlayer, MediaStatus, PlaybackBackend, PlaybackState
+
+
+class NullPlayer(BackendPlayer):
+    """Plejer koji posle play() prolazi kroz Loading -> Loaded -> Buffering -> Buffered
+
+    Koraci traju tačno connect_ms i buffer_ms, bez slučajnosti, pa se isti
+    scenario uvek odvija isto. Testovi mogu da ubace naslov, zastoj ili
+    grešku (inject_title, stall, fail).
+    """
+
+    def __init__(self, connect_ms: int, buffer_ms: int):
+        super().__init__()
+        self.connect_ms = connect_ms
+        self.buffer_ms = buffer_ms
+        self.source: Optional[str] = None
+        self._generation = 0  # poništava zakazane korake posle stop/set_source
+
+    def set_source(self, url: str):
+        self.source = url
+        self._title = ""
+        self._generation += 1
+        self._set_status(MediaStatus.NoMedia)
+        if self._state == PlaybackState.Playing:
+            self._load()
+
+    def play(self):
+        if self.source is None:
+            return
+        if self._status in (MediaStatus.NoMedia, MediaStatus.EndOfMedia, MediaStatus.Invalid):
+            self._load()
+        self._set_state(PlaybackState.Playing)
+
+    def pause(self):
+        if self._state == PlaybackState.Playing:
+            self._set_state(PlaybackState.Paused)
+
+    def stop(self):
+        self._generation += 1
+        self._set_state(PlaybackState.Stopped)
+        if self._status != MediaStatus.NoMedia:
+            self._set_status(MediaStatus.Loaded)
+
+    def release(self):
+        self.stop()
+        self.source = None
+
+    # === SIMULACIJA ===
+
+    def inject_title(self, title: str):
+        self._set_title(title)
+
+    def stall(self):
+        self._set_status(MediaStatus.Stalled)
+
+    def fail(self, message: str = "null backend failure"):
+        self._generation += 1
+        self._set_status(MediaStatus.Invalid)
+        self.error.emit(message)
+
+    def end(self):
+        self._generation += 1
+        self._set_status(MediaStatus.EndOfMedia)
+
+    # === INTERNO ===
+
+    def _apply_volume(self):
+        pass
+
+    def _load(self):
+        self._generation += 1
+        generation = self._generation
+        self._set_status(MediaStatus.Loading)
+        self._after(self.connect_ms, generation, self._on_connected)
+
+    def _on_connected(self, generation: int):
+        self._set_status(MediaStatus.Loaded)
+        self._set_status(MediaStatus.Buffering)
+        self._after(self.buffer_ms, generation, lambda _: self._set_status(MediaStatus.Buffered))
+
+    def _after(self, delay_ms: int, generation: int, step):
+        def run():
+            if generation == self._generation:
+                step(generation)
+        QTimer.singleShot(delay_ms, run)
+
+
+class NullBackend(PlaybackBackend):
+    name = "null"
+
+    def __init__(self, connect_ms: int = 20, buffer_ms: int = 80):
+        self.connect_ms = connect_ms
+        self.buffer_ms = buffer_ms
+
+    def create_player(self) -> BackendPlayer:
+        return NullPlayer(self.connect_ms, self.buffer_ms)
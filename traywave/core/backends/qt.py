@@ -0,0 +1,90 @@
+"""
+QtMultimedia backend - QMediaPlayer sa sopstvenim QAudioOutput-om
+"""
+from PyQt6.QtCore import QUrl
+from PyQt6.QtMultimedia import QAudioOutput, QMediaMetaData, QMediaPlayer
+
+from traywave.core.backends.base import BackendPlayer, MediaStatus, PlaybackBackend, PlaybackState
+
+_STATES = {
+    QMediaPlayer.PlaybackState.StoppedState: PlaybackState.Stopped,
+    QMediaPlayer.PlaybackState.PlayingState: PlaybackState.Playing,
+    QMediaPlayer.PlaybackState.PausedState: PlaybackState.Paused,
+}
+
+_STATUSES = {
+    QMediaPlayer.MediaStatus.NoMedia: MediaStatus.NoMedia,
+    QMediaPlayer.MediaStatus.LoadingMedia: MediaStatus.Loading,
+    QMediaPlayer.MediaStatus.LoadedMedia: MediaStatus.Loaded,
+    QMediaPlayer.MediaStatus.StalledMedia: MediaStatus.Stalled,
+    QMediaPlayer.MediaStatus.BufferingMedia: MediaStatus.Buffering,
+    QMediaPlayer.MediaStatus.BufferedMedia: MediaStatus.Buffered,
+    QMediaPlayer.MediaStatus.EndOfMedia: MediaStatus.EndOfMedia,
+    QMediaPlayer.MediaStatus.InvalidMedia: MediaStatus.Invalid,
+}
+
+
+class QtPlayer(BackendPlayer):
+    """QMediaPlayer (FFmpeg backend) - naslov daje samo za ICY MP3/AAC"""
+
+    def __init__(self):
+        super().__init__()
+        self._output = QAudioOutput()
+        self._player = QMediaPlayer()
+        self._player.setAudioOutput(self._output)
+        self._player.playbackStateChanged.connect(
+            lambda state: self._set_state(_STATES.get(state, PlaybackState.Stopped))
+        )
+        self._player.mediaStatusChanged.connect(
+            lambda status: self._set_status(_STATUSES.get(status, MediaStatus.NoMedia))
+        )
+        self._player.metaDataChanged.connect(self._on_metadata_changed)
+        self._player.errorOccurred.connect(self._on_error)
+
+    def set_source(self, url: str):
+        self._title = ""
+        self._player.setSource(QUrl(url))
+
+    def play(self):
+        self._player.play()
+
+    def pause(self):
+        self._player.pause()
+
+    def stop(self):
+        self._player.stop()
+
+    def release(self):
+        self._player.stop()
+        self._player.setSource(QUrl())
+        self._player.deleteLater()
+        self._output.deleteLater()
+
+    def title(self) -> str:
+        # Neki streamovi menjaju naslov bez metaDataChanged - čitaj direktno
+        self._on_metadata_changed()
+        return self._title
+
+    def _apply_volume(self):
+        self._output.setVolume(self._volume)
+        self._output.setMuted(self._muted)
+
+    def _on_metadata_changed(self):
+        try:
+            metadata = self._player.metaData()
+            title = metadata.stringValue(QMediaMetaData.Key.Title) if metadata else ""
+        except Exception:
+            return
+        if isinstance(title, str):
+            self._set_title(title)
+
+    def _on_error(self, error, message: str):
+        if error != QMediaPlayer.Error.NoError:
+            self.error.emit(message or str(error))
+
+
+class QtBackend(PlaybackBackend):
+    name = "qt"
+
+    def create_player(self) -> BackendPlayer:
+        return QtPlayer()
@@ -0,0 +1,264 @@
+"""
+Normalizovan katalog stanica - jedan zapis po stanici, kategorije su tagovi
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+# šema://[korisnik@]host[:port][putanja][?query][#fragment] - regex je ~3x brži od urlsplit
+_URL = re.compile(r"([A-Za-z][A-Za-z0-9+.-]*)://([^/?#@]*@)?(\[[^\]]*\]|[^/?#:]+)(?::(\d*))?"
+                  r"([^?#]*)(\?[^#]*)?(?:#.*)?$", re.S)
+
+
+def normalize_url(url: str) -> str:
+    """Ključ stanice: ista adresa napisana na dva načina daje isti ključ
+
+    Šema i host su case-insensitive, podrazumevani port i fragment se
+    odbacuju, prazna putanja je "/". Putanja i query ostaju kakvi jesu -
+    serveri ih razlikuju (mount point, token).
+    """
+    url = url.strip()
+    match = _URL.match(url)
+    if match is None:
+        return url
+    scheme, userinfo, host, port, path, query = match.groups()
+    scheme = scheme.lower()
+    netloc = (userinfo or "") + host.lower()
+    if port and port.lstrip("0") != _DEFAULT_PORTS.get(scheme):
+        netloc += ":" + port
+    return f"{scheme}://{netloc}{path or '/'}{query or ''}"
+
+
+def normalize_name(name: str) -> str:
+    # split() bez argumenta = \s+ i strip() zajedno, ~4x brže od regex-a
+    return " ".join(name.split()).casefold()
+
+
+class Station:
+    """Jedna stanica, bez obzira u koliko je kategorija
+
+    url je adresa pod kojom je stanica prvi put viđena - nju dobijaju
+    meni, engine, ProbeCache, telemetrija i sampler, pa su bitrate, zdravlje
+    i metadata stanje jedan unos po stanici a ne po kopiji u kategoriji.
+    """
+
+    __slots__ = ("key", "url", "name", "tags", "bitrate")
+
+    def __init__(self, name: str, url: str, bitrate: str = "", key: Optional[str] = None):
+        self.key = key or normalize_url(url)
+        self.url = url.strip()
+        self.name = name
+        self.tags: Set[str] = set()
+        self.bitrate = bitrate
+
+    def __repr__(self) -> str:
+        return f"Station({self.name!r}, {self.url!r}, tags={sorted(self.tags)!r})"
+
+
+class StationCatalog:
+    """Zapisi stanica + indeksi po normalizovanom URL-u i imenu
+
+    Kategorija je tag na zapisu; redosled stanica u kategoriji (za meni)
+    čuva se posebno kao lista ključeva. Pretraga po URL-u i imenu i provera
+    duplikata su O(1). Indeks po imenu se pravi tek kad zatreba - meniju
+    na startu trebaju samo kategorije.
+    """
+
+    def __init__(self):
+        self._by_url: Dict[str, Station] = {}
+        self._names: Optional[Dict[str, Set[str]]] = None  # normalizovano ime -> ključevi
+        self._categories: Dict[str, List[str]] = {}  # kategorija -> ključevi po redu
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    @property
+    def _by_name(self) -> Dict[str, Set[str]]:
+        if self._names is None:
+            names: Dict[str, Set[str]] = {}
+            for key, station in self._by_url.items():
+                names.setdefault(normalize_name(station.name), set()).add(key)
+            self._names = names
+        return self._names
+
+    # === PRETRAGA ===
+
+    def find_url(self, url: str) -> Optional[Station]:
+        return self._by_url.get(normalize_url(url))
+
+    def find_name(self, name: str) -> List[Station]:
+        return [self._by_url[key] for key in self._by_name.get(normalize_name(name), ())]
+
+    def categories(self) -> List[str]:
+        return list(self._categories)
+
+    def has_category(self, category: str) -> bool:
+        return category in self._categories
+
+    def stations_in(self, category: str) -> List[Station]:
+        return [self._by_url[key] for key in self._categories.get(category, ())]
+
+    def pairs_in(self, category: str) -> List[Tuple[str, str]]:
+        return [(self._by_url[key].name, self._by_url[key].url)
+                for key in self._categories.get(category, ())]
+
+    def all_stations(self) -> List[Station]:
+        return list(self._by_url.values())
+
+    def search(self, query: str, limit: int = 50) -> List[Station]:
+        """Stanice čije ime ili kategorija sadrže sve reči upita"""
+        words = [word.casefold() for word in query.split()]
+        if not words:
+            return []
+        found = []
+        for station in self._by_url.values():
+            text = " ".join([station.name, *station.tags]).casefold()
+            if all(word in text for word in words):
+                found.append(station)
+                if len(found) >= limit:
+                    break
+        return found
+
+    # === IZMENE ===
+
+    def add_category(self, category: str) -> bool:
+        if category in self._categories:
+            return False
+        self._categories[category] = []
+        return True
+
+    def remove_category(self, category: str) -> bool:
+        keys = self._categories.pop(category, None)
+        if keys is None:
+            return False
+        for key in keys:
+            self._untag(key, category)
+        return True
+
+    def add(self, name: str, url: str, category: Optional[str] = None,
+            bitrate: str = "") -> Tuple[Station, bool]:
+        """Zapis za URL (postojeći ili nov) i da li je dodat u kategoriju
+
+        Stanica koja već postoji pod drugom kategorijom samo dobija tag.
+        """
+        key = normalize_url(url)
+        station = self._by_url.get(key)
+        if station is None:
+            station = Station(name, url, bitrate, key)
+            self._by_url[key] = station
+            if self._names is not None:
+                self._names.setdefault(normalize_name(name), set()).add(key)
+        elif bitrate and not station.bitrate:
+            station.bitrate = bitrate
+        if category is None or category in station.tags:
+            return station, False
+        station.tags.add(category)
+        self._categories.setdefault(category, []).append(key)
+        return station, True
+
+    def has_name_in(self, name: str, category: str) -> bool:
+        keys = self._by_name.get(normalize_name(name), ())
+        return any(category in self._by_url[key].tags for key in keys)
+
+    def remove_at(self, category: str, index: int) -> Optional[Station]:
+        """Skini stanicu sa pozicije u kategoriji (zapis ostaje ako ima druge tagove)"""
+        keys = self._categories.get(category)
+        if keys is None or not 0 <= index < len(keys):
+            return None
+        key = keys.pop(index)
+        station = self._by_url[key]
+        self._untag(key, category)
+        return station
+
+    def _untag(self, key: str, category: str):
+        station = self._by_url.get(key)
+        if station is None:
+            return
+        station.tags.discard(category)
+        if station.tags:
+            return
+        # Stanica više nije ni u jednoj kategoriji - izbaci zapis i indekse
+        del self._by_url[key]
+        if self._names is None:
+            return
+        name_key = normalize_name(station.name)
+        keys = self._names.get(name_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._names[name_key]
+
+    # === FORMATI ===
+
+    def import_categories(self, categories: Dict[str, Iterable]):
+        """Zameni ceo katalog (isti potpis kao SqliteCatalog)"""
+        imported = self.from_categories(categories)
+        self._by_url, self._names, self._categories = (
+            imported._by_url, imported._names, imported._categories)
+
+    @classmethod
+    def from_categories(cls, categories: Dict[str, Iterable]) -> "StationCatalog":
+        """Iz starog formata {kategorija: [(ime, url), ...]} (stations.json)"""
+        catalog = cls()
+        for category, stations in categories.items():
+            catalog.add_category(category)
+            for entry in stations:
+                if isinstance(entry, dict):  # {"name": ..., "url": ...} kao u README-u
+                    catalog.add(entry.get("name", ""), entry.get("url", ""), category,
+                                entry.get("bitrate", ""))
+                else:
+                    name, url = entry
+                    catalog.add(name, url, category)
+        return catalog
+
+    def to_categories(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Stari format - jedna stavka po kategoriji u kojoj je stanica"""
+        return {
+            category: [(self._by_url[key].name, self._by_url[key].url) for key in keys]
+            for category, keys in self._categories.items()
+        }
+
+    def to_records(self) -> dict:
+        """Za SettingsStore: svaka stanica jednom, kategorije kao indeksi"""
+        index = {key: i for i, key in enumerate(self._by_url)}
+        stations = []
+        for station in self._by_url.values():
+            record = {"name": station.name, "url": station.url}
+            if station.key != station.url:
+                record["key"] = station.key  # da se pri učitavanju URL ne normalizuje ponovo
+            if station.bitrate:
+                record["bitrate"] = station.bitrate
+            stations.append(record)
+        return {
+            "version": 3,
+            "stations": stations,
+            "categories": {category: [index[key] for key in keys]
+                           for category, keys in self._categories.items()},
+        }
+
+    @classmethod
+    def from_records(cls, data: dict) -> "StationCatalog":
+        if data.get("version", 1) < 2:
+            return cls.from_categories(data.get("categories") or {})
+        catalog = cls()
+        # Zapisi su već jedinstveni - od verzije 3 nose ključ kad se razlikuje od
+        # URL-a, pa se pri učitavanju ništa ne normalizuje; verzija 2 normalizuje
+        # svaki URL jednom, ne po kategoriji
+        has_keys = data["version"] >= 3
+        records = [Station(record["name"], record["url"], record.get("bitrate", ""),
+                           (record.get("key") or record["url"]) if has_keys else None)
+                   for record in data.get("stations", [])]
+        for station in records:
+            if station.key not in catalog._by_url:
+                catalog._by_url[station.key] = station
+        for category, indexes in data.get("categories", {}).items():
+            keys = catalog._categories.setdefault(category, [])
+            for i in indexes:
+                station = catalog._by_url[records[i].key]
+                if category not in station.tags:
+                    station.tags.add(category)
+                    keys.append(station.key)
+        # Zapis koji nije ni u jednoj kategoriji se ne čuva
+        for key in [key for key, station in catalog._by_url.items() if not station.tags]:
+            catalog._untag(key, "")
+        return catalog
@@ -0,0 +1,310 @@
+"""
+SQLite katalog stanica - za velike kataloge (ceo radio-browser, 50k+ stanica)
+
+Isti API kao StationCatalog, ali stanice žive u tabelama settings.db:
+ništa se ne učitava unapred, svaka izmena je upis jednog reda, a pretraga
+po imenu i kategorijama ide kroz FTS5 indeks (ako ga SQLite ima).
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from traywave.core.catalog import Station, StationCatalog, normalize_name, normalize_url
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS station (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,          -- normalize_url(url)
+    url TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,            -- normalize_name(name)
+    bitrate TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS station_name ON station (name_key);
+CREATE TABLE IF NOT EXISTS category (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS membership (
+    category_id INTEGER NOT NULL REFERENCES category (id) ON DELETE CASCADE,
+    station_id INTEGER NOT NULL REFERENCES station (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (category_id, station_id)
+);
+CREATE INDEX IF NOT EXISTS membership_order ON membership (category_id, position);
+CREATE INDEX IF NOT EXISTS membership_station ON membership (station_id);
+"""
+
+_TAGS = ("(SELECT group_concat(c.name, char(10)) FROM membership t JOIN category c "
+         "ON c.id = t.category_id WHERE t.station_id = s.id)")
+
+
+class SqliteCatalog:
+    """StationCatalog u SQLite tabelama (WAL, upis po redu, FTS5 pretraga)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")  # u WAL-u bezbedno, bez fsync-a po upisu
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.executescript(_SCHEMA)
+        self.fts = self._create_fts()
+
+    def _create_fts(self) -> bool:
+        try:
+            self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS station_fts USING fts5(name, tags, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            return True
+        except sqlite3.Error:
+            print("⚠️  SQLite bez FTS5 - pretraga stanica ide bez indeksa")
+            return False
+
+    def __len__(self) -> int:
+        return self._one("SELECT count(*) FROM station")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # === PRETRAGA ===
+
+    def find_url(self, url: str) -> Optional[Station]:
+        rows = self._stations("WHERE s.key = ?", (normalize_url(url),))
+        return rows[0] if rows else None
+
+    def find_name(self, name: str) -> List[Station]:
+        return self._stations("WHERE s.name_key = ?", (normalize_name(name),))
+
+    def categories(self) -> List[str]:
+        return [row[0] for row in self._db.execute("SELECT name FROM category ORDER BY position")]
+
+    def has_category(self, category: str) -> bool:
+        return self._category_id(category) is not None
+
+    def stations_in(self, category: str) -> List[Station]:
+        return self._stations(
+            "JOIN membership m ON m.station_id = s.id JOIN category k ON k.id = m.category_id "
+            "WHERE k.name = ? ORDER BY m.position", (category,)
+        )
+
+    def pairs_in(self, category: str) -> List[Tuple[str, str]]:
+        """(ime, url) za meni - bez tagova, najbrži put"""
+        return self._db.execute(
+            "SELECT s.name, s.url FROM station s JOIN membership m ON m.station_id = s.id "
+            "JOIN category k ON k.id = m.category_id WHERE k.name = ? ORDER BY m.position",
+            (category,)
+        ).fetchall()
+
+    def all_stations(self) -> List[Station]:
+        return self._stations("", ())
+
+    def has_name_in(self, name: str, category: str) -> bool:
+        return self._db.execute(
+            "SELECT 1 FROM station s JOIN membership m ON m.station_id = s.id "
+            "JOIN category k ON k.id = m.category_id WHERE s.name_key = ? AND k.name = ? LIMIT 1",
+            (normalize_name(name), category)
+        ).fetchone() is not None
+
+    def search(self, query: str, limit: int = 50) -> List[Station]:
+        """Stanice čije ime ili kategorija sadrže sve reči upita (prefiksno)"""
+        words = [word for word in query.replace('"', " ").split() if word]
+        if not words:
+            return []
+        if self.fts:
+            match = " ".join(f'"{word}"*' for word in words)
+            return self._stations(
+                "JOIN station_fts f ON f.rowid = s.id WHERE station_fts MATCH ? "
+                "ORDER BY f.rank LIMIT ?", (match, limit)
+            )
+        where = " AND ".join(f"(s.name_key LIKE ? OR {_TAGS} LIKE ?)" for _ in words)
+        params: List = []
+        for word in words:
+            params += [f"%{word.casefold()}%", f"%{word}%"]
+        return self._stations(f"WHERE {where} LIMIT ?", tuple(params) + (limit,))
+
+    # === IZMENE (svaka je jedna mala transakcija) ===
+
+    def add_category(self, category: str) -> bool:
+        with self._transaction():
+            if self._category_id(category) is not None:
+                return False
+            position = self._one("SELECT coalesce(max(position), -1) + 1 FROM category")
+            self._db.execute("INSERT INTO category (name, position) VALUES (?, ?)",
+                             (category, position))
+            return True
+
+    def remove_category(self, category: str) -> bool:
+        with self._transaction():
+            category_id = self._category_id(category)
+            if category_id is None:
+                return False
+            station_ids = [row[0] for row in self._db.execute(
+                "SELECT station_id FROM membership WHERE category_id = ?", (category_id,))]
+            self._db.execute("DELETE FROM category WHERE id = ?", (category_id,))
+            for station_id in station_ids:
+                self._after_untag(station_id)
+            return True
+
+    def add(self, name: str, url: str, category: Optional[str] = None,
+            bitrate: str = "") -> Tuple[Station, bool]:
+        with self._transaction():
+            station_id, added = self._add(name, url, category, bitrate)
+        return self._station(station_id), added
+
+    def remove_at(self, category: str, index: int) -> Optional[Station]:
+        with self._transaction():
+            category_id = self._category_id(category)
+            if category_id is None or index < 0:
+                return None
+            row = self._db.execute(
+                "SELECT station_id FROM membership WHERE category_id = ? "
+                "ORDER BY position LIMIT 1 OFFSET ?", (category_id, index)
+            ).fetchone()
+            if row is None:
+                return None
+            station = self._station(row[0])
+            self._db.execute("DELETE FROM membership WHERE category_id = ? AND station_id = ?",
+                             (category_id, row[0]))
+            self._after_untag(row[0])
+            return station
+
+    # === UVOZ / IZVOZ ===
+
+    def import_categories(self, categories: Dict[str, Iterable]):
+        """Zameni ceo katalog (stations.json ili StationCatalog.to_categories())
+
+        Deduplikacija ide kroz StationCatalog u memoriji, a u bazu se sve
+        upisuje sa nekoliko executemany u jednoj transakciji.
+        """
+        source = StationCatalog.from_categories(categories)
+        ids = {station.key: i for i, station in enumerate(source.all_stations(), 1)}
+        with self._transaction():
+            self._db.execute("DELETE FROM membership")
+            self._db.execute("DELETE FROM category")
+            self._db.execute("DELETE FROM station")
+            if self.fts:
+                self._db.execute("DELETE FROM station_fts")
+            self._db.executemany(
+                "INSERT INTO station (id, key, url, name, name_key, bitrate) VALUES (?, ?, ?, ?, ?, ?)",
+                ((ids[s.key], s.key, s.url, s.name, normalize_name(s.name), s.bitrate)
+                 for s in source.all_stations())
+            )
+            for position, category in enumerate(source.categories()):
+                category_id = self._db.execute(
+                    "INSERT INTO category (name, position) VALUES (?, ?)", (category, position)
+                ).lastrowid
+                self._db.executemany(
+                    "INSERT INTO membership (category_id, station_id, position) VALUES (?, ?, ?)",
+                    ((category_id, ids[s.key], i) for i, s in enumerate(source.stations_in(category)))
+                )
+            if self.fts:
+                self._db.executemany(
+                    "INSERT INTO station_fts (rowid, name, tags) VALUES (?, ?, ?)",
+                    ((ids[s.key], s.name, "\n".join(s.tags)) for s in source.all_stations())
+                )
+        # Uvoz je jedna velika transakcija - ne ostavljaj WAL te veličine na disku
+        self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def to_categories(self) -> Dict[str, List[Tuple[str, str]]]:
+        result: Dict[str, List[Tuple[str, str]]] = {name: [] for name in self.categories()}
+        rows = self._db.execute(
+            "SELECT k.name, s.name, s.url FROM membership m JOIN category k ON k.id = m.category_id "
+            "JOIN station s ON s.id = m.station_id ORDER BY k.position, m.position"
+        )
+        for category, name, url in rows:
+            result[category].append((name, url))
+        return result
+
+    # === INTERNO ===
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN/COMMIT oko izmene; ugnežđeni pozivi su deo spoljne transakcije"""
+        with self._lock:
+            if self._depth == 0:
+                self._db.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._db.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._db.execute("COMMIT")
+
+    def _one(self, sql: str, params: tuple = ()):
+        return self._db.execute(sql, params).fetchone()[0]
+
+    def _category_id(self, category: str) -> Optional[int]:
+        row = self._db.execute("SELECT id FROM category WHERE name = ?", (category,)).fetchone()
+        return row[0] if row else None
+
+    def _stations(self, clause: str, params: tuple) -> List[Station]:
+        rows = self._db.execute(
+            f"SELECT s.name, s.url, s.bitrate, {_TAGS} FROM station s {clause}", params
+        ).fetchall()
+        result = []
+        for name, url, bitrate, tags in rows:
+            station = Station(name, url, bitrate)
+            station.tags = set(tags.split("\n")) if tags else set()
+            result.append(station)
+        return result
+
+    def _station(self, station_id: int) -> Optional[Station]:
+        rows = self._stations("WHERE s.id = ?", (station_id,))
+        return rows[0] if rows else None
+
+    def _add(self, name: str, url: str, category: Optional[str], bitrate: str) -> Tuple[int, bool]:
+        key = normalize_url(url)
+        row = self._db.execute("SELECT id, bitrate FROM station WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            station_id = self._db.execute(
+                "INSERT INTO station (key, url, name, name_key, bitrate) VALUES (?, ?, ?, ?, ?)",
+                (key, url.strip(), name, normalize_name(name), bitrate)
+            ).lastrowid
+        else:
+            station_id = row[0]
+            if bitrate and not row[1]:
+                self._db.execute("UPDATE station SET bitrate = ? WHERE id = ?", (bitrate, station_id))
+        added = False
+        if category is not None:
+            category_id = self._category_id(category)
+            if category_id is None:
+                self.add_category(category)
+                category_id = self._category_id(category)
+            position = self._one("SELECT coalesce(max(position), -1) + 1 FROM membership "
+                                 "WHERE category_id = ?", (category_id,))
+            added = self._db.execute(
+                "INSERT OR IGNORE INTO membership (category_id, station_id, position) VALUES (?, ?, ?)",
+                (category_id, station_id, position)
+            ).rowcount > 0
+        if row is None or added:
+            self._index(station_id)
+        return station_id, added
+
+    def _after_untag(self, station_id: int):
+        """Stanica bez kategorija se briše, ostalima se osvežava FTS red"""
+        if self._db.execute("SELECT 1 FROM membership WHERE station_id = ? LIMIT 1",
+                            (station_id,)).fetchone() is None:
+            self._db.execute("DELETE FROM station WHERE id = ?", (station_id,))
+            if self.fts:
+                self._db.execute("DELETE FROM station_fts WHERE rowid = ?", (station_id,))
+        else:
+            self._index(station_id)
+
+    def _index(self, station_id: int):
+        if self.fts:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO station_fts (rowid, name, tags) "
+                f"SELECT s.id, s.name, {_TAGS} FROM station s WHERE s.id = ?", (station_id,)
+            )
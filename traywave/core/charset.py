@@ -0,0 +1,151 @@
+"""
+ICY metadata charset detection - jedna odluka po stanici, keširana na disku
+"""
+from typing import Dict, List, Optional
+
+from traywave.core.settings import SettingsStore, shared_settings
+
+# Redosled je bitan: kod nerešenog skora pobeđuje raniji kandidat
+CANDIDATES = ("utf-8", "cp1250", "iso-8859-2", "latin-1")
+SAMPLE_BLOCKS = 3       # toliko ne-ASCII blokova se glasa pre odluke
+MAX_ASCII_BLOCKS = 8    # posle ovoliko čistih ASCII blokova uzmi utf-8
+MAX_DECODE_ERRORS = 2   # toliko grešaka sa keširanim codec-om pa ponovo detektuj
+
+# Slova koja očekujemo na EX-YU (i srednjeevropskim) stanicama
+_PREFERRED = set("šđčćžŠĐČĆŽ")
+
+
+def _score(text: str) -> int:
+    """Koliko dekodiran tekst liči na normalan naslov"""
+    score = 0
+    for char in text:
+        if char in _PREFERRED:
+            score += 3
+        elif char == "�" or (char < " " and char not in "\t") or "\x7f" <= char <= "\x9f":
+            score -= 5
+        elif char.isalpha():
+            score += 1
+    return score
+
+
+def _is_utf8(data: bytes) -> bool:
+    try:
+        data.decode("utf-8")
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def detect_charset(data: bytes) -> str:
+    """Pogodi codec za jedan metadata blok (skupo - ne zvati za svaki blok)"""
+    if _is_utf8(data):
+        return "utf-8"
+
+    best, best_score = CANDIDATES[-1], None
+    for codec in CANDIDATES[1:]:
+        score = _score(data.decode(codec, errors="replace"))
+        if best_score is None or score > best_score:
+            best, best_score = codec, score
+    return best
+
+
+class StationDecoder:
+    """Dekoder metadata blokova jedne stanice
+
+    Prvih nekoliko ne-ASCII blokova se detektuje i glasa; kad se odluči,
+    svaki sledeći blok je jedan decode() poziv. Detekcija se ponovo
+    pokreće samo ako keširani codec počne da pravi greške.
+    """
+
+    __slots__ = ("url", "codec", "votes", "ascii_blocks", "errors", "_registry")
+
+    def __init__(self, url: str, codec: Optional[str] = None,
+                 registry: Optional["CharsetRegistry"] = None):
+        self.url = url
+        self.codec = codec
+        self.votes: List[str] = []
+        self.ascii_blocks = 0
+        self.errors = 0
+        self._registry = registry
+
+    def decode(self, data: bytes) -> str:
+        """Dekodiraj jedan blok"""
+        codec = self.codec
+        if codec is not None:
+            try:
+                text = data.decode(codec)
+            except UnicodeDecodeError:
+                return self._fallback(data)
+            # cp1250/latin2 retko daju greške - ispravan UTF-8 sa ne-ASCII
+            # bajtovima znači da je stanica promenila enkoder
+            if codec != "utf-8" and not data.isascii() and _is_utf8(data):
+                return self._fallback(data)
+            return text
+
+        if data.isascii():
+            self.ascii_blocks += 1
+            if not self.votes and self.ascii_blocks >= MAX_ASCII_BLOCKS:
+                self._decide("utf-8")
+            return data.decode("ascii")
+
+        codec = detect_charset(data)
+        self.votes.append(codec)
+        if len(self.votes) >= SAMPLE_BLOCKS:
+            self._decide(max(CANDIDATES, key=self.votes.count))
+        return data.decode(codec, errors="replace")
+
+    def _fallback(self, data: bytes) -> str:
+        codec = detect_charset(data)
+        self.errors += 1
+        if self.errors >= MAX_DECODE_ERRORS:
+            print(f"🔤 {self.url}: {self.codec} ne odgovara, prelazim na {codec}")
+            self._decide(codec)
+        return data.decode(codec, errors="replace")
+
+    def _decide(self, codec: str):
+        self.codec = codec
+        self.votes = []
+        self.errors = 0
+        if self._registry is not None:
+            self._registry.remember(self.url, codec)
+
+
+class CharsetRegistry:
+    """Keš odluka po stanici (stream URL -> codec), sekcija "charsets"
+
+    Koristi se samo iz petlje MetadataService-a, pa ne treba zaključavanje.
+    """
+
+    def __init__(self, settings: Optional[SettingsStore] = None):
+        self.settings = settings or shared_settings()
+        self._codecs: Dict[str, str] = self._load()
+        self._decoders: Dict[str, StationDecoder] = {}
+
+    def _load(self) -> Dict[str, str]:
+        data = self.settings.get("charsets", {})
+        return {url: codec for url, codec in data.items() if codec in CANDIDATES}
+
+    def _save(self):
+        self.settings.put("charsets", dict(self._codecs))
+
+    def decoder_for(self, url: str) -> StationDecoder:
+        """Dekoder za stanicu (deli se između playback-a i sampler-a)"""
+        decoder = self._decoders.get(url)
+        if decoder is None:
+            decoder = StationDecoder(url, self._codecs.get(url), self)
+            self._decoders[url] = decoder
+        return decoder
+
+    def remember(self, url: str, codec: str):
+        """Zapamti odluku za stanicu"""
+        if self._codecs.get(url) == codec:
+            return
+        print(f"🔤 {url}: metadata charset {codec}")
+        self._codecs[url] = codec
+        self._save()
+
+    def forget(self, url: str):
+        """Zaboravi odluku (npr. stanica promenila enkoder)"""
+        self._decoders.pop(url, None)
+        if self._codecs.pop(url, None) is not None:
+            self._save()
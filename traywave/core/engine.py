@@ -1,33 +1,63 @@
 """
-Audio engine and playback management - SA REQUESTS METADATA READER
+Audio engine and playback management - SA ASYNCIO METADATA SERVISOM
 """
-from PyQt6.QtCore import QUrl, QTimer, pyqtSignal, QObject, QThread
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput, QMediaMetaData
-from typing import Callable, List
+from PyQt6.QtCore import QTimer, pyqtSignal, QObject
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import atexit
 import json
+import math
 import os
-import re
-import struct
-from pathlib import Path
+import threading
+import time
+
+from traywave.core.backends import (BackendPlayer, MediaStatus, PlaybackBackend,
+                                    PlaybackState, create_backend)
+from traywave.core.metadata_service import MetadataService
+from traywave.core.now_playing import NowPlaying, TitleParser
+from traywave.core.player_pool import PlayerPool, WarmPlayer
+from traywave.core.playlist import PlaylistResolver, is_playlist_url
+from traywave.core.probe import ProbeCache
+from traywave.core.reconnect import ReconnectSupervisor
+from traywave.core.settings import SettingsStore, shared_settings
+from traywave.core.recorder import StreamRecorder, default_record_dir
+from traywave.core.telemetry import PlaybackTelemetry, PlaybackTrace
 
-# Pokušaj importovati requests
-try:
-    import requests
-    HAS_REQUESTS = True
-except ImportError:
-    HAS_REQUESTS = False
-    print("⚠️  'requests' biblioteka nije instalirana. Metadata neće raditi za FLAC/OGG.")
-    print("Instaliraj sa: pip install requests")
 
 
 class ConfigManager:
-    """Manages application configuration"""
+    """Manages application configuration
+
+    Čuva se kao sekcija "config" u SettingsStore-u. Write-behind: set() samo
+    označi ključ kao promenjen, a pozadinski thread upisuje sekciju najviše
+    jednom na flush_ms. flush() upisuje odmah; zove se iz close() na izlasku
+    i iz atexit-a.
     
-    def __init__(self):
-        self.config_dir = self._get_config_dir()
+    config.json je posle migracije mesto za ručna podešavanja koja dijalog
+    nema (backend, mpv_path, mpv_args, catalog_backend, warm_pool_size,
+    media_idle_release_s, title_split_rules): ključevi izmenjeni u fajlu
+    važe na sledećem startu, a uz watch() odmah.
+    """
+    
+    FLUSH_MS = 500
+    
+    def __init__(self, settings: Optional[SettingsStore] = None, flush_ms: int = FLUSH_MS):
+        self.settings = settings or shared_settings()
+        self.flush_ms = flush_ms
+        self.config_dir = self.settings.config_dir
         self.config_file = os.path.join(self.config_dir, "config.json")
         self.default_config = {
             "show_song_info": True,
+            "show_now_on": True,  # trenutna pesma uz stanice u podmenijima
+            "title_split_rules": {},  # stream URL -> regex sa (?P<artist>) i (?P<title>)
+            "warm_pool_size": 2,  # utišani plejeri za brzo prebacivanje (0 = isključeno)
+            "warm_pool_memory_mb": 48,
+            "timeshift_minutes": 0,  # pauza/premotavanje live streama, ring po plejeru (0 = isključeno)
+            "record_dir": "",  # prazno = ~/Music/TrayWave/<stanica>
+            "crossfade_ms": 0,  # pretapanje pri promeni stanice (0 = tvrdi rez)
+            "backend": "qt",  # qt, mpv (eksterni proces, JSON IPC) ili null (bez zvuka)
+            "mpv_path": "mpv",
+            "catalog_backend": "json",  # json ili sqlite (tabele + FTS5, za 10k+ stanica)
+            "media_idle_release_s": 300,  # posle ovoliko u stop-u oslobodi audio stek (0 = nikad)
             "volume": 50,
             "muted": False,
             "last_station": None,
@@ -35,34 +65,116 @@ class ConfigManager:
             "sleep_quit_on_expire": False  # Dodato za sleep timer
         }
         self.config = self._load_config()
-    
-    def _get_config_dir(self) -> str:
-        """Get configuration directory path"""
-        config_dir = os.path.join(Path.home(), ".config", "traywave")
-        os.makedirs(config_dir, exist_ok=True)
-        return config_dir
+        
+        self._lock = threading.Lock()        # config dict i dirty skup
+        self._write_lock = threading.Lock()  # jedan upis u isto vreme
+        self._wake = threading.Condition(self._lock)
+        self._dirty: Set[str] = set()
+        self._dirty_since: Optional[float] = None
+        self._closed = False
+        self.saves = 0
+        self._writer = threading.Thread(target=self._writer_loop, name="traywave-config",
+                                        daemon=True)
+        self._writer.start()
+        self.import_config_file()
+        atexit.register(self.close)
     
     def _load_config(self) -> dict:
-        """Load configuration from file"""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    for key, value in self.default_config.items():
-                        if key not in config:
-                            config[key] = value
-                    return config
-        except Exception:
-            pass
-        return self.default_config.copy()
+        """Load configuration (već učitana sa ostalim hot sekcijama)"""
+        config = self.default_config.copy()
+        stored = self.settings.get("config")
+        if isinstance(stored, dict):
+            config.update(stored)
+        return config
+    
+    def save_config(self, *keys: str):
+        """Zakaži upis (ključevi su samo za evidenciju, upisuje se cela sekcija)"""
+        with self._wake:
+            self._dirty.update(keys or ("*",))
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+                self._wake.notify()
+    
+    def flush(self):
+        """Upiši promene odmah (na pozivajućem thread-u)
+
+        Uvek u batch-u skladišta: unutar tuđeg batch() bloka upis ide u
+        istu transakciju, a redosled zaključavanja je isti za sve thread-ove.
+        """
+        with self.settings.batch(), self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = dict(self.config)
+                self._dirty.clear()
+                self._dirty_since = None
+            self.settings.put("config", snapshot)
+            self.saves += 1
+    
+    def close(self):
+        """Zaustavi pozadinski upis i upiši ono što je ostalo (na izlasku)"""
+        with self._wake:
+            self._closed = True
+            self._wake.notify()
+        self.flush()
     
-    def save_config(self):
-        """Save configuration to file"""
+    def _writer_loop(self):
+        while True:
+            with self._wake:
+                while not self._closed and self._dirty_since is None:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                delay = self._dirty_since + self.flush_ms / 1000 - time.monotonic()
+                if delay > 0:
+                    # Sačekaj kraj prozora - sve izmene do tad idu jednim upisom
+                    self._wake.wait(delay)
+                    continue
+            self.flush()
+    
+    def watch(self, watcher):
+        """Primenjuj izmene config.json dok program radi (FileWatcher)"""
+        watcher.watch(self.config_file, lambda path: self.import_config_file())
+    
+    def import_config_file(self) -> List[str]:
+        """Preuzmi ključeve izmenjene u config.json od prošlog čitanja
+
+        Pamti se poslednji pročitan sadržaj (sekcija "config_file"), pa važi
+        samo ono što je u fajlu zaista promenjeno: stara kopija celog
+        config-a ne vraća jačinu ili poslednju stanicu iz dijaloga.
+        """
+        source = self.settings.get("config_file")
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
-        except Exception:
-            pass
+            mtime = os.stat(self.config_file).st_mtime
+        except OSError:
+            if source is None:
+                self.settings.put("config_file", {"mtime": None, "values": {}})
+            return []
+        if source is not None and source.get("mtime") == mtime:
+            return []
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                values = json.load(f)
+        except Exception as e:
+            print(f"⚠️  Ne mogu da pročitam {self.config_file}: {e}")
+            return []
+        if not isinstance(values, dict):
+            print(f"⚠️  {self.config_file} nije JSON objekat")
+            return []
+        self.settings.put("config_file", {"mtime": mtime, "values": values})
+        if source is None:
+            return []  # nadogradnja: fajl je već preuzet, ovo je polazna tačka
+        previous = source.get("values") or {}
+        changed = [key for key, value in values.items()
+                   if key not in previous or previous[key] != value]
+        if changed:
+            with self._lock:
+                for key in changed:
+                    self.config[key] = values[key]
+            self.save_config(*changed)
+            self.flush()  # odmah u settings.db - catalog_backend čita StationsManager
+            print(f"🔁 config.json: {', '.join(changed)}")
+        return changed
     
     def get(self, key: str, default=None):
         """Get configuration value"""
@@ -70,8 +182,9 @@ class ConfigManager:
     
     def set(self, key: str, value):
         """Set configuration value"""
-        self.config[key] = value
-        self.save_config()
+        with self._lock:
+            self.config[key] = value
+        self.save_config(key)
     
     def get_show_song_info(self) -> bool:
         """Get whether to show song info"""
@@ -79,8 +192,7 @@ class ConfigManager:
     
     def set_show_song_info(self, value: bool):
         """Set whether to show song info"""
-        self.config["show_song_info"] = value
-        self.save_config()
+        self.set("show_song_info", value)
     
     def get_sleep_timer(self):
         """Get sleep timer settings"""
@@ -91,139 +203,131 @@ class ConfigManager:
     
     def set_sleep_timer(self, minutes: int, quit_on_expire: bool):
         """Set sleep timer settings"""
-        self.config["sleep_minutes"] = minutes
-        self.config["sleep_quit_on_expire"] = quit_on_expire
-        self.save_config()
+        with self._lock:
+            self.config["sleep_minutes"] = minutes
+            self.config["sleep_quit_on_expire"] = quit_on_expire
+        self.save_config("sleep_minutes", "sleep_quit_on_expire")
 
 
-class MetadataWorker(QThread):
-    """Worker thread koji čita ICY metadata u pozadini"""
+class MetadataBridge(QObject):
+    """Most između MetadataService thread-a i Qt signala
+
+    Svaka sesija ima svoju generaciju (session_id). Signal nosi generaciju
+    pa prijemnik u GUI thread-u može da odbaci metadata koji je zakasnio
+    iz prethodne stanice (signal se emituje iz thread-a servisa i Qt ga
+    stavlja u red, pa može stići posle promene stanice).
     
-    metadata_found = pyqtSignal(str, str)  # artist, title
+    Sesije zagrejanih plejera (PlayerPool) su otvorene ali nisu tekuće:
+    njihov poslednji metadata se pamti i šalje kad sesija postane tekuća.
+    """
     
-    def __init__(self):
+    metadata_found = pyqtSignal(int, object)  # generation, NowPlaying
+    
+    def __init__(self, service: MetadataService):
         super().__init__()
-        self.url = None
-        self.running = False
-        self.last_title = None
+        self.service = service
+        self.session_id = None
+        self.last_raw = None
+        self._open: Set[int] = set()
+        self._latest: Dict[int, NowPlaying] = {}
+    
+    @property
+    def generation(self) -> Optional[int]:
+        """Generacija tekuće sesije (None ako nema sesije)"""
+        return self.session_id
+    
+    def start(self, url: str, relay: bool = True) -> Optional[str]:
+        """Pokreni sesiju za URL, vrati loopback URL za plejer (ako relay)"""
+        self.stop()
+        session_id, relay_url = self.open(url, relay)
+        self.adopt(session_id)
+        return relay_url
     
-    def set_url(self, url: str):
-        """Postavi URL za čitanje"""
-        self.url = url
-        self.last_title = None
+    def open(self, url: str, relay: bool = True, timeshift_bytes: int = 0,
+             station_url: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        """Otvori sesiju koja još nije tekuća (npr. za zagrejan plejer)"""
+        session_id, relay_url = self.service.open_session(
+            url, self._on_session_metadata, relay=relay, timeshift_bytes=timeshift_bytes,
+            station_url=station_url
+        )
+        self._open.add(session_id)
+        return session_id, relay_url
+    
+    def adopt(self, session_id: Optional[int]):
+        """Učini sesiju tekućom i pošalji njen poslednji metadata"""
+        self.session_id = session_id
+        self.last_raw = None
+        record = self._latest.get(session_id) if session_id is not None else None
+        if record is not None:
+            self.last_raw = record.raw
+            self.metadata_found.emit(session_id, record)
+    
+    def close(self, session_id: int):
+        """Zatvori sesiju (ne blokira, socket se odmah prekida)"""
+        self._open.discard(session_id)
+        self._latest.pop(session_id, None)
+        if session_id == self.session_id:
+            self.session_id = None
+        self.service.close_session(session_id)
     
     def stop(self):
-        """Zaustavi worker"""
-        self.running = False
+        """Zatvori tekuću sesiju"""
+        if self.session_id is not None:
+            self.close(self.session_id)
     
-    def run(self):
-        """Glavna petlja worker thread-a"""
-        if not HAS_REQUESTS or not self.url:
+    def _on_session_metadata(self, session_id: int, record: NowPlaying):
+        """Poziva se iz thread-a servisa"""
+        if session_id in self._open:
+            self._latest[session_id] = record
+        if session_id != self.session_id:
             return
-        
-        self.running = True
-        
-        try:
-            # Napravi request sa ICY-MetaData headerom
-            headers = {
-                'Icy-MetaData': '1',
-                'User-Agent': 'TrayWave/1.0'
-            }
-            
-            response = requests.get(
-                self.url, 
-                headers=headers, 
-                stream=True,
-                timeout=10
-            )
-            
-            # Izvuci metaint iz headera
-            metaint = None
-            if 'icy-metaint' in response.headers:
-                try:
-                    metaint = int(response.headers['icy-metaint'])
-                    print(f"📡 ICY metaint: {metaint}")
-                except:
-                    pass
-            
-            if not metaint:
-                print("⚠️  Stream ne podržava ICY metadata")
-                return
-            
-            # Čitaj stream i parsiraj metadata
-            buffer = b''
-            bytes_until_metadata = metaint
-            
-            for chunk in response.iter_content(chunk_size=4096):
-                if not self.running:
-                    break
-                
-                buffer += chunk
-                
-                while len(buffer) >= bytes_until_metadata:
-                    # Preskoči audio podatke
-                    buffer = buffer[bytes_until_metadata:]
-                    
-                    if len(buffer) < 1:
-                        break
-                    
-                    # Pročitaj metadata length (prvi bajt * 16)
-                    meta_length = buffer[0] * 16
-                    buffer = buffer[1:]
-                    
-                    if meta_length > 0:
-                        if len(buffer) >= meta_length:
-                            # Izvuci metadata
-                            meta_bytes = buffer[:meta_length]
-                            buffer = buffer[meta_length:]
-                            
-                            # Dekodiraj metadata
-                            try:
-                                meta_string = meta_bytes.decode('utf-8', errors='ignore').strip('\x00')
-                                self._parse_metadata(meta_string)
-                            except:
-                                pass
-                            
-                            bytes_until_metadata = metaint
-                        else:
-                            # Nedovoljno podataka, sačekaj još
-                            bytes_until_metadata = 0
-                            break
-                    else:
-                        bytes_until_metadata = metaint
-        
-        except Exception as e:
-            print(f"❌ Metadata worker greška: {e}")
+        # ICY ponavlja isti blok svaki interval - ne šalji ga ponovo u GUI
+        if record.raw != self.last_raw:
+            self.last_raw = record.raw
+            self.metadata_found.emit(session_id, record)
+
+
+class NowPlayingPipeline(QObject):
+    """Jedina faza kroz koju prolaze svi metadata događaji
+
+    Parsira (TitleParser), odbacuje identične naslove i spaja nalete:
+    najviše jedno obaveštenje UI-ju po prolazu Qt event loop-a.
+    """
     
-    def _parse_metadata(self, meta_string: str):
-        """Parsiraj metadata string"""
-        try:
-            # Traži StreamTitle
-            match = re.search(r"StreamTitle='([^']*)'", meta_string)
-            if match:
-                title = match.group(1).strip()
-                
-                if title and title != self.last_title:
-                    self.last_title = title
-                    
-                    # Podeli na artist i title
-                    if ' - ' in title:
-                        parts = title.split(' - ', 1)
-                        artist = parts[0].strip()
-                        song = parts[1].strip()
-                        print(f"🎵 Metadata: {artist} - {song}")
-                        self.metadata_found.emit(artist, song)
-                    elif ': ' in title:
-                        parts = title.split(': ', 1)
-                        artist = parts[0].strip()
-                        song = parts[1].strip()
-                        print(f"🎵 Metadata: {artist} - {song}")
-                        self.metadata_found.emit(artist, song)
-                    else:
-                        print(f"🎵 Metadata: {title}")
-                        self.metadata_found.emit("", title)
-        except Exception as e:
-            print(f"Parse error: {e}")
+    changed = pyqtSignal(object)  # NowPlaying
+    
+    def __init__(self, parser: TitleParser):
+        super().__init__()
+        self.parser = parser
+        self._last_key = None
+        self._pending = None
+        self._scheduled = False
+    
+    def submit(self, record: NowPlaying):
+        """Predaj novi događaj (poziva se iz GUI thread-a)"""
+        record = self.parser.parse(record)
+        if not record.title:
+            return
+        if record.key() == self._last_key and self._pending is None:
+            return
+        self._pending = record
+        if not self._scheduled:
+            self._scheduled = True
+            QTimer.singleShot(0, self._flush)
+    
+    def reset(self):
+        """Zaboravi poslednji naslov (nova stanica ili stop)"""
+        self._last_key = None
+        self._pending = None
+    
+    def _flush(self):
+        self._scheduled = False
+        record, self._pending = self._pending, None
+        if record is None or record.key() == self._last_key:
+            return
+        self._last_key = record.key()
+        print(f"🎵 Metadata: {record.artist + ' - ' if record.artist else ''}{record.title}")
+        self.changed.emit(record)
 
 
 class AudioEngine(QObject):
@@ -231,22 +335,48 @@ class AudioEngine(QObject):
     
     metadata_changed = pyqtSignal(str, str)
     sleep_timer_changed = pyqtSignal(bool, int)  # is_active, minutes_left
+    playlist_resolved = pyqtSignal(str)  # URL stanice (iz thread-a servisa)
+    stream_probed = pyqtSignal(str)  # URL stanice, stigli su headeri (iz thread-a servisa)
+    recording_finished = pyqtSignal(object)  # StreamRecorder (iz writer thread-a)
+    
+    # Brzi uzastopni play() pozivi (klikanje kroz stanice) se spajaju:
+    # prvi se izvršava odmah, a u ovom prozoru samo poslednji
+    PLAY_COALESCE_MS = 250
+    
+    # Crossfade: stara stanica svira dok nova ne napuni bafer, ali dva
+    # dekodera rade najviše CROSSFADE_WAIT_MS + trajanje pretapanja
+    CROSSFADE_WAIT_MS = 8000
+    CROSSFADE_STEP_MS = 40
     
     def __init__(self):
         super().__init__()
         
         self.config = ConfigManager()
-        self.audio = QAudioOutput()
         
+        # Jačina i mute su obično stanje dok multimedia stek ne postoji
         volume = self.config.get("volume", 50)
-        self.audio.setVolume(volume / 100)
-        
         muted = self.config.get("muted", False)
-        self.audio.setMuted(muted)
+        self._volume = volume
         self._muted = muted
 
-        self.player = QMediaPlayer()
-        self.player.setAudioOutput(self.audio)
+        # Playback backend (config "backend") i plejeri se prave na prvi
+        # play() i oslobađaju posle media_idle_release_s u stop-u. Dok nešto
+        # svira self.player je plejer aktivne stanice.
+        self.backend: Optional[PlaybackBackend] = None
+        self._backend_choice: Optional[str] = None  # config "backend" kad je backend napravljen
+        self.player: Optional[BackendPlayer] = None
+        self._active: Optional[WarmPlayer] = None
+        self._release_timer = QTimer()
+        self._release_timer.setSingleShot(True)
+        self._release_timer.timeout.connect(self._release_media)
+        
+        # Vremena faza od play() do zvuka i prvog naslova
+        self.telemetry = PlaybackTelemetry()
+        self._trace: Optional[PlaybackTrace] = None
+        
+        # Automatsko ponovno povezivanje kad server prekine stream (pravi se
+        # sa prvim plejerom - učitava QNetworkInformation backend)
+        self.reconnect: Optional[ReconnectSupervisor] = None
 
         self._volume_before_mute = volume
         self._volume_changed_callbacks: List[Callable] = []
@@ -265,15 +395,70 @@ class AudioEngine(QObject):
         self.current_artist = None
         self.current_url = None
         
-        # Metadata worker za sve streamove
-        self.metadata_worker = MetadataWorker()
+        # Headeri streama (codec, icy-br...) po stanici. Pune ih sesije
+        # servisa iz svog prvog odgovora i resolver - play() ih ne čeka
+        self.probes = ProbeCache(on_record=self.stream_probed.emit)
+        self.stream_probed.connect(self._on_stream_probed)
+        
+        # Metadata servis (jedan asyncio thread za sve streamove)
+        self.metadata_service = MetadataService(probes=self.probes)
+        self.metadata_worker = MetadataBridge(self.metadata_service)
         self.metadata_worker.metadata_found.connect(self._on_worker_metadata)
         
+        # Playliste i redirekcije se razrešavaju jednom i keširaju na disku
+        self.resolver = PlaylistResolver(self.metadata_service,
+                                         on_resolved=self.playlist_resolved.emit,
+                                         probes=self.probes)
+        self.playlist_resolved.connect(self._on_playlist_resolved)
+        self._resolving = None  # (url, bitrate, vreme play() poziva)
+        
+        # Time-shift: koliko sekundi iza live-a sviramo i od kad je pauza.
+        # Dok se sluša iza live-a, naslov u headeru dolazi iz indeksa ringa
+        self.timeshift_delay = 0.0
+        self._paused_at: Optional[float] = None
+        self._timeshift_title_timer = QTimer()
+        self._timeshift_title_timer.setInterval(1000)
+        self._timeshift_title_timer.timeout.connect(self._sync_timeshift_title)
+        
+        # Snimanje: (recorder, session_id, da li je sesija samo za snimanje)
+        self._recording: Optional[Tuple[StreamRecorder, int, bool]] = None
+        self._current_record: Optional[NowPlaying] = None
+        self._closing_recorders: List[StreamRecorder] = []  # writer još prazni red
+        self.recording_finished.connect(self._on_recording_finished)
+        
+        # Jedan parser i jedna faza za sve izvore metadata
+        self.title_parser = TitleParser(self.config.get("title_split_rules"))
+        self.now_playing = NowPlayingPipeline(self.title_parser)
+        self.now_playing.changed.connect(self._on_now_playing)
+        
         # Flag da li koristimo worker ili PyQt metadata
         self.use_worker = False
         
-        self.player.playbackStateChanged.connect(self._on_playback_changed)
-        self.player.metaDataChanged.connect(self._on_qt_metadata_changed)
+        # Zagrejani plejeri: poslednja stanica i stanica pod kursorom
+        self.player_pool = PlayerPool(
+            self._create_player, self._dispose_player,
+            size=self.config.get("warm_pool_size", 2),
+            memory_mb=self.config.get("warm_pool_memory_mb", 48)
+        )
+        
+        # Pretapanje: plejer koji se utišava i tajmeri rampe
+        self._fade_from: Optional[WarmPlayer] = None
+        self._fade_started: Optional[float] = None
+        self._fade_volume = volume / 100
+        self._fade_timer = QTimer()
+        self._fade_timer.setInterval(self.CROSSFADE_STEP_MS)
+        self._fade_timer.timeout.connect(self._on_fade_step)
+        self._fade_wait_timer = QTimer()
+        self._fade_wait_timer.setSingleShot(True)
+        self._fade_wait_timer.setInterval(self.CROSSFADE_WAIT_MS)
+        self._fade_wait_timer.timeout.connect(self._finish_crossfade)
+        
+        # Spajanje brzih promena stanice
+        self._pending_play = None
+        self._play_coalesce_timer = QTimer()
+        self._play_coalesce_timer.setSingleShot(True)
+        self._play_coalesce_timer.setInterval(self.PLAY_COALESCE_MS)
+        self._play_coalesce_timer.timeout.connect(self._on_play_coalesce_timeout)
         
         # Fallback timer
         self.metadata_timer = QTimer()
@@ -283,7 +468,7 @@ class AudioEngine(QObject):
         # Timer za update sleep timer display-a
         self.sleep_update_timer = QTimer()
         self.sleep_update_timer.timeout.connect(self._update_sleep_display)
-        self.sleep_update_timer.start(60000)  # Svaki minut
+        self.sleep_update_timer.setInterval(60000)  # Svaki minut, samo dok timer radi
 
     # === SLEEP TIMER METODE ===
     
@@ -300,6 +485,7 @@ class AudioEngine(QObject):
             self.sleep_timer.setSingleShot(True)
             self.sleep_timer.timeout.connect(self._on_sleep_timeout)
             self.sleep_timer.start(minutes * 60 * 1000)  # min → ms
+            self.sleep_update_timer.start()
             
             # Sačuvaj u config
             self.config.set_sleep_timer(minutes, quit_on_expire)
@@ -312,6 +498,7 @@ class AudioEngine(QObject):
         if self.sleep_timer:
             self.sleep_timer.stop()
             self.sleep_timer = None
+        self.sleep_update_timer.stop()
         
         self.sleep_minutes = 0
         self.sleep_quit_on_expire = False
@@ -357,6 +544,7 @@ class AudioEngine(QObject):
         # Reset timer
         self.sleep_timer = None
         self.sleep_minutes = 0
+        self.sleep_update_timer.stop()
     
     def _update_sleep_display(self):
         """Update sleep timer display (called every minute)"""
@@ -370,31 +558,48 @@ class AudioEngine(QObject):
     
     def play(self, url: str, station_name: str, bitrate: str = "128 kbps"):
         """Play a radio stream"""
+        self._ensure_media()
+        self._pending_play = (url, station_name, bitrate, time.monotonic())
+        if self._play_coalesce_timer.isActive():
+            # Izvršiće se poslednji zahtev kad prozor istekne
+            return
+        self._apply_pending_play()
+    
+    def _on_play_coalesce_timeout(self):
+        """Prozor za spajanje je istekao - pusti poslednju izabranu stanicu"""
+        if self._pending_play:
+            self._apply_pending_play()
+    
+    def _apply_pending_play(self):
+        url, station_name, bitrate, requested_at = self._pending_play
+        self._pending_play = None
+        self._play_coalesce_timer.start()
+        self._start_playback(url, station_name, bitrate, requested_at)
+    
+    def _start_playback(self, url: str, station_name: str, bitrate: str,
+                        requested_at: Optional[float] = None):
+        """Switch the player to a new stream"""
+        self._finish_trace()
+        if url != self.current_url:
+            self.stop_recording()
+        started = requested_at or time.monotonic()
         self.current_url = url
-        
-        # Zaustavi prethodni worker
-        if self.metadata_worker.isRunning():
-            self.metadata_worker.stop()
-            self.metadata_worker.wait(1000)
-        
-        # Odluči koji sistem koristiti
-        # Za FLAC/OGG ili ako PyQt ne radi dobro, koristi worker
-        if HAS_REQUESTS and ('.flac' in url.lower() or '.ogg' in url.lower() or 'flac' in bitrate.lower()):
-            self.use_worker = True
-            print(f"🎵 Koristim requests metadata worker za: {station_name}")
-            self.metadata_worker.set_url(url)
-            self.metadata_worker.start()
-            self.metadata_timer.stop()
-        else:
-            self.use_worker = False
-            self.metadata_timer.start()
-        
-        self.player.setSource(QUrl(url))
-        self.player.play()
         self.current_station = station_name
-        self.current_bitrate = bitrate
+        probe = self.probes.get(url)
+        self.current_bitrate = (probe.bitrate_text if probe else "") or bitrate
         self.current_song = None
         self.current_artist = None
+        self._current_record = None
+        self.now_playing.reset()
+        
+        self._resolving = None
+        has_player = self.player_pool.has(url) or (self._active is not None and self._active.url == url)
+        if not has_player and self._needs_lookup(url):
+            # Playlista nije razrešena - plejer nema šta da otvori dok ne stigne
+            self._resolving = (url, bitrate, started)
+            self.resolver.resolve(url)
+        else:
+            self._switch_player(url, bitrate, started)
         
         self.config.set("last_station", {
             "name": station_name,
@@ -404,34 +609,605 @@ class AudioEngine(QObject):
         
         if self._muted:
             self._muted = False
-            self.audio.setMuted(False)
+            if self._active is not None:
+                self._active.player.set_muted(False)
             
         self._notify_icon_changed()
         self._notify_station_changed()
 
+    def _switch_player(self, url: str, bitrate: str, started: float):
+        """Prebaci zvuk na plejer stanice (zagrejan iz pool-a ili nov)"""
+        self._ensure_media()
+        self._finish_crossfade()
+        previous = self._active
+        if previous is not None and previous.url == url:
+            entry, warm = previous, True
+        else:
+            entry = self.player_pool.take(url)
+            warm = entry is not None
+            if entry is None:
+                entry = self._create_player(url, bitrate)
+        
+        crossfade = (
+            previous is not None and previous is not entry and not self._muted
+            and self.config.get("crossfade_ms", 0) > 0
+            and previous.player.is_playing()
+        )
+        
+        self._trace = PlaybackTrace(url, self.current_station, warm, started)
+        self._trace.mark("source_set")
+        self._activate(entry, take_output=not crossfade)
+        self.reconnect.watch()
+        if crossfade:
+            # Stara stanica svira dalje dok se nova ne napuni pa se pretope
+            self._begin_crossfade(previous, entry)
+        elif previous is not None and previous is not entry:
+            # Prethodna stanica ostaje utišana u pool-u
+            self.player_pool.park(previous)
+    
+    def _on_playlist_resolved(self, url: str):
+        """Resolver je završio - nastavi play() koji ga je čekao"""
+        if url != self.current_url:
+            return
+        if self._resolving and self._resolving[0] == url:
+            url, bitrate, started = self._resolving
+            self._resolving = None
+            self._switch_player(url, bitrate, started)
+    
+    def _on_stream_probed(self, url: str):
+        """Stigli su headeri stanice - pravi bitrate u header, a ako je
+        Ogg/FLAC pušten direktno, naslove za ovo slušanje čita posebna sesija"""
+        probe = self.probes.get(url)
+        if url != self.current_url or probe is None:
+            return
+        if probe.bitrate_text and probe.bitrate_text != self.current_bitrate:
+            self.current_bitrate = probe.bitrate_text
+            self._notify_station_changed()
+        entry = self._active
+        if (entry is not None and entry.url == url and entry.session_id is None
+                and probe.needs_metadata_service):
+            print(f"🎵 {probe.codec} bez naslova u plejeru, otvaram metadata sesiju")
+            source = self.resolver.lookup(url) or url
+            entry.session_id, _ = self.metadata_worker.open(source, relay=False, station_url=url)
+            self.use_worker = True
+            self.metadata_worker.adopt(entry.session_id)
+            self.metadata_timer.stop()
+    
+    def _needs_lookup(self, url: str) -> bool:
+        """Da li pre pokretanja treba razrešiti playlistu (ostalo se proba usput)"""
+        return is_playlist_url(url) and not self.resolver.is_fresh(url)
+    
+    def stream_details(self) -> str:
+        """Codec/bitrate tekuće stanice za header i tooltip"""
+        if not self.current_url:
+            return ""
+        probe = self.probes.get(self.current_url)
+        details = probe.details if probe and probe.details else self.current_bitrate
+        shift = self.timeshift_text()
+        return f"{details} · {shift}" if shift else details
+
     def stop(self):
         """Stop playback"""
-        self.player.stop()
+        self._pending_play = None
+        self._resolving = None
+        self._play_coalesce_timer.stop()
+        self._finish_trace()
+        self._finish_crossfade()
+        if self.reconnect is not None:
+            self.reconnect.stop()
+        self.stop_recording()
+        self._paused_at = None
+        self.timeshift_delay = 0.0
+        self._timeshift_title_timer.stop()
         
-        # Zaustavi worker
-        if self.metadata_worker.isRunning():
-            self.metadata_worker.stop()
-            self.metadata_worker.wait(1000)
+        # Ugasi aktivni plejer (i njegovu metadata sesiju)
+        entry, self._active = self._active, None
+        self._set_player(None)
+        if entry is not None:
+            self._dispose_player(entry)
+        self.metadata_worker.stop()
+        self._arm_release()
         
         self.current_station = None
         self.current_song = None
         self.current_artist = None
         self.current_url = None
+        self._current_record = None
         self.use_worker = False
+        self.now_playing.reset()
         self.metadata_timer.stop()
         self._notify_icon_changed()
         self._notify_station_changed()
         self._notify_metadata_changed(None, None)
 
+    def shutdown(self):
+        """Stop playback and release background services (on quit)"""
+        self.stop()
+        self._release_timer.stop()
+        self.player_pool.clear()
+        for recorder in list(self._closing_recorders):
+            # Na izlasku se čeka (kratko) da poslednji snimak ode na disk
+            recorder.wait(2.0)
+        self.telemetry.flush()
+        self.config.close()
+        self.metadata_service.shutdown()
+
+    def prewarm(self, url: str, bitrate: str = "128 kbps"):
+        """Kursor je na stanici u meniju - počni da je baferuješ"""
+        if url == self.current_url:
+            return
+        if self._needs_lookup(url):
+            # Bez razrešene playliste nema šta da se baferuje - uradi to sad
+            self.resolver.resolve(url)
+            return
+        self.player_pool.request_warm(url, bitrate)
+        if self._active is None:
+            # Zagrejani plejeri ne smeju da ostanu da rade dok ništa ne svira
+            self._arm_release()
+    
+    def get_reconnect_stats(self) -> dict:
+        """Brojači supervizora (nule dok ništa nije puštano)"""
+        if self.reconnect is None:
+            return {"outages": 0, "reconnects": 0, "recoveries": 0, "downtime": 0.0, "online": True}
+        return self.reconnect.get_stats()
+
+    # === MULTIMEDIA STEK ===
+    
+    def _ensure_media(self):
+        """Pripremi backend i supervizor (prvi play ili posle oslobađanja)"""
+        self._release_timer.stop()
+        choice = self.config.get("backend", "qt")
+        if self.backend is not None and self._active is None and choice != self._backend_choice:
+            # Drugi backend izabran u config.json - zagrejani plejeri ostaju u starom
+            print(f"🔊 Menjam playback backend: {self._backend_choice} -> {choice}")
+            self.player_pool.clear()
+            self.backend = None
+        self._ensure_backend()
+        if self.reconnect is None:
+            self.reconnect = ReconnectSupervisor(self._reconnect)
+    
+    def _ensure_backend(self) -> PlaybackBackend:
+        if self.backend is None:
+            self._backend_choice = self.config.get("backend", "qt")
+            self.backend = create_backend(self._backend_choice, self.config)
+            print(f"🔊 Playback backend: {self.backend.name}")
+        return self.backend
+    
+    def _arm_release(self):
+        seconds = self.config.get("media_idle_release_s", 300) or 0
+        if seconds > 0:
+            self._release_timer.start(int(seconds * 1000))
+    
+    def _release_media(self):
+        """Dugo ništa ne svira - oslobodi plejere, audio izlaz i backend
+
+        pool.clear() gasi svaki plejer kroz release(): Qt backend radi
+        deleteLater na QMediaPlayer/QAudioOutput (dekoder, bafer i audio
+        sink nestaju), mpv proces izlazi. Već uvezen PyQt6.QtMultimedia i
+        njegov FFmpeg plugin ostaju učitani - Python ne može da ih izbaci,
+        pa se oslobađa samo ono što plejeri drže.
+        """
+        if self._active is not None or self._pending_play or self._resolving:
+            return
+        self.player_pool.clear()
+        if self.backend is None:
+            return
+        print("💤 Ništa ne svira, oslobađam playback backend")
+        self.backend = None
+    
+    # === PLEJERI ===
+    
+    def _needs_metadata_service(self, url: str, bitrate: str) -> bool:
+        """Za FLAC/OGG PyQt ne daje metadata, koristi servis"""
+        probe = self.probes.get(url)
+        if probe is not None and probe.codec is not None:
+            return probe.needs_metadata_service
+        # Stream nije probovan (server nije odgovorio) - pogodi po URL-u
+        return '.flac' in url.lower() or '.ogg' in url.lower() or 'flac' in bitrate.lower()
+    
+    def _timeshift_bytes(self, url: str, bitrate: str) -> int:
+        """Veličina time-shift ringa za stanicu (0 = bez time-shift-a)
+
+        Samo MP3/AAC: dekoder može da krene od bilo kog bajta (traži sync),
+        dok Ogg/FLAC bez header stranica sa početka streama ne mogu.
+        """
+        minutes = self.config.get("timeshift_minutes", 0) or 0
+        if minutes <= 0:
+            return 0
+        probe = self.probes.get(url)
+        if probe is not None and probe.codec is not None:
+            if probe.codec not in ("mp3", "aac"):
+                return 0
+        elif self._needs_metadata_service(url, bitrate):
+            return 0
+        kbps = probe.bitrate if probe is not None and probe.bitrate else 0
+        if not kbps:
+            digits = "".join(ch for ch in bitrate if ch.isdigit())
+            kbps = int(digits) if digits else 128
+        return int(minutes * 60 * kbps * 1000 / 8)
+    
+    def _create_player(self, url: str, bitrate: str) -> WarmPlayer:
+        """Napravi utišan plejer koji odmah počinje da baferuje stanicu"""
+        player = self._ensure_backend().create_player()
+        player.set_muted(True)
+        
+        session_id = None
+        source = self.resolver.lookup(url) or url
+        probe = self.probes.get(url)
+        if probe is not None and probe.bitrate_text:
+            bitrate = probe.bitrate_text
+        timeshift = None
+        timeshift_bytes = self._timeshift_bytes(url, bitrate)
+        if timeshift_bytes or self._needs_metadata_service(url, bitrate):
+            # Jedna upstream konekcija: plejer čita audio sa lokalnog relay-a
+            # (sa time-shift-om relay pamti stream u ring fajlu)
+            session_id, source = self.metadata_worker.open(source, timeshift_bytes=timeshift_bytes,
+                                                           station_url=url)
+            if timeshift_bytes:
+                timeshift = self.metadata_service.get_relay(session_id)
+        elif probe is None or not self.resolver.is_fresh(url):
+            # Plejer čita stanicu direktno - headere i krajnji URL posle
+            # redirekcija donosi resolver u pozadini, plejer ga ne čeka
+            self.resolver.resolve(url)
+        
+        entry = WarmPlayer(url, bitrate, player, session_id, timeshift)
+        player.status_changed.connect(
+            lambda status, e=entry: self._on_media_status(e, status)
+        )
+        player.set_source(source)
+        player.play()
+        return entry
+    
+    def _dispose_player(self, entry: WarmPlayer):
+        """Ugasi plejer i zatvori njegovu sesiju"""
+        entry.player.release()
+        if entry.session_id is not None:
+            self.metadata_worker.close(entry.session_id)
+    
+    def _set_player(self, player: Optional[BackendPlayer]):
+        """Prebaci signale na novi aktivni plejer"""
+        if player is self.player:
+            return
+        if self.player is not None:
+            try:
+                self.player.state_changed.disconnect(self._on_playback_changed)
+                self.player.title_changed.disconnect(self._on_player_title)
+                self.player.error.disconnect(self._on_player_error)
+            except (TypeError, RuntimeError):
+                pass
+        self.player = player
+        if player is None:
+            return
+        player.state_changed.connect(self._on_playback_changed)
+        player.title_changed.connect(self._on_player_title)
+        player.error.connect(self._on_player_error)
+    
+    def _activate(self, entry: WarmPlayer, take_output: bool = True):
+        """Učini plejer aktivnim: svira na jačini engine-a
+
+        Bez take_output (crossfade) kreće od tišine, rampa ga pojačava.
+        """
+        self._active = entry
+        self._paused_at = None
+        self.timeshift_delay = 0.0
+        self._timeshift_title_timer.stop()
+        self._set_player(entry.player)
+        if take_output:
+            self._apply_volume(entry)
+        else:
+            entry.player.set_volume(0.0)
+            entry.player.set_muted(False)
+        if not entry.player.is_playing():
+            entry.player.play()
+        
+        self.use_worker = entry.session_id is not None
+        self.metadata_worker.adopt(entry.session_id)
+        if self.use_worker:
+            print(f"🎵 Koristim metadata servis za: {self.current_station}")
+            self.metadata_timer.stop()
+        else:
+            self.metadata_timer.start()
+            # Zagrejan plejer možda već ima naslov
+            self._on_player_title(entry.player.title())
+        
+        if entry.is_buffered:
+            # Zagrejan plejer već ima bafer - zvuk kreće čim preuzme izlaz
+            self._mark_phase("first_audio")
+    
+    def _apply_volume(self, entry: WarmPlayer):
+        entry.player.set_volume(self._volume / 100)
+        entry.player.set_muted(self._muted)
+    
+    def _on_media_status(self, entry: WarmPlayer, status: MediaStatus):
+        """Prati kad je plejer napunio bafer i faze aktivnog plejera"""
+        Status = MediaStatus
+        if status == Status.Buffered and entry.buffered_at is None:
+            entry.buffered_at = time.monotonic()
+        if entry is not self._active:
+            if status in (Status.EndOfMedia, Status.Invalid):
+                if entry is self._fade_from:
+                    # Stara stanica je pukla usred pretapanja - nema šta da se čeka
+                    self._finish_crossfade()
+                # Zagrejan stream je pukao - ne čuvaj ga u pool-u
+                self.player_pool.discard(entry)
+            return
+        
+        if status == Status.Buffered and self._fade_from is not None and self._fade_started is None:
+            self._start_fade()
+        
+        if status == Status.Invalid and self.current_url:
+            self.resolver.invalidate(self.current_url)
+        self.reconnect.on_media_status(status)
+        if status == Status.Loading:
+            self._mark_phase("loading")
+        elif status == Status.Loaded:
+            self._mark_phase("connected")
+        elif status == Status.Buffering:
+            self._mark_phase("buffering")
+        elif status == Status.Buffered:
+            self._mark_phase("buffered")
+            self._mark_phase("first_audio")
+        elif status == Status.Stalled and entry.buffered_at is not None:
+            self.telemetry.record_stall(entry.url, self.current_station or entry.url)
+    
+    def _on_player_error(self, message: str):
+        """Greška aktivnog plejera - prepusti je supervizoru"""
+        print(f"❌ Plejer greška: {message}")
+        if self.current_url:
+            self.resolver.invalidate(self.current_url)
+        self.reconnect.on_error(message)
+    
+    def _reconnect(self):
+        """Ponovo otvori tekuću stanicu novim plejerom (poziva supervizor)"""
+        self._finish_crossfade()
+        old = self._active
+        if old is None:
+            return
+        if not self.resolver.is_fresh(old.url):
+            # Razrešen URL je odbačen posle greške - sledeći pokušaj dobija nov
+            self.resolver.resolve(old.url)
+        entry = self._create_player(old.url, old.bitrate)
+        self._activate(entry)
+        if self._recording is not None:
+            # Stara upstream konekcija je pukla - nastavi snimanje kroz novu
+            recorder, session_id, owned = self._recording
+            if owned:
+                self.metadata_service.close_session(session_id)
+            self._attach_recorder(entry, recorder)
+        self._dispose_player(old)
+    
+    # === TIME-SHIFT ===
+    
+    def can_timeshift(self) -> bool:
+        """Da li tekuća stanica ima time-shift bafer"""
+        return self._active is not None and self._active.timeshift is not None
+    
+    def is_paused(self) -> bool:
+        return self._paused_at is not None
+    
+    def current_delay(self) -> float:
+        """Koliko sekundi iza live-a je ono što se čuje (uklj. trajanje pauze)"""
+        delay = self.timeshift_delay
+        if self._paused_at is not None:
+            delay += time.monotonic() - self._paused_at
+        return delay
+    
+    def timeshift_text(self) -> str:
+        """'⏸', '−1:30' ili '' kad svira live"""
+        if self._paused_at is not None:
+            return "⏸"
+        seconds = int(self.timeshift_delay)
+        if seconds < 1:
+            return ""
+        return f"−{seconds // 60}:{seconds % 60:02d}"
+    
+    def pause(self):
+        """Pauziraj live stream; upstream i dalje puni time-shift bafer"""
+        if not self.can_timeshift() or self._paused_at is not None:
+            return
+        self._finish_crossfade()
+        self._paused_at = time.monotonic()
+        # Pauza nije prekid streama
+        self.reconnect.stop()
+        self.player.pause()
+        self._timeshift_title_timer.stop()
+        self._notify_station_changed()
+    
+    def resume(self):
+        """Nastavi od mesta gde je pauzirano"""
+        if self._paused_at is None:
+            return
+        self._seek_to_delay(self.current_delay())
+    
+    def toggle_pause(self):
+        if self._paused_at is None:
+            self.pause()
+        else:
+            self.resume()
+    
+    def seek_back(self, seconds: float):
+        """Vrati se 'seconds' sekundi unazad (najviše do početka bafera)"""
+        if self.can_timeshift():
+            self._seek_to_delay(self.current_delay() + seconds)
+    
+    def seek_track_start(self):
+        """Skoči na početak pesme koja se trenutno čuje"""
+        if not self.can_timeshift():
+            return
+        relay = self._active.timeshift
+        playhead = relay.position_for_delay(self.current_delay())
+        start = relay.track_start(playhead)
+        started_at = relay.index.time_at(start) if start is not None else None
+        if started_at is None:
+            return
+        self.timeshift_delay = max(0.0, time.monotonic() - started_at)
+        self._play_from(start)
+    
+    def go_live(self):
+        """Nazad na live"""
+        if self.can_timeshift():
+            self.timeshift_delay = 0.0
+            self._play_from(None)
+    
+    def _seek_to_delay(self, delay: float):
+        relay = self._active.timeshift
+        delay = max(0.0, min(delay, relay.buffered_seconds))
+        if delay < 1:
+            self.go_live()
+            return
+        self.timeshift_delay = delay
+        self._play_from(relay.position_for_delay(delay))
+    
+    def _play_from(self, position: Optional[int]):
+        """Plejer čita ring od apsolutne pozicije (None = live ivica)"""
+        entry = self._active
+        self._paused_at = None
+        entry.player.set_source(entry.timeshift.url_at(position))
+        entry.player.play()
+        self.reconnect.watch()
+        if self.timeshift_delay >= 1:
+            self._timeshift_title_timer.start()
+        else:
+            self._timeshift_title_timer.stop()
+        self._sync_timeshift_title()
+        self._notify_station_changed()
+    
+    def _is_shifted(self) -> bool:
+        """Da li se čuje nešto iza live ivice (pauza ili premotano)"""
+        return self.can_timeshift() and (self._paused_at is not None or self.timeshift_delay >= 1)
+    
+    def _sync_timeshift_title(self):
+        """Header prati pesmu koja se čuje: iz indeksa ringa, ili live naslov"""
+        if not self._is_shifted():
+            self._timeshift_title_timer.stop()
+            record = self._current_record
+        else:
+            relay = self._active.timeshift
+            raw = relay.title_at(relay.position_for_delay(self.current_delay()))
+            record = self.title_parser.parse(NowPlaying(raw, self.current_url, "icy")) if raw else None
+        if record is not None and record.title:
+            self._show_record(record)
+    
+    # === CROSSFADE ===
+    
+    def _begin_crossfade(self, previous: WarmPlayer, entry: WarmPlayer):
+        """Stari plejer svira punom jačinom dok nova stanica ne napuni bafer"""
+        self._fade_from = previous
+        self._fade_volume = self._volume / 100
+        self._fade_started = None
+        if entry.is_buffered:
+            self._start_fade()
+        else:
+            # Gornja granica za dva dekodera: posle ovoga tvrdi rez
+            self._fade_wait_timer.start()
+    
+    def _start_fade(self):
+        self._fade_wait_timer.stop()
+        self._fade_started = time.monotonic()
+        self._fade_timer.start()
+    
+    def _on_fade_step(self):
+        """Korak rampe: equal-power krive, ukupna glasnoća ne propada na sredini"""
+        if self._fade_from is None or self._fade_started is None:
+            return
+        duration = max(1, self.config.get("crossfade_ms", 0)) / 1000
+        progress = min(1.0, (time.monotonic() - self._fade_started) / duration)
+        self._fade_from.player.set_volume(self._fade_volume * math.cos(progress * math.pi / 2))
+        if self._active is not None:
+            self._active.player.set_volume(self._fade_volume * math.sin(progress * math.pi / 2))
+        if progress >= 1.0:
+            self._finish_crossfade()
+    
+    def _finish_crossfade(self):
+        """Završi pretapanje odmah: nova stanica na punoj jačini, stara u pool"""
+        previous, self._fade_from = self._fade_from, None
+        if previous is None:
+            return
+        self._fade_timer.stop()
+        self._fade_wait_timer.stop()
+        self._fade_started = None
+        if self._active is not None:
+            self._apply_volume(self._active)
+        self.player_pool.park(previous)
+    
+    # === SNIMANJE ===
+    
+    def is_recording(self) -> bool:
+        return self._recording is not None
+    
+    def start_recording(self):
+        """Snimaj tekuću stanicu, nov fajl za svaku pesmu"""
+        entry = self._active
+        if entry is None or self._recording is not None:
+            return
+        probe = self.probes.get(entry.url)
+        station = self.current_station or entry.url
+        recorder = StreamRecorder(
+            self.config.get("record_dir") or default_record_dir(station),
+            station,
+            codec=probe.codec if probe is not None else None,
+            parser=self.title_parser,
+            stream_url=entry.url,
+            initial=self._current_record,
+        )
+        self._attach_recorder(entry, recorder)
+        self._notify_station_changed()
+    
+    def stop_recording(self):
+        """Završi snimanje (ne čeka: fajl se zatvara kad writer isprazni red)"""
+        if self._recording is None:
+            return
+        recorder, session_id, owned = self._recording
+        self._recording = None
+        if owned:
+            self.metadata_service.close_session(session_id)
+        else:
+            self.metadata_service.set_recorder(session_id, None)
+        self._closing_recorders.append(recorder)
+        recorder.stop(on_finished=self.recording_finished.emit)
+        self._notify_station_changed()
+    
+    def _on_recording_finished(self, recorder: StreamRecorder):
+        """Writer je zatvorio poslednji fajl (signal stiže u GUI thread)"""
+        if recorder in self._closing_recorders:
+            self._closing_recorders.remove(recorder)
+        stats = recorder.get_stats()
+        print(f"⏹️  Snimljeno {stats['bytes'] / 1024 / 1024:.1f} MB u {len(stats['files'])} fajl(ova)")
+        if stats["dropped_bytes"]:
+            print(f"⚠️  Odbačeno {stats['dropped_bytes']} bajtova (disk nije stizao)")
+    
+    def _attach_recorder(self, entry: WarmPlayer, recorder: StreamRecorder):
+        """Snimaj kroz sesiju plejera, ili otvori posebnu ako je Qt svira direktno"""
+        if entry.session_id is not None and self.metadata_service.set_recorder(entry.session_id, recorder):
+            self._recording = (recorder, entry.session_id, False)
+            return
+        source = self.resolver.lookup(entry.url) or entry.url
+        session_id, _ = self.metadata_service.open_session(
+            source, lambda session_id, record: None, recorder=recorder, station_url=entry.url
+        )
+        self._recording = (recorder, session_id, True)
+    
+    # === TELEMETRIJA ===
+    
+    def _mark_phase(self, phase: str):
+        """Zabeleži fazu tekućeg play() poziva"""
+        trace = self._trace
+        if trace is not None and trace.mark(phase) and trace.complete:
+            self._finish_trace()
+    
+    def _finish_trace(self):
+        """Pošalji (i nedovršen) trace u statistiku"""
+        trace, self._trace = self._trace, None
+        if trace is not None:
+            self.telemetry.record(trace)
+
     def set_volume(self, value: int):
         """Set volume (0-100)"""
+        self._finish_crossfade()
         value = max(0, min(100, value))
-        self.audio.setVolume(value / 100)
+        self._volume = value
+        if self._active is not None:
+            self._active.player.set_volume(value / 100)
         
         if not self._muted:
             self._volume_before_mute = value
@@ -441,19 +1217,20 @@ class AudioEngine(QObject):
 
     def change_volume(self, delta: int):
         """Change volume by delta"""
-        v = int(self.audio.volume() * 100)
-        self.set_volume(v + delta)
+        self._finish_crossfade()
+        self.set_volume(self._volume + delta)
 
     def toggle_mute(self) -> bool:
         """Toggle mute state"""
+        self._finish_crossfade()
         self._muted = not self._muted
         
         if self._muted:
             self._volume_before_mute = self.get_volume()
-            self.audio.setMuted(True)
         else:
-            self.audio.setMuted(False)
             self.set_volume(self._volume_before_mute)
+        if self._active is not None:
+            self._active.player.set_muted(self._muted)
         
         self.config.set("muted", self._muted)
         self._notify_icon_changed()
@@ -461,11 +1238,11 @@ class AudioEngine(QObject):
 
     def get_volume(self) -> int:
         """Get current volume (0-100)"""
-        return int(self.audio.volume() * 100)
+        return self._volume
     
     def is_playing(self) -> bool:
         """Check if audio is playing"""
-        return self.player.playbackState() == QMediaPlayer.PlaybackState.PlayingState
+        return self.player is not None and self.player.is_playing()
     
     def is_muted(self) -> bool:
         """Check if audio is muted"""
@@ -483,63 +1260,44 @@ class AudioEngine(QObject):
         """Get last played station"""
         return self.config.get("last_station")
 
-    def _parse_metadata(self, metadata: str):
-        """Parse StreamTitle metadata"""
-        if not metadata:
-            return None, None
-        
-        metadata = metadata.strip()
-        
-        if metadata.startswith("StreamTitle='") and metadata.endswith("';"):
-            metadata = metadata[13:-2]
-        
-        if " - " in metadata:
-            parts = metadata.split(" - ", 1)
-            return parts[0].strip(), parts[1].strip()
-        elif ": " in metadata:
-            parts = metadata.split(": ", 1)
-            return parts[0].strip(), parts[1].strip()
-        else:
-            return None, metadata
-
-    def _on_worker_metadata(self, artist: str, title: str):
+    def _on_worker_metadata(self, generation: int, record: NowPlaying):
         """Callback kada worker pronađe metadata"""
-        if artist != self.current_artist or title != self.current_song:
-            self.current_artist = artist if artist else None
-            self.current_song = title if title else None
-            self._notify_metadata_changed(artist, title)
+        if generation != self.metadata_worker.generation:
+            # Zakasneli metadata prethodne stanice
+            return
+        self.now_playing.submit(record)
 
-    def _on_qt_metadata_changed(self):
-        """Handle metadata changes from QMediaPlayer - samo za non-FLAC"""
-        if self.use_worker:
+    def _on_player_title(self, title: str):
+        """Naslov koji je backend sam pročitao iz streama - samo bez metadata servisa"""
+        if self.use_worker or not title:
             return
-        
-        try:
-            metadata = self.player.metaData()
-            if not metadata:
-                return
-            
-            title_value = None
-            
-            try:
-                title_value = metadata.stringValue(QMediaMetaData.Key.Title)
-            except:
-                return
-            
-            if title_value and isinstance(title_value, str) and len(title_value) > 0:
-                artist, title = self._parse_metadata(title_value)
-                if artist != self.current_artist or title != self.current_song:
-                    self.current_artist = artist
-                    self.current_song = title
-                    self._notify_metadata_changed(artist, title)
-        
-        except Exception:
-            pass
+        source = self.backend.name if self.backend is not None else "qt"
+        self.now_playing.submit(NowPlaying(title, self.current_url, source))
+
+    def _on_now_playing(self, record: NowPlaying):
+        """Izlaz pipeline-a: nova pesma za stanicu koja svira"""
+        if not self.current_station:
+            return
+        self._current_record = record
+        self._mark_phase("first_metadata")
+        if self._is_shifted():
+            # Ovo je naslov na live ivici - čuje se pesma iz ringa
+            return
+        self._show_record(record)
+    
+    def _show_record(self, record: NowPlaying):
+        """Pesma koja se čuje - header, tooltip i callback-ovi"""
+        artist, title = record.artist or None, record.title or None
+        if (artist, title) == (self.current_artist, self.current_song):
+            return
+        self.current_artist = artist
+        self.current_song = title
+        self._notify_metadata_changed(record.artist, record.title)
 
     def _check_metadata(self):
         """Manual check for metadata (fallback)"""
         if self.is_playing() and not self.use_worker:
-            self._on_qt_metadata_changed()
+            self._on_player_title(self.player.title())
 
     # === CALLBACK METODE ===
     
@@ -585,4 +1343,6 @@ class AudioEngine(QObject):
                 pass
     
     def _on_playback_changed(self, state):
+        if state == PlaybackState.Playing:
+            self._mark_phase("playing")
         self._notify_icon_changed()
\ No newline at end of file
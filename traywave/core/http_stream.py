@@ -0,0 +1,267 @@
+"""
+Minimal asyncio HTTP/ICY client for radio streams
+"""
+import asyncio
+import socket
+import ssl
+from typing import Dict, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = "TrayWave/1.0"
+MAX_REDIRECTS = 5
+MAX_HEADER_BYTES = 64 * 1024
+MAX_PENDING_BYTES = 256 * 1024  # posle ovoga se pauzira čitanje sa socketa
+MAX_LOW_WATERMARK = 64 * 1024
+
+
+class StreamError(Exception):
+    """HTTP greška pri otvaranju streama"""
+
+
+class _StreamProtocol(asyncio.BufferedProtocol):
+    """BufferedProtocol koji upisuje telo odgovora direktno u bafer čitaoca
+
+    Dok čitalac čeka u readinto(), transport radi recv_into u njegov bafer
+    (bez međukopije). Bajtovi koji stignu dok niko ne čeka idu u _pending.
+    """
+
+    def __init__(self):
+        self.transport: Optional[asyncio.Transport] = None
+        self._head = bytearray()
+        self._head_done: Optional[asyncio.Future] = None
+        self._pending = bytearray()
+        self._scratch = bytearray(16384)
+        self._target: Optional[memoryview] = None
+        self._filled = 0
+        self._into_target = False
+        self._exact = False
+        self._waiter: Optional[asyncio.Future] = None
+        self._eof = False
+        self._error: Optional[BaseException] = None
+        self._paused = False
+        self.reads = 0
+
+    # === asyncio.BufferedProtocol ===
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self._head_done = asyncio.get_event_loop().create_future()
+
+    def get_buffer(self, sizehint: int):
+        if self._target is not None and self._filled < len(self._target):
+            self._into_target = True
+            return self._target[self._filled:]
+        self._into_target = False
+        return self._scratch
+
+    def buffer_updated(self, nbytes: int):
+        self.reads += 1
+        if self._into_target:
+            self._filled += nbytes
+            if not self._exact or self._filled == len(self._target):
+                self._wake()
+            return
+
+        data = memoryview(self._scratch)[:nbytes]
+        if not self._head_done.done():
+            self._head += data
+            index = self._head.find(b"\r\n\r\n")
+            if index >= 0:
+                self._pending += self._head[index + 4:]
+                del self._head[index + 4:]
+                self._head_done.set_result(None)
+            elif len(self._head) > MAX_HEADER_BYTES:
+                self._head_done.set_exception(StreamError("response headers too large"))
+            return
+
+        self._pending += data
+        if len(self._pending) > MAX_PENDING_BYTES and not self._paused:
+            self._paused = True
+            self.transport.pause_reading()
+
+    def eof_received(self):
+        self._eof = True
+        self._finish()
+        return False
+
+    def connection_lost(self, exc):
+        self._eof = True
+        self._error = exc
+        self._finish()
+
+    def _finish(self):
+        if self._head_done is not None and not self._head_done.done():
+            self._head_done.set_exception(StreamError("connection closed before headers"))
+        self._wake()
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    # === API za StreamResponse ===
+
+    async def read_head(self) -> bytes:
+        await self._head_done
+        return bytes(self._head)
+
+    async def readinto(self, view: memoryview, exact: bool = False) -> int:
+        filled = 0
+        if self._pending:
+            filled = min(len(view), len(self._pending))
+            view[:filled] = self._pending[:filled]
+            del self._pending[:filled]
+            if self._paused and len(self._pending) < MAX_PENDING_BYTES // 2:
+                self._paused = False
+                self.transport.resume_reading()
+            if not exact or filled == len(view):
+                return filled
+        if self._eof:
+            if self._error is not None and not filled:
+                raise ConnectionError(str(self._error))
+            return filled
+
+        self._target = view
+        self._filled = filled
+        self._exact = exact
+        self._waiter = asyncio.get_event_loop().create_future()
+        try:
+            await self._waiter
+        finally:
+            self._target = None
+            self._waiter = None
+        if not self._filled and self._error is not None:
+            raise ConnectionError(str(self._error))
+        return self._filled
+
+
+class StreamResponse:
+    """Otvoren stream: status, headeri (lowercase) i čitanje tela"""
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str],
+                 transport: asyncio.Transport, protocol: _StreamProtocol):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.transport = transport
+        self._protocol = protocol
+        self._low_watermark = 1
+
+    @property
+    def reads(self) -> int:
+        """Broj recv poziva (buđenja) na ovom socketu"""
+        return self._protocol.reads
+
+    async def readinto(self, view: memoryview, exact: bool = False) -> int:
+        """Upiši do len(view) bajtova tela u view, vrati broj (0 = kraj)
+
+        Sa exact=True vraća tek kad je view pun (ili na kraju streama).
+        """
+        return await self._protocol.readinto(view, exact)
+
+    async def read(self, n: int) -> bytes:
+        """Pročitaj do n bajtova tela"""
+        buffer = bytearray(n)
+        count = await self._protocol.readinto(memoryview(buffer))
+        del buffer[count:]
+        return bytes(buffer)
+
+    def set_low_watermark(self, nbytes: int):
+        """Ne budi petlju dok u socketu nema bar nbytes bajtova (SO_RCVLOWAT)
+
+        Samo nagoveštaj kernelu - gde nije podržan, tiho se ignoriše.
+        """
+        nbytes = max(1, min(nbytes, MAX_LOW_WATERMARK))
+        if nbytes == self._low_watermark:
+            return
+        self._low_watermark = nbytes
+        sock = self.transport.get_extra_info("socket")
+        if sock is None or not hasattr(socket, "SO_RCVLOWAT"):
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVLOWAT, nbytes)
+        except OSError:
+            pass
+
+    def close(self, abort: bool = False):
+        """Zatvori konekciju"""
+        if abort:
+            self.transport.abort()
+        else:
+            self.transport.close()
+
+
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def _get_ssl_context() -> ssl.SSLContext:
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+def _parse_head(head: bytes) -> Tuple[int, Dict[str, str]]:
+    """Parsiraj status liniju i headere (podržava i 'ICY 200 OK')"""
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(None, 2)
+    if len(parts) < 2 or not parts[1].isdigit():
+        raise StreamError(f"bad status line: {lines[0]!r}")
+
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+    return int(parts[1]), headers
+
+
+async def open_stream(url: str, headers: Optional[Dict[str, str]] = None,
+                      timeout: float = 10.0) -> StreamResponse:
+    """Otvori GET stream na url, prati redirekcije, vrati StreamResponse"""
+    loop = asyncio.get_event_loop()
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise StreamError(f"unsupported scheme: {parts.scheme}")
+
+        secure = parts.scheme == "https"
+        host = parts.hostname or ""
+        port = parts.port or (443 if secure else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        transport, protocol = await asyncio.wait_for(
+            loop.create_connection(
+                _StreamProtocol, host, port,
+                ssl=_get_ssl_context() if secure else None
+            ),
+            timeout
+        )
+
+        host_header = host if parts.port is None else f"{host}:{parts.port}"
+        request = [f"GET {path} HTTP/1.0", f"Host: {host_header}",
+                   f"User-Agent: {USER_AGENT}", "Accept: */*", "Connection: close"]
+        for key, value in (headers or {}).items():
+            request.append(f"{key}: {value}")
+        transport.write(("\r\n".join(request) + "\r\n\r\n").encode("latin-1"))
+
+        try:
+            head = await asyncio.wait_for(protocol.read_head(), timeout)
+            status, response_headers = _parse_head(head)
+        except BaseException:
+            transport.abort()
+            raise
+
+        if status in (301, 302, 303, 307, 308) and "location" in response_headers:
+            transport.abort()
+            url = urljoin(url, response_headers["location"])
+            continue
+
+        if status != 200:
+            transport.abort()
+            raise StreamError(f"HTTP {status}")
+
+        return StreamResponse(url, status, response_headers, transport, protocol)
+
+    raise StreamError("too many redirects")
@@ -0,0 +1,125 @@
+"""
+ICY (Shoutcast/Icecast) stream demuxer
+"""
+import re
+from enum import Enum
+from typing import Callable, List, Optional, Tuple
+
+_STREAM_TITLE_RE = re.compile(r"StreamTitle='([^']*)'")
+
+
+def parse_stream_title(meta_string: str) -> Optional[str]:
+    """Izvuci StreamTitle iz ICY metadata stringa"""
+    match = _STREAM_TITLE_RE.search(meta_string)
+    if match:
+        return match.group(1).strip() or None
+    return None
+
+
+def split_title(title: str) -> Tuple[str, str]:
+    """Podeli naslov na (artist, song) po ' - ' ili ': '"""
+    for separator in (' - ', ': '):
+        if separator in title:
+            artist, song = title.split(separator, 1)
+            return artist.strip(), song.strip()
+    return "", title
+
+
+class IcyState(Enum):
+    """Stanja ICY parsera"""
+    AUDIO = 0   # audio bajtovi do sledeće metadata granice
+    LENGTH = 1  # jedan bajt: dužina metadata bloka / 16
+    META = 2    # bajtovi metadata bloka
+
+
+class IcyDemuxer:
+    """Inkrementalni ICY demuxer bez kopiranja audio bajtova
+
+    Eksplicitna mašina stanja (AUDIO -> LENGTH -> META -> AUDIO) koja
+    nosi delimično stanje između chunk-ova, tako da granica chunk-a može
+    pasti bilo gde (usred audio dela, posle length bajta, usred metadata
+    bloka) bez gubitka sinhronizacije.
+
+    Audio podaci se nikad ne kopiraju - preskaču se pomeranjem kursora kroz
+    ulazni memoryview (opciono se prosleđuju kao memoryview isečci). U
+    bytearray ulaze samo bajtovi metadata bloka. on_metadata dobija blok
+    čim je kompletan, između audio isečaka pre i posle njega - po tome
+    snimač i relay seku pesme tačno na granici.
+    """
+
+    def __init__(self, metaint: int, on_audio: Optional[Callable[[memoryview], None]] = None,
+                 on_metadata: Optional[Callable[[bytes], None]] = None):
+        if metaint <= 0:
+            raise ValueError("metaint must be positive")
+        self.metaint = metaint
+        self.on_audio = on_audio
+        self.on_metadata = on_metadata
+        self.reset()
+
+    def reset(self):
+        """Vrati parser na početak toka (novi response)"""
+        self.state = IcyState.AUDIO
+        self._remaining = self.metaint  # bajtova do kraja trenutnog stanja
+        self._meta = bytearray()
+
+    @property
+    def remaining(self) -> int:
+        """Broj bajtova koji još pripadaju trenutnom stanju"""
+        return 1 if self.state is IcyState.LENGTH else self._remaining
+
+    def next_read_size(self) -> int:
+        """Koliko bajtova pročitati da se stigne tačno iza sledećeg length bajta
+
+        U ustaljenom režimu to je jedan read po metadata intervalu:
+        ostatak metadata bloka + metaint audio bajtova + length bajt.
+        """
+        if self.state is IcyState.AUDIO:
+            return self._remaining + 1
+        if self.state is IcyState.LENGTH:
+            return 1
+        return self._remaining + self.metaint + 1
+
+    def feed(self, data) -> List[bytes]:
+        """Obradi sledeći chunk, vrati listu kompletnih metadata blokova"""
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        end = len(view)
+        cursor = 0
+        blocks = []
+
+        while cursor < end:
+            state = self.state
+
+            if state is IcyState.AUDIO:
+                n = min(self._remaining, end - cursor)
+                if self.on_audio is not None:
+                    self.on_audio(view[cursor:cursor + n])
+                self._remaining -= n
+                cursor += n
+                if not self._remaining:
+                    self.state = IcyState.LENGTH
+
+            elif state is IcyState.LENGTH:
+                length = view[cursor] * 16
+                cursor += 1
+                if length:
+                    self.state = IcyState.META
+                    self._remaining = length
+                else:
+                    self.state = IcyState.AUDIO
+                    self._remaining = self.metaint
+
+            else:
+                n = min(self._remaining, end - cursor)
+                self._meta += view[cursor:cursor + n]
+                self._remaining -= n
+                cursor += n
+                if not self._remaining:
+                    block = bytes(self._meta)
+                    blocks.append(block)
+                    self._meta.clear()
+                    if self.on_metadata is not None:
+                        self.on_metadata(block)
+                    self.state = IcyState.AUDIO
+                    self._remaining = self.metaint
+
+        return blocks
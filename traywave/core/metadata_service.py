@@ -0,0 +1,329 @@
+"""
+Asyncio metadata service - svi ICY streamovi na jednom background thread-u
+"""
+import asyncio
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from traywave.core.charset import CharsetRegistry
+from traywave.core.http_stream import StreamResponse, open_stream
+from traywave.core.icy import IcyDemuxer
+from traywave.core.now_playing import NowPlaying
+from traywave.core.ogg import OggPageParser, comments_to_title
+from traywave.core.probe import ProbeCache
+from traywave.core.recorder import StreamRecorder
+from traywave.core.relay import AudioRelay
+from traywave.core.timeshift import TimeshiftRelay
+
+READ_SIZE = 16384
+MAX_READ_SIZE = 256 * 1024
+MAX_META_BYTES = 255 * 16
+READ_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 10.0
+
+
+def is_ogg_stream(url: str, content_type: str) -> bool:
+    """Da li stream nosi Ogg kontejner (Vorbis/Opus/FLAC)"""
+    content_type = content_type.lower()
+    return "ogg" in content_type or "opus" in content_type or url.lower().split("?")[0].endswith((".ogg", ".oga", ".opus"))
+
+
+class MetadataSession:
+    """Jedna stream konekcija koja čita metadata (i opciono relay-uje audio)
+
+    on_metadata(session_id, NowPlaying) se poziva za svaki metadata blok,
+    bilo ICY StreamTitle (neparsiran, raw) ili Ogg Vorbis komentar.
+    url je adresa na koju se konektuje (posle playliste može biti drugi
+    čvor load balancer-a), station_url je stanica - po njoj se vode
+    charset odluka i pravila naslova.
+    """
+
+    def __init__(self, session_id: int, url: str,
+                 on_metadata: Callable[[int, NowPlaying], None],
+                 relay: Optional[AudioRelay] = None, station_url: Optional[str] = None):
+        self.session_id = session_id
+        self.url = url
+        self.station_url = station_url or url
+        self.on_metadata = on_metadata
+        self.relay = relay
+        self.recorder: Optional[StreamRecorder] = None  # menja se samo iz petlje servisa
+        self.task: Optional[asyncio.Task] = None
+        self.response: Optional[StreamResponse] = None
+        self.headers: Dict[str, str] = {}
+        self.metaint = 0
+
+        # Instrumentacija (menja se samo iz petlje servisa)
+        self.started_at = time.monotonic()
+        self.bytes_read = 0
+        self.cpu_time = 0.0
+
+    @property
+    def reads(self) -> int:
+        """Broj recv buđenja na upstream socketu"""
+        return self.response.reads if self.response is not None else 0
+
+    def get_stats(self) -> dict:
+        """Čitanja u sekundi i CPU vreme po satu streama"""
+        uptime = max(0.001, time.monotonic() - self.started_at)
+        return {
+            "url": self.url,
+            "metaint": self.metaint,
+            "uptime": uptime,
+            "bytes": self.bytes_read,
+            "reads": self.reads,
+            "reads_per_sec": self.reads / uptime,
+            "cpu_seconds": self.cpu_time,
+            "cpu_seconds_per_hour": self.cpu_time / uptime * 3600,
+        }
+
+
+class MetadataService:
+    """Jedna asyncio petlja u jednom thread-u za N istovremenih streamova
+
+    Javne metode su thread-safe i nikad ne blokiraju pozivaoca: samo
+    zakazuju posao u petlji. Callback-ovi se pozivaju iz thread-a servisa,
+    pa ih UI strana mora prebaciti u Qt thread (npr. preko signala).
+    Sa probes, headeri odgovora sesije postaju probe stanice koja ga nema.
+    """
+
+    def __init__(self, charsets: Optional[CharsetRegistry] = None,
+                 probes: Optional[ProbeCache] = None):
+        self.charsets = charsets or CharsetRegistry()
+        self.probes = probes
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._sessions: Dict[int, MetadataSession] = {}
+
+    # === THREAD ===
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Pokreni petlju pri prvoj upotrebi"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run_loop, args=(loop, ready),
+                    name="traywave-metadata", daemon=True
+                )
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def shutdown(self):
+        """Otkaži sve sesije i zaustavi petlju"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        for session_id in list(self._sessions):
+            self.close_session(session_id, loop)
+        loop.call_soon_threadsafe(loop.stop)
+
+    def call_soon(self, callback: Callable, *args):
+        """Zakaži callback u petlji servisa (thread-safe)"""
+        self._ensure_loop().call_soon_threadsafe(callback, *args)
+
+    # === SESIJE ===
+
+    def open_session(self, url: str, on_metadata: Callable[[int, NowPlaying], None],
+                     relay: bool = False, timeshift_bytes: int = 0,
+                     recorder: Optional[StreamRecorder] = None,
+                     station_url: Optional[str] = None) -> Tuple[int, Optional[str]]:
+        """Otvori sesiju, vrati (session_id, loopback URL ili None)
+
+        timeshift_bytes > 0 - relay pamti toliko bajtova streama za pauzu/premotavanje.
+        recorder - sesija samo za snimanje (stanica koju Qt svira direktno).
+        station_url - URL stanice kad je url razrešen (playlista, redirekcija).
+        """
+        loop = self._ensure_loop()
+        if timeshift_bytes > 0:
+            audio_relay = TimeshiftRelay(timeshift_bytes)
+        else:
+            audio_relay = AudioRelay() if relay else None
+        session = MetadataSession(next(self._ids), url, on_metadata, audio_relay, station_url)
+        session.recorder = recorder
+        self._sessions[session.session_id] = session
+        loop.call_soon_threadsafe(self._start_session, session)
+        return session.session_id, session.relay.url if session.relay else None
+
+    def close_session(self, session_id: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Zatvori sesiju (neblokirajuće)"""
+        session = self._sessions.pop(session_id, None)
+        loop = loop or self._loop
+        if session is None or loop is None:
+            return
+        loop.call_soon_threadsafe(self._cancel_session, session)
+
+    def set_recorder(self, session_id: int, recorder: Optional[StreamRecorder]) -> bool:
+        """Počni (ili prekini, recorder=None) snimanje postojeće sesije"""
+        session = self._sessions.get(session_id)
+        if session is None or self._loop is None:
+            return False
+        self._loop.call_soon_threadsafe(self._set_recorder, session, recorder)
+        return True
+
+    @staticmethod
+    def _set_recorder(session: MetadataSession, recorder: Optional[StreamRecorder]):
+        session.recorder = recorder
+        if recorder is not None and session.headers:
+            recorder.set_content_type(session.headers.get("content-type"))
+
+    def get_relay(self, session_id: int) -> Optional[AudioRelay]:
+        """Relay sesije (TimeshiftRelay ako je otvorena sa time-shift baferom)"""
+        session = self._sessions.get(session_id)
+        return session.relay if session else None
+
+    def session_count(self) -> int:
+        """Broj aktivnih sesija"""
+        return len(self._sessions)
+
+    def get_stats(self) -> List[dict]:
+        """Instrumentacija svih aktivnih sesija"""
+        return [session.get_stats() for session in list(self._sessions.values())]
+
+    def _start_session(self, session: MetadataSession):
+        session.task = asyncio.ensure_future(self._run_session(session))
+
+    @staticmethod
+    def _cancel_session(session: MetadataSession):
+        # Prekini sockete odmah (RST), ne čekaj da task dođe do await-a
+        if session.response is not None:
+            session.response.close(abort=True)
+        if session.relay:
+            session.relay.close()
+        if session.task is not None:
+            session.task.cancel()
+
+    async def _run_session(self, session: MetadataSession):
+        """Glavna petlja jedne sesije"""
+        response = None
+        relay = session.relay
+
+        def on_audio(data):
+            if relay:
+                relay.write(data)
+            if session.recorder is not None:
+                session.recorder.write(data)
+
+        try:
+            if relay:
+                await relay.serve()
+
+            response = await open_stream(session.url, {"Icy-MetaData": "1"}, CONNECT_TIMEOUT)
+            session.response = response
+            session.headers = response.headers
+
+            try:
+                session.metaint = int(response.headers.get("icy-metaint", 0))
+            except ValueError:
+                session.metaint = 0
+            if self.probes is not None and self.probes.get(session.station_url) is None:
+                # Probe iz ovog odgovora - bez posebne konekcije pre plejera
+                self.probes.record(session.station_url, response.headers)
+            if session.recorder is not None:
+                session.recorder.set_content_type(response.headers.get("content-type"))
+
+            if relay:
+                passthrough = {
+                    key: value for key, value in response.headers.items()
+                    if key in ("icy-name", "icy-br", "icy-sr", "icy-genre")
+                }
+                content_type = response.headers.get("content-type", "")
+                relay.set_headers(content_type, passthrough, ogg=is_ogg_stream(session.url, content_type))
+
+            ogg = None
+            decoder = self.charsets.decoder_for(session.station_url)
+
+            def on_metadata(meta_bytes: bytes):
+                # Zove se usred feed()-a: audio pre bloka je već prosleđen, posle njega još nije
+                meta_string = decoder.decode(meta_bytes.rstrip(b"\x00"))
+                if meta_string:
+                    record = NowPlaying(meta_string, session.station_url, "icy")
+                    if relay:
+                        relay.mark_track(meta_string)
+                    if session.recorder is not None:
+                        session.recorder.mark_track(record)
+                    self._emit(session, record)
+
+            if session.metaint:
+                print(f"📡 ICY metaint: {session.metaint}")
+                demuxer = IcyDemuxer(session.metaint, on_audio=on_audio, on_metadata=on_metadata)
+            else:
+                demuxer = None
+                if is_ogg_stream(session.url, response.headers.get("content-type", "")):
+                    # Ogg bez ICY: naslovi su u comment headerima ulančanih streamova
+                    print("📡 Ogg stream, čitam Vorbis komentare")
+                    ogg = OggPageParser()
+                elif not relay and session.recorder is None:
+                    print("⚠️  Stream ne podržava ICY metadata")
+                    return
+
+            # Prealociran bafer; za ICY se čita tačno do sledećeg length bajta
+            # (jedan read po metadata intervalu), a SO_RCVLOWAT drži petlju
+            # uspavanom dok ceo interval ne stigne u socket
+            size = session.metaint + MAX_META_BYTES + 1 if demuxer else READ_SIZE
+            view = memoryview(bytearray(min(size, MAX_READ_SIZE)))
+            while True:
+                if demuxer is not None:
+                    want = min(demuxer.next_read_size(), len(view))
+                    response.set_low_watermark(want)
+                    count = await asyncio.wait_for(
+                        response.readinto(view[:want], exact=True), READ_TIMEOUT
+                    )
+                else:
+                    count = await asyncio.wait_for(response.readinto(view), READ_TIMEOUT)
+                if not count:
+                    break
+
+                cpu_started = time.thread_time()
+                chunk = view[:count]
+                session.bytes_read += count
+
+                if demuxer is None:
+                    on_audio(chunk)
+                    if ogg is not None:
+                        for comments in ogg.feed(chunk):
+                            artist, title = comments_to_title(comments)
+                            if title:
+                                raw = f"{artist} - {title}" if artist else title
+                                record = NowPlaying(raw, session.station_url, "ogg", artist, title)
+                                if session.recorder is not None:
+                                    session.recorder.mark_track(record)
+                                self._emit(session, record)
+                else:
+                    demuxer.feed(chunk)
+
+                session.cpu_time += time.thread_time() - cpu_started
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"❌ Metadata sesija greška ({session.url}): {e}")
+        finally:
+            if response is not None:
+                stats = session.get_stats()
+                print(f"📊 {session.url}: {stats['reads_per_sec']:.1f} reads/s, "
+                      f"{stats['cpu_seconds_per_hour']:.2f} s CPU/h")
+                response.close(abort=True)
+            if relay:
+                relay.close()
+            self._sessions.pop(session.session_id, None)
+
+    @staticmethod
+    def _emit(session: MetadataSession, record: NowPlaying):
+        try:
+            session.on_metadata(session.session_id, record)
+        except Exception as e:
+            print(f"Metadata callback error: {e}")
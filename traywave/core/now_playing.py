@@ -0,0 +1,86 @@
+"""
+Now-playing record and the single title parser
+"""
+import re
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from traywave.core.icy import parse_stream_title, split_title
+
+SplitRule = Callable[[str], Tuple[str, str]]
+
+
+class NowPlaying:
+    """Jedan metadata događaj, bez obzira odakle je stigao"""
+
+    __slots__ = ("artist", "title", "stream_url", "raw", "timestamp", "source")
+
+    def __init__(self, raw: str, stream_url: Optional[str] = None, source: str = "icy",
+                 artist: Optional[str] = None, title: Optional[str] = None,
+                 timestamp: Optional[float] = None):
+        self.raw = raw
+        self.stream_url = stream_url
+        self.source = source  # "icy", "ogg" ili ime playback backend-a ("qt", "mpv", "null")
+        self.artist = artist
+        self.title = title
+        self.timestamp = timestamp if timestamp is not None else time.time()
+
+    def key(self) -> tuple:
+        """Ključ za dedup (isti stream, ista pesma)"""
+        return (self.stream_url, self.artist or "", self.title or "")
+
+    def __repr__(self):
+        return f"NowPlaying({self.artist!r}, {self.title!r}, source={self.source!r})"
+
+
+class TitleParser:
+    """Jedini parser naslova za ICY, Ogg i QMediaPlayer metadata
+
+    Podrazumevano pravilo deli po ' - ' pa po ': '. Stanica može imati
+    svoje pravilo (regex sa grupama 'artist' i 'title'), ključ je URL
+    streama; kompajlirana pravila se keširaju po stanici.
+    """
+
+    def __init__(self, rules: Optional[Dict[str, str]] = None):
+        self._rules: Dict[str, str] = dict(rules or {})
+        self._cache: Dict[Optional[str], SplitRule] = {}
+
+    def set_rules(self, rules: Dict[str, str]):
+        """Zameni pravila po stanici"""
+        self._rules = dict(rules or {})
+        self._cache.clear()
+
+    def _rule_for(self, stream_url: Optional[str]) -> SplitRule:
+        rule = self._cache.get(stream_url)
+        if rule is None:
+            pattern = self._rules.get(stream_url) if stream_url else None
+            rule = split_title
+            if pattern:
+                try:
+                    rule = self._compile(re.compile(pattern))
+                except re.error as e:
+                    print(f"⚠️  Neispravno pravilo za {stream_url}: {e}")
+            self._cache[stream_url] = rule
+        return rule
+
+    @staticmethod
+    def _compile(regex) -> SplitRule:
+        def rule(text: str) -> Tuple[str, str]:
+            match = regex.search(text)
+            if not match:
+                return split_title(text)
+            groups = match.groupdict()
+            return (groups.get("artist") or "").strip(), (groups.get("title") or text).strip()
+        return rule
+
+    def parse(self, record: NowPlaying) -> NowPlaying:
+        """Popuni artist/title iz raw stringa (ako izvor to već nije uradio)"""
+        if record.title is not None:
+            return record
+
+        text = record.raw.strip()
+        if "StreamTitle=" in text:
+            text = parse_stream_title(text) or ""
+        if text:
+            record.artist, record.title = self._rule_for(record.stream_url)(text)
+        return record
@@ -0,0 +1,260 @@
+"""
+Incremental Ogg page parser - Vorbis/Opus/FLAC comment metadata
+"""
+import struct
+from typing import Dict, List, Optional, Set, Tuple
+
+HEADER_SIZE = 27
+CAPTURE_PATTERN = b"OggS"
+MAX_PACKET_BYTES = 256 * 1024  # comment paket sa omotom ume da bude ogroman
+MAX_HEADER_BYTES = 4 * 1024 * 1024  # keep_headers: granica za pokvaren granule
+
+FLAG_CONTINUED = 0x01
+FLAG_BOS = 0x02
+FLAG_EOS = 0x04
+
+_HEADER = 0
+_SEGMENTS = 1
+_BODY = 2
+
+
+def parse_vorbis_comment(data, offset: int = 0) -> Dict[str, str]:
+    """Parsiraj Vorbis comment blok (vendor + KEY=value lista)
+
+    Ključevi se vraćaju velikim slovima, zadržava se prva vrednost.
+    Skraćen blok (MAX_PACKET_BYTES) se parsira dokle god ima podataka.
+    """
+    comments: Dict[str, str] = {}
+    try:
+        vendor_length, = struct.unpack_from("<I", data, offset)
+        offset += 4 + vendor_length
+        count, = struct.unpack_from("<I", data, offset)
+        offset += 4
+        for _ in range(count):
+            length, = struct.unpack_from("<I", data, offset)
+            offset += 4
+            if offset + length > len(data):
+                break
+            entry = bytes(data[offset:offset + length]).decode("utf-8", errors="replace")
+            offset += length
+            key, sep, value = entry.partition("=")
+            if sep:
+                comments.setdefault(key.upper(), value.strip())
+    except struct.error:
+        pass
+    return comments
+
+
+def comments_to_title(comments: Dict[str, str]) -> Tuple[str, Optional[str]]:
+    """Izvuci (artist, title) iz Vorbis komentara"""
+    return comments.get("ARTIST", ""), comments.get("TITLE") or None
+
+
+class _LogicalStream:
+    """Stanje jednog logičkog bitstream-a dok mu se čitaju header paketi"""
+
+    __slots__ = ("codec", "packets", "packet", "done")
+
+    def __init__(self):
+        self.codec = None
+        self.packets = 0
+        self.packet = bytearray()
+        self.done = False
+
+
+class OggPageParser:
+    """Inkrementalni Ogg parser koji traži comment headere novih bitstream-ova
+
+    Hvata samo stranice logičkih streamova koji su još u header fazi; audio
+    stranice se preskaču pomeranjem kursora bez kopiranja. Ulančani
+    streamovi (Icecast šalje novi BOS za svaku pesmu) daju nove komentare.
+
+    keep_headers=True dodatno čuva sirove header stranice tekuće karike lanca
+    (BOS, pa stranice sa granule 0 ili -1 do prvog audio-a) i njihove
+    pozicije u streamu - relay ih šalje plejeru koji se poveže kasnije.
+    """
+
+    def __init__(self, keep_headers: bool = False):
+        self._state = _HEADER
+        self._head = bytearray()
+        self._remaining = 0
+        self._lacing = b""
+        self._flags = 0
+        self._serial = 0
+        self._capture: Optional[bytearray] = None
+        self._streams: Dict[int, _LogicalStream] = {}
+        self.pages = 0
+        self.resyncs = 0
+
+        self.keep_headers = keep_headers
+        self.header_pages: List[bytes] = []
+        self.link_start = 0   # pozicija prve BOS stranice tekuće karike
+        self.headers_end = 0  # pozicija posle poslednje header stranice
+        self.offset = 0       # bajtova obrađeno do kraja poslednjeg feed()-a
+        self._header_serials: Set[int] = set()
+        self._header_bytes = 0
+        self._raw: Optional[bytearray] = None
+        self._page_start = 0
+        self._last_bos = False
+
+    def feed(self, data) -> List[Dict[str, str]]:
+        """Obradi chunk, vrati listu pronađenih comment blokova"""
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        end = len(view)
+        cursor = 0
+        found: List[Dict[str, str]] = []
+
+        while cursor < end:
+            if self._state == _BODY:
+                n = min(self._remaining, end - cursor)
+                if self._capture is not None:
+                    self._capture += view[cursor:cursor + n]
+                if self._raw is not None:
+                    self._raw += view[cursor:cursor + n]
+                self._remaining -= n
+                cursor += n
+                if not self._remaining:
+                    self._finish_page(found)
+                continue
+
+            need = (HEADER_SIZE if self._state == _HEADER else HEADER_SIZE + self._head[26]) - len(self._head)
+            n = min(need, end - cursor)
+            self._head += view[cursor:cursor + n]
+            cursor += n
+            if n < need:
+                continue
+
+            if self._state == _HEADER:
+                if self._head[:4] != CAPTURE_PATTERN:
+                    self._resync()
+                    continue
+                self._state = _SEGMENTS
+                if self._head[26]:
+                    continue
+            self._page_start = self.offset + cursor - len(self._head)
+            self._start_body()
+            if not self._remaining:
+                self._finish_page(found)
+
+        self.offset += end
+        return found
+
+    def _resync(self):
+        """Izgubljena sinhronizacija - traži sledeći 'OggS'"""
+        self.resyncs += 1
+        index = self._head.find(CAPTURE_PATTERN, 1)
+        if index < 0:
+            # Zadrži rep koji može biti početak 'OggS'
+            del self._head[:-3]
+        else:
+            del self._head[:index]
+
+    def _start_body(self):
+        head = self._head
+        self._flags = head[5]
+        self._serial, = struct.unpack_from("<I", head, 14)
+        self._lacing = bytes(head[HEADER_SIZE:])
+        self._remaining = sum(self._lacing)
+        self._state = _BODY
+
+        if self._flags & FLAG_BOS and self._serial not in self._streams:
+            self._streams[self._serial] = _LogicalStream()
+        stream = self._streams.get(self._serial)
+        self._capture = bytearray() if stream is not None and not stream.done else None
+        if self.keep_headers:
+            self._raw = self._header_page()
+
+    def _header_page(self) -> Optional[bytearray]:
+        """Početak sirove kopije ako je stranica header tekuće karike"""
+        bos = bool(self._flags & FLAG_BOS)
+        if bos:
+            if not self._last_bos:
+                # Nova karika lanca - headeri prethodne pesme više ne važe
+                self.header_pages = []
+                self._header_serials.clear()
+                self._header_bytes = 0
+                self.link_start = self._page_start
+            self._header_serials.add(self._serial)
+        self._last_bos = bos
+        if self._serial not in self._header_serials:
+            return None
+        granule, = struct.unpack_from("<q", self._head, 6)
+        if (not bos and granule not in (0, -1)) or self._header_bytes > MAX_HEADER_BYTES:
+            self._header_serials.discard(self._serial)  # prvi audio tog streama
+            return None
+        return bytearray(self._head)
+
+    def _finish_page(self, found: List[Dict[str, str]]):
+        self.pages += 1
+        stream = self._streams.get(self._serial)
+        if self._capture is not None and stream is not None:
+            self._split_packets(stream, found)
+
+        if self._raw is not None:
+            self.header_pages.append(bytes(self._raw))
+            self._header_bytes += len(self._raw)
+            self.headers_end = self._page_start + len(self._raw)
+            self._raw = None
+
+        if self._flags & FLAG_EOS:
+            self._streams.pop(self._serial, None)
+            self._header_serials.discard(self._serial)
+
+        self._capture = None
+        self._head.clear()
+        self._state = _HEADER
+
+    def _split_packets(self, stream: _LogicalStream, found: List[Dict[str, str]]):
+        """Podeli telo stranice na pakete po lacing vrednostima"""
+        body = self._capture
+        offset = 0
+        skip_partial = self._flags & FLAG_CONTINUED and not stream.packet
+
+        for lace in self._lacing:
+            if not skip_partial and len(stream.packet) < MAX_PACKET_BYTES:
+                stream.packet += body[offset:offset + lace]
+            offset += lace
+            if lace < 255:
+                if not skip_partial:
+                    self._on_packet(stream, found)
+                    stream.packet = bytearray()
+                    if stream.done:
+                        return
+                skip_partial = False
+
+    def _on_packet(self, stream: _LogicalStream, found: List[Dict[str, str]]):
+        packet = stream.packet
+        index = stream.packets
+        stream.packets += 1
+
+        if index == 0:
+            if packet[:7] == b"\x01vorbis":
+                stream.codec = "vorbis"
+            elif packet[:8] == b"OpusHead":
+                stream.codec = "opus"
+            elif packet[:5] == b"\x7fFLAC":
+                stream.codec = "flac"
+            else:
+                stream.done = True  # skeleton, theora... nema šta da se traži
+            return
+
+        comments = None
+        if stream.codec == "vorbis":
+            if packet[:7] == b"\x03vorbis":
+                comments = parse_vorbis_comment(packet, 7)
+            stream.done = True
+        elif stream.codec == "opus":
+            if packet[:8] == b"OpusTags":
+                comments = parse_vorbis_comment(packet, 8)
+            stream.done = True
+        elif stream.codec == "flac" and packet:
+            # FLAC metadata blok: 1 bajt (last flag + tip) + 3 bajta dužina
+            block_type = packet[0] & 0x7F
+            if block_type == 4:
+                comments = parse_vorbis_comment(packet, 4)
+                stream.done = True
+            elif packet[0] & 0x80:
+                stream.done = True
+
+        if comments:
+            found.append(comments)
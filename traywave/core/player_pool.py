@@ -0,0 +1,170 @@
+"""
+Warm player pool - utišani plejeri koji već baferuju skorašnje stanice
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QTimer
+
+from traywave.core.backends import BackendPlayer
+
+
+class WarmPlayer:
+    """Jedan (utišan) plejer backend-a sa opcionom relay sesijom"""
+
+    __slots__ = ("url", "bitrate", "player", "session_id", "timeshift",
+                 "started_at", "buffered_at", "last_used")
+
+    def __init__(self, url: str, bitrate: str, player: BackendPlayer,
+                 session_id: Optional[int] = None, timeshift=None):
+        self.url = url
+        self.bitrate = bitrate
+        self.player = player
+        self.session_id = session_id
+        self.timeshift = timeshift  # TimeshiftRelay sesije (pauza/premotavanje)
+        self.started_at = time.monotonic()
+        self.buffered_at: Optional[float] = None
+        self.last_used = self.started_at
+
+    @property
+    def is_buffered(self) -> bool:
+        """Da li je plejer već napunio bafer (spreman za trenutni start)"""
+        return self.buffered_at is not None
+
+    def estimated_mb(self, prebuffer_seconds: float, overhead_mb: float) -> float:
+        """Procena memorije: fiksni trošak dekodera + bafer po bitrate-u + time-shift ring
+
+        Ring se računa punom veličinom - stranice mmap-a ulaze u RSS kako
+        se ring puni, a posle capacity bajtova je pun.
+        """
+        try:
+            kbps = int("".join(ch for ch in self.bitrate if ch.isdigit()) or 128)
+        except ValueError:
+            kbps = 128
+        if "flac" in self.bitrate.lower():
+            kbps = max(kbps, 1000)
+        ring_mb = self.timeshift.ring.capacity / 1024 / 1024 if self.timeshift is not None else 0.0
+        return overhead_mb + kbps * prebuffer_seconds / 8 / 1024 + ring_mb
+
+
+class PlayerPool(QObject):
+    """LRU skup utišanih plejera koji baferuju stanice pre nego što zatrebaju
+
+    Čuva poslednju stanicu (kad se pređe na drugu) i stanicu pod kursorom u
+    podmeniju. Broj plejera i procenjena memorija su ograničeni; kad se
+    pređe limit izbacuje se najduže nekorišćen. Pravljenje i uništavanje
+    plejera radi AudioEngine (factory/disposer), pool samo vodi evidenciju.
+    """
+
+    HOVER_DWELL_MS = 350     # stanica mora da bude pod kursorom ovoliko
+    PREBUFFER_SECONDS = 10   # koliko audio bafera računamo po plejeru
+    PLAYER_OVERHEAD_MB = 8   # FFmpeg demuxer + dekoder + Qt baferi (procena)
+
+    def __init__(self, factory: Callable[[str, str], WarmPlayer],
+                 disposer: Callable[[WarmPlayer], None],
+                 size: int = 2, memory_mb: int = 48):
+        super().__init__()
+        self.factory = factory
+        self.disposer = disposer
+        self.size = max(0, size)
+        self.memory_mb = memory_mb
+        self._entries: "OrderedDict[str, WarmPlayer]" = OrderedDict()
+
+        self._hover_request = None
+        self._hover_timer = QTimer()
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(self.HOVER_DWELL_MS)
+        self._hover_timer.timeout.connect(self._on_hover_timeout)
+
+    # === POOL ===
+
+    def has(self, url: str) -> bool:
+        """Da li stanica ima zagrejan plejer"""
+        return url in self._entries
+
+    def take(self, url: str) -> Optional[WarmPlayer]:
+        """Izvadi plejer za stanicu (vlasništvo prelazi na pozivaoca)"""
+        return self._entries.pop(url, None)
+
+    def park(self, entry: WarmPlayer):
+        """Vrati plejer u pool (utišan, nastavlja da baferuje)"""
+        if self.size == 0:
+            self.disposer(entry)
+            return
+        old = self._entries.pop(entry.url, None)
+        if old is not None and old is not entry:
+            self.disposer(old)
+        entry.player.set_muted(True)
+        entry.last_used = time.monotonic()
+        self._entries[entry.url] = entry
+        self._trim()
+
+    def discard(self, entry: WarmPlayer):
+        """Izbaci plejer iz pool-a (npr. stream mu je pukao)"""
+        if self._entries.get(entry.url) is entry:
+            del self._entries[entry.url]
+            print(f"🧊 Izbacujem iz pool-a: {entry.url}")
+            self.disposer(entry)
+
+    def warm(self, url: str, bitrate: str = "128 kbps"):
+        """Počni da baferuješ stanicu ako već nije u pool-u"""
+        if self.size == 0:
+            return
+        entry = self._entries.get(url)
+        if entry is not None:
+            entry.last_used = time.monotonic()
+            self._entries.move_to_end(url)
+            return
+        print(f"🔥 Zagrevam: {url}")
+        self._entries[url] = self.factory(url, bitrate)
+        self._trim()
+
+    def request_warm(self, url: str, bitrate: str = "128 kbps"):
+        """Kursor je na stanici - zagrej je ako se tu zadrži"""
+        self._hover_request = (url, bitrate)
+        self._hover_timer.start()
+
+    def cancel_hover(self):
+        """Kursor je napustio podmeni"""
+        self._hover_request = None
+        self._hover_timer.stop()
+
+    def _on_hover_timeout(self):
+        if self._hover_request:
+            url, bitrate = self._hover_request
+            self._hover_request = None
+            self.warm(url, bitrate)
+
+    def resize(self, size: int, memory_mb: Optional[int] = None):
+        """Promeni limite (npr. iz podešavanja)"""
+        self.size = max(0, size)
+        if memory_mb is not None:
+            self.memory_mb = memory_mb
+        self._trim()
+
+    def clear(self):
+        """Ugasi sve plejere u pool-u"""
+        self.cancel_hover()
+        while self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self.disposer(entry)
+
+    def _estimated_mb(self) -> float:
+        return sum(entry.estimated_mb(self.PREBUFFER_SECONDS, self.PLAYER_OVERHEAD_MB)
+                   for entry in self._entries.values())
+
+    def _trim(self):
+        while self._entries and (len(self._entries) > self.size
+                                 or self._estimated_mb() > self.memory_mb):
+            url, entry = self._entries.popitem(last=False)
+            print(f"🧊 Izbacujem iz pool-a: {url}")
+            self.disposer(entry)
+
+    def get_stats(self) -> dict:
+        """Stanje pool-a"""
+        return {
+            "players": len(self._entries),
+            "urls": list(self._entries),
+            "estimated_mb": round(self._estimated_mb(), 1),
+        }
@@ -0,0 +1,189 @@
+"""
+Playlist resolver - .pls/.m3u/.m3u8/.xspf i redirect lanci do direktnog URL-a
+"""
+import asyncio
+import html
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from traywave.core.http_stream import StreamError, open_stream
+from traywave.core.probe import ProbeCache
+from traywave.core.settings import SettingsStore, shared_settings
+
+PLAYLIST_EXTENSIONS = (".pls", ".m3u", ".m3u8", ".xspf")
+PLAYLIST_TYPES = (
+    "audio/x-scpls", "audio/scpls", "audio/x-mpegurl", "audio/mpegurl",
+    "application/x-mpegurl", "application/vnd.apple.mpegurl", "application/xspf+xml",
+)
+MAX_PLAYLIST_BYTES = 64 * 1024
+MAX_DEPTH = 4            # playlista koja pokazuje na playlistu...
+RESOLVE_TIMEOUT = 8.0
+
+_PLS_ENTRY = re.compile(r"^\s*File(\d+)\s*=\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+_XSPF_LOCATION = re.compile(r"<location>\s*(.*?)\s*</location>", re.IGNORECASE | re.DOTALL)
+
+
+def is_playlist_url(url: str, content_type: str = "") -> bool:
+    """Da li URL (ili content-type) izgleda kao playlista"""
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type in PLAYLIST_TYPES:
+        return True
+    if content_type.startswith(("audio/", "video/", "application/ogg")):
+        return False  # server šalje sam stream iako se URL završava na .m3u
+    return urlsplit(url).path.lower().endswith(PLAYLIST_EXTENSIONS)
+
+
+def parse_playlist(body: bytes, base_url: str) -> Optional[List[str]]:
+    """Izvuci URL-ove streamova iz playliste
+
+    Vraća None za HLS (#EXT-X-...) - to nije lista stanica nego sam stream,
+    pa ga plejer treba da dobije takvog kakav je.
+    """
+    text = body.decode("utf-8", errors="replace").lstrip("\ufeff")
+    head = text.lstrip()[:256].lower()
+
+    if head.startswith("[playlist]") or _PLS_ENTRY.search(text):
+        entries = sorted(_PLS_ENTRY.findall(text), key=lambda entry: int(entry[0]))
+        urls = [url for _, url in entries]
+    elif "<playlist" in head or "xspf" in head:
+        urls = [html.unescape(url) for url in _XSPF_LOCATION.findall(text)]
+    else:
+        if "#EXT-X-" in text:
+            return None
+        urls = [line.strip() for line in text.splitlines()
+                if line.strip() and not line.lstrip().startswith("#")]
+
+    resolved = []
+    for url in urls:
+        url = urljoin(base_url, url)
+        if urlsplit(url).scheme in ("http", "https"):
+            resolved.append(url)
+    return resolved
+
+
+class PlaylistResolver:
+    """Razrešava URL stanice do direktnog stream URL-a i kešira rezultat
+
+    Keš (sekcija "resolved") pamti krajnji URL posle playlisti i redirekcija.
+    Neuspela razrešavanja se keširaju kraće (NEGATIVE_TTL) i tada plejer
+    dobija originalni URL. Headeri krajnjeg streama idu u ProbeCache.
+    Mrežni deo radi u petlji MetadataService-a; on_resolved(url) se
+    poziva iz tog thread-a kad razrešavanje završi.
+    """
+
+    TTL = 6 * 3600.0
+    NEGATIVE_TTL = 600.0
+
+    def __init__(self, service, on_resolved: Optional[Callable[[str], None]] = None,
+                 settings: Optional[SettingsStore] = None, probes: Optional[ProbeCache] = None):
+        self.service = service
+        self.on_resolved = on_resolved
+        self.probes = probes
+        self.settings = settings or shared_settings()
+        self._lock = threading.Lock()
+        self._cache: Dict[str, dict] = self._load()
+        self._in_flight: Set[str] = set()  # samo iz petlje servisa
+
+    def _load(self) -> Dict[str, dict]:
+        return dict(self.settings.get("resolved", {}))
+
+    def _save(self):
+        with self._lock:
+            data = dict(self._cache)
+        self.settings.put("resolved", data)
+
+    # === API (GUI thread) ===
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Direktan URL iz keša (None ako nije razrešen ili je zastareo)"""
+        with self._lock:
+            entry = self._cache.get(url)
+        if entry is None or not entry.get("target"):
+            return None
+        if time.time() - entry.get("resolved_at", 0) > self.TTL:
+            return None
+        return entry["target"]
+
+    def is_fresh(self, url: str) -> bool:
+        """Ima li svež rezultat (i negativan) - nema potrebe za mrežom"""
+        with self._lock:
+            entry = self._cache.get(url)
+        if entry is None:
+            return False
+        ttl = self.TTL if entry.get("target") else self.NEGATIVE_TTL
+        return time.time() - entry.get("resolved_at", 0) <= ttl
+
+    def resolve(self, url: str):
+        """Zakaži razrešavanje u pozadini (ne blokira)"""
+        self.service.call_soon(self._schedule, url)
+
+    def invalidate(self, url: str):
+        """Reprodukcija nije uspela - zaboravi razrešen URL"""
+        with self._lock:
+            removed = self._cache.pop(url, None)
+        if removed is not None:
+            print(f"🗑️  Zaboravljam razrešen URL za {url}")
+            self.service.call_soon(self._save)
+
+    # === PETLJA SERVISA ===
+
+    def _schedule(self, url: str):
+        asyncio.ensure_future(self.resolve_now(url))
+
+    async def resolve_now(self, url: str) -> Optional[str]:
+        """Razreši URL odmah (iz petlje servisa), vrati direktan URL ili None"""
+        if url in self._in_flight:
+            return None
+        self._in_flight.add(url)
+        started = time.monotonic()
+        try:
+            target, headers = await asyncio.wait_for(self.resolve_url(url), RESOLVE_TIMEOUT)
+            print(f"🔗 {url} -> {target} ({(time.monotonic() - started) * 1000:.0f} ms)")
+            if self.probes is not None:
+                self.probes.record(url, headers)
+        except Exception as e:
+            target = None
+            print(f"⚠️  Ne mogu da razrešim {url}: {e}")
+        finally:
+            self._in_flight.discard(url)
+
+        with self._lock:
+            self._cache[url] = {"target": target, "resolved_at": time.time()}
+        self._save()
+
+        if self.on_resolved:
+            try:
+                self.on_resolved(url)
+            except Exception as e:
+                print(f"Resolver callback error: {e}")
+        return target
+
+    @staticmethod
+    async def resolve_url(url: str) -> Tuple[str, Dict[str, str]]:
+        """Prati redirekcije i playliste do prvog pravog streama, vrati (URL, headeri)"""
+        current = url
+        for _ in range(MAX_DEPTH):
+            response = await open_stream(current, {"Icy-MetaData": "1"}, RESOLVE_TIMEOUT)
+            try:
+                if not is_playlist_url(response.url, response.headers.get("content-type", "")):
+                    # Stream - dovoljni su headeri, konekcija se odmah prekida
+                    return response.url, response.headers
+                body = bytearray()
+                while len(body) < MAX_PLAYLIST_BYTES:
+                    chunk = await response.read(MAX_PLAYLIST_BYTES - len(body))
+                    if not chunk:
+                        break
+                    body += chunk
+            finally:
+                response.close(abort=True)
+
+            entries = parse_playlist(bytes(body), response.url)
+            if entries is None:
+                return response.url, response.headers  # HLS
+            if not entries:
+                raise StreamError("empty playlist")
+            current = entries[0]
+        raise StreamError("playlists nested too deep")
@@ -0,0 +1,154 @@
+"""
+Stream probe - codec, bitrate i ICY podaci iz headera prvog odgovora
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from traywave.core.settings import SettingsStore, shared_settings
+
+PROBE_TTL = 7 * 24 * 3600.0
+
+# Content-Type -> codec
+_CODECS = (
+    ("flac", "flac"),
+    ("opus", "opus"),
+    ("ogg", "ogg"),
+    ("aac", "aac"),
+    ("mp4", "aac"),
+    ("mpeg", "mp3"),
+    ("mp3", "mp3"),
+)
+
+# Kontejneri iz kojih QMediaPlayer ne daje naslov - čita ih metadata servis
+SERVICE_CODECS = ("flac", "ogg", "opus")
+
+
+def codec_from_content_type(content_type: str) -> Optional[str]:
+    """audio/mpeg -> mp3, application/ogg -> ogg, ... (None ako je nepoznat)"""
+    content_type = content_type.split(";")[0].strip().lower()
+    if "mpegurl" in content_type:
+        return "hls"
+    for needle, codec in _CODECS:
+        if needle in content_type:
+            return codec
+    return None
+
+
+def _int_header(headers: Dict[str, str], key: str) -> Optional[int]:
+    # icy-br ume da bude "128" ili "128,128" (neki Shoutcast serveri)
+    value = headers.get(key, "").split(",")[0].strip()
+    return int(value) if value.isdigit() else None
+
+
+class StreamProbe:
+    """Šta znamo o streamu stanice posle prvog odgovora servera"""
+
+    __slots__ = ("content_type", "codec", "bitrate", "metaint", "name", "samplerate", "probed_at")
+
+    def __init__(self, content_type: str = "", bitrate: Optional[int] = None,
+                 metaint: int = 0, name: str = "", samplerate: Optional[int] = None,
+                 probed_at: Optional[float] = None):
+        self.content_type = content_type
+        self.codec = codec_from_content_type(content_type)
+        self.bitrate = bitrate
+        self.metaint = metaint
+        self.name = name
+        self.samplerate = samplerate
+        self.probed_at = probed_at if probed_at is not None else time.time()
+
+    @classmethod
+    def from_headers(cls, headers: Dict[str, str]) -> "StreamProbe":
+        """Napravi probe iz (lowercase) HTTP/ICY headera"""
+        samplerate = _int_header(headers, "icy-sr")
+        if samplerate is None:
+            # icy-audio-info: ice-samplerate=44100;ice-bitrate=128;ice-channels=2
+            info = dict(part.split("=", 1) for part in headers.get("icy-audio-info", "").split(";")
+                        if "=" in part)
+            samplerate = _int_header(info, "ice-samplerate")
+        return cls(
+            content_type=headers.get("content-type", ""),
+            bitrate=_int_header(headers, "icy-br"),
+            metaint=_int_header(headers, "icy-metaint") or 0,
+            name=headers.get("icy-name", ""),
+            samplerate=samplerate,
+        )
+
+    @property
+    def needs_metadata_service(self) -> bool:
+        """Naslove čita MetadataService (Ogg/FLAC) umesto QMediaPlayer-a"""
+        return self.codec in SERVICE_CODECS
+
+    @property
+    def bitrate_text(self) -> str:
+        """'128 kbps', 'FLAC' ili '' ako se ne zna"""
+        if self.bitrate:
+            return f"{self.bitrate} kbps"
+        return "FLAC" if self.codec == "flac" else ""
+
+    @property
+    def details(self) -> str:
+        """Kratak opis za header i tooltip: 'MP3 · 128 kbps · 44.1 kHz'"""
+        parts = []
+        if self.codec and self.codec != "hls":
+            parts.append(self.codec.upper())
+        if self.bitrate:
+            parts.append(f"{self.bitrate} kbps")
+        if self.samplerate:
+            parts.append(f"{self.samplerate / 1000:g} kHz")
+        return " · ".join(parts)
+
+    def to_dict(self) -> dict:
+        return {"content_type": self.content_type, "bitrate": self.bitrate,
+                "metaint": self.metaint, "name": self.name,
+                "samplerate": self.samplerate, "probed_at": self.probed_at}
+
+
+class ProbeCache:
+    """Probe rezultati po stanici (URL stanice -> StreamProbe), sekcija "probes"
+
+    Pune ga PlaylistResolver i sesije MetadataService-a (headeri odgovora
+    koji ionako stiže) iz petlje servisa, čita ga AudioEngine iz GUI
+    thread-a, zato lock. on_record(url) se zove iz thread-a koji je upisao.
+    """
+
+    def __init__(self, settings: Optional[SettingsStore] = None,
+                 on_record: Optional[Callable[[str], None]] = None):
+        self.settings = settings or shared_settings()
+        self.on_record = on_record
+        self._lock = threading.Lock()
+        self._probes: Dict[str, StreamProbe] = self._load()
+
+    def _load(self) -> Dict[str, StreamProbe]:
+        try:
+            data = self.settings.get("probes", {})
+            return {url: StreamProbe(**fields) for url, fields in data.items()}
+        except Exception as e:
+            print(f"⚠️  Ne mogu da učitam probe: {e}")
+        return {}
+
+    def _save(self):
+        with self._lock:
+            data = {url: probe.to_dict() for url, probe in self._probes.items()}
+        self.settings.put("probes", data)
+
+    def get(self, url: str) -> Optional[StreamProbe]:
+        """Probe za stanicu (None ako ga nema ili je prestar)"""
+        with self._lock:
+            probe = self._probes.get(url)
+        if probe is None or time.time() - probe.probed_at > PROBE_TTL:
+            return None
+        return probe
+
+    def record(self, url: str, headers: Dict[str, str]) -> StreamProbe:
+        """Zapamti headere odgovora za stanicu"""
+        probe = StreamProbe.from_headers(headers)
+        with self._lock:
+            self._probes[url] = probe
+        self._save()
+        if self.on_record:
+            try:
+                self.on_record(url)
+            except Exception as e:
+                print(f"Probe callback error: {e}")
+        return probe
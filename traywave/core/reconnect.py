@@ -0,0 +1,199 @@
+"""
+Reconnect supervisor - ponovno povezivanje streama posle prekida
+"""
+import random
+import time
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QTimer
+
+from traywave.core.backends import MediaStatus
+
+
+class ReconnectSupervisor(QObject):
+    """Prati aktivni plejer i ponovo pokreće stream kad pukne
+
+    Prekid je: StalledMedia duže od STALL_GRACE_MS, EndOfMedia (radio je
+    live, kraj znači da nas je server izbacio), InvalidMedia ili greška
+    plejera. Pokušaji idu sa eksponencijalnim backoff-om i jitter-om; dok
+    QNetworkInformation kaže da mreže nema pokušaji se ne troše, a čim se
+    mreža vrati kreće se odmah.
+    """
+
+    BASE_DELAY_MS = 1000
+    MAX_DELAY_MS = 60000
+    STALL_GRACE_MS = 8000   # Qt se često sam oporavi od kratkog zastoja
+    STABLE_MS = 30000       # posle ovoliko stabilnog rada backoff kreće iz početka
+
+    def __init__(self, reconnect: Callable[[], None]):
+        super().__init__()
+        self._reconnect = reconnect
+        self.active = False
+        self.attempt = 0
+        self.online = True
+        self._down_since: Optional[float] = None
+
+        # Brojači (za sesiju aplikacije)
+        self.outages = 0
+        self.reconnects = 0
+        self.recoveries = 0
+        self.downtime = 0.0
+
+        self._retry_timer = QTimer()
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self._on_retry)
+
+        self._stall_timer = QTimer()
+        self._stall_timer.setSingleShot(True)
+        self._stall_timer.setInterval(self.STALL_GRACE_MS)
+        self._stall_timer.timeout.connect(lambda: self._failed("stalled"))
+
+        self._stable_timer = QTimer()
+        self._stable_timer.setSingleShot(True)
+        self._stable_timer.setInterval(self.STABLE_MS)
+        self._stable_timer.timeout.connect(self._on_stable)
+
+        self._network = None
+        self._init_network()
+
+    def _init_network(self):
+        """Prati dostupnost mreže ako Qt ima backend za to"""
+        try:
+            from PyQt6.QtNetwork import QNetworkInformation
+        except ImportError:
+            return
+
+        try:
+            if hasattr(QNetworkInformation, "loadDefaultBackend"):
+                loaded = QNetworkInformation.loadDefaultBackend()
+            else:
+                loaded = QNetworkInformation.load(QNetworkInformation.Feature.Reachability)
+            network = QNetworkInformation.instance() if loaded else None
+        except Exception as e:
+            print(f"⚠️  QNetworkInformation nije dostupan: {e}")
+            return
+        if network is None:
+            return
+
+        self._network = network
+        self._offline_states = (QNetworkInformation.Reachability.Disconnected,
+                                QNetworkInformation.Reachability.Local)
+        self.online = network.reachability() not in self._offline_states
+        network.reachabilityChanged.connect(self._on_reachability_changed)
+
+    # === API ZA ENGINE ===
+
+    def watch(self):
+        """Nova stanica je pokrenuta - kreni iz početka"""
+        self._end_outage(recovered=False)
+        self._cancel_timers()
+        self.active = True
+        self.attempt = 0
+
+    def stop(self):
+        """Korisnik je zaustavio reprodukciju"""
+        self._end_outage(recovered=False)
+        self._cancel_timers()
+        self.active = False
+
+    def on_media_status(self, status):
+        """status_changed aktivnog plejera"""
+        if not self.active:
+            return
+        if status == MediaStatus.Buffered:
+            self._stall_timer.stop()
+            self._end_outage(recovered=True)
+            self._stable_timer.start()
+        elif status == MediaStatus.Stalled:
+            self._stable_timer.stop()
+            if not self._stall_timer.isActive() and not self._retry_timer.isActive():
+                self._stall_timer.start()
+        elif status == MediaStatus.EndOfMedia:
+            self._failed("end of stream")
+        elif status == MediaStatus.Invalid:
+            self._failed("invalid media")
+
+    def on_error(self, message: str):
+        """error aktivnog plejera"""
+        if self.active:
+            self._failed(message or "player error")
+
+    def get_stats(self) -> dict:
+        """Brojači prekida i ukupno vreme bez zvuka"""
+        downtime = self.downtime
+        if self._down_since is not None:
+            downtime += time.monotonic() - self._down_since
+        return {
+            "outages": self.outages,
+            "reconnects": self.reconnects,
+            "recoveries": self.recoveries,
+            "downtime": downtime,
+            "online": self.online,
+        }
+
+    # === INTERNO ===
+
+    def _failed(self, reason: str):
+        self._stall_timer.stop()
+        self._stable_timer.stop()
+        if self._down_since is None:
+            self._down_since = time.monotonic()
+            self.outages += 1
+            print(f"🔌 Stream prekinut: {reason}")
+        if self._retry_timer.isActive():
+            return
+        if not self.online:
+            print("📴 Nema mreže, čekam da se vrati")
+            return
+        delay = self._next_delay()
+        print(f"🔄 Novi pokušaj za {delay / 1000:.1f} s")
+        self._retry_timer.start(delay)
+
+    def _next_delay(self) -> int:
+        """Eksponencijalni backoff sa 'equal jitter' (pola fiksno, pola slučajno)"""
+        ceiling = min(self.MAX_DELAY_MS, self.BASE_DELAY_MS * 2 ** min(self.attempt, 16))
+        return int(ceiling / 2 + random.uniform(0, ceiling / 2))
+
+    def _on_retry(self):
+        if not self.active or not self.online:
+            return
+        self.attempt += 1
+        self.reconnects += 1
+        print(f"🔄 Ponovno povezivanje (pokušaj {self.attempt})")
+        self._reconnect()
+        # Ako novi plejer ne napuni bafer na vreme, ide sledeći pokušaj
+        self._stall_timer.start()
+
+    def _on_stable(self):
+        self.attempt = 0
+
+    def _on_reachability_changed(self, reachability):
+        online = reachability not in self._offline_states
+        if online == self.online:
+            return
+        self.online = online
+        if not online:
+            print("📴 Mreža nedostupna")
+            self._retry_timer.stop()
+            return
+        print("📶 Mreža je ponovo dostupna")
+        if self.active and self._down_since is not None:
+            # Ne čekaj backoff - mreža je upravo stigla
+            self.attempt = 0
+            self._retry_timer.stop()
+            self._on_retry()
+
+    def _end_outage(self, recovered: bool):
+        if self._down_since is None:
+            return
+        seconds = time.monotonic() - self._down_since
+        self.downtime += seconds
+        self._down_since = None
+        if recovered:
+            self.recoveries += 1
+            print(f"✅ Stream ponovo radi posle {seconds:.1f} s")
+
+    def _cancel_timers(self):
+        self._retry_timer.stop()
+        self._stall_timer.stop()
+        self._stable_timer.stop()
@@ -0,0 +1,247 @@
+"""
+Stream recorder - sirov stream na disk, nov fajl na svaku promenu pesme
+"""
+import os
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from traywave.core.now_playing import NowPlaying, TitleParser
+from traywave.core.probe import codec_from_content_type
+
+MAX_QUEUE_CHUNKS = 512        # ~ 8 MB kod 16 KB chunkova, pa se odbacuje
+WRITE_BUFFER_BYTES = 256 * 1024
+MAX_NAME_LENGTH = 120
+
+# Codec -> ekstenzija fajla
+EXTENSIONS = {"mp3": "mp3", "aac": "aac", "ogg": "ogg", "opus": "opus", "flac": "flac"}
+# Dok codec nije poznat (nema probe ni Content-Type) - ne pogađa se mp3
+UNKNOWN_EXTENSION = "bin"
+# Ovi ne mogu da počnu od sredine streama (header je samo na početku), pa se
+# ne seku na fajlove nego se pesme upisuju u .cue pored jednog snimka
+UNSPLITTABLE = ("flac", "ogg", "opus")
+
+_UNSAFE = re.compile(r'[\x00-\x1f<>:"/\\|?*]+')
+
+
+def safe_filename(text: str) -> str:
+    """Naziv fajla bez znakova koje fajl sistemi ne dozvoljavaju"""
+    name = _UNSAFE.sub("_", text).strip(" .")
+    return name[:MAX_NAME_LENGTH].rstrip(" .") or "stream"
+
+
+class StreamRecorder:
+    """Piše audio sesije na disk preko ograničenog reda i writer thread-a
+
+    write()/mark_track() se zovu iz petlje MetadataService-a i nikad ne
+    blokiraju: chunk ide u red, a kad je red pun (disk ne stiže) chunk se
+    odbacuje i broji. Podela na pesme ide kroz isti red pa je granica tačno
+    između bajtova pre i posle StreamTitle promene. Ni stop() ne čeka
+    writer - kraj se javlja preko on_finished.
+
+    Bez codec-a (stanica još nije probe-ovana) codec se uzima iz
+    Content-Type-a sesije preko set_content_type(), pre prvog audio chunk-a.
+    """
+
+    def __init__(self, directory: str, station: str, codec: Optional[str] = None,
+                 parser: Optional[TitleParser] = None, stream_url: Optional[str] = None,
+                 initial: Optional[NowPlaying] = None):
+        self.directory = directory
+        self.station = station
+        self._set_codec(codec)
+        self.parser = parser or TitleParser()
+        self.stream_url = stream_url
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=MAX_QUEUE_CHUNKS)
+        self._last_raw = initial.raw if initial is not None else None
+        self._stem = self._file_stem(initial)
+        self._stopped = False
+        self._stop_requested = threading.Event()
+        self._lock = threading.Lock()
+        self._finished = False
+        self._on_finished: Optional[Callable[["StreamRecorder"], None]] = None
+
+        # Brojači (dropped menja petlja servisa, ostalo writer thread)
+        self.bytes_written = 0
+        self.dropped_bytes = 0
+        self.files = []
+        self.started_at = time.monotonic()
+
+        self._file = None
+        self._cue = None
+        self._thread = threading.Thread(target=self._run, name="StreamRecorder", daemon=True)
+        self._put(("track", self._stem))
+        self._thread.start()
+
+    # === PETLJA SERVISA ===
+
+    def write(self, data):
+        """Audio chunk (kopira se - sesija ponovo koristi svoj bafer)"""
+        if not self._stopped:
+            self._put(("data", bytes(data)))
+
+    def mark_track(self, record: NowPlaying):
+        """Nov metadata blok - nov fajl ako se naslov promenio"""
+        if self._stopped or record.raw == self._last_raw:
+            return
+        self._last_raw = record.raw
+        stem = self._file_stem(record)
+        if stem != self._stem:
+            self._stem = stem
+            self._put(("track", stem))
+
+    def set_content_type(self, content_type: Optional[str]):
+        """Headeri sesije su stigli - codec iz Content-Type-a, ako ga nije dao probe"""
+        if self.codec is None and content_type:
+            # Kroz red: writer ga vidi pre bajtova koji stižu posle headera
+            self._put(("codec", codec_from_content_type(content_type)))
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if item[0] == "data":
+                if not self.dropped_bytes:
+                    print("⚠️  Snimanje kasni za streamom, odbacujem audio")
+                self.dropped_bytes += len(item[1])
+
+    # === API ===
+
+    def stop(self, on_finished: Optional[Callable[["StreamRecorder"], None]] = None):
+        """Završi snimanje bez čekanja: writer upiše ostatak reda i zatvori fajl
+
+        on_finished(recorder) se zove iz writer thread-a kad je fajl zatvoren
+        (ili odmah, ako je writer već stao).
+        """
+        if self._stop_requested.is_set():
+            return
+        self._stopped = True
+        with self._lock:
+            self._on_finished = on_finished
+            self._stop_requested.set()
+            finished = self._finished
+        if finished:
+            self._report(on_finished)
+            return
+        try:
+            self._queue.put_nowait(("stop", None))
+        except queue.Full:
+            pass  # writer prazni pun red i posle poslednjeg chunk-a vidi zahtev
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sačekaj writer (samo na izlasku iz programa), vrati da li je završio"""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def get_stats(self) -> dict:
+        return {
+            "files": list(self.files),
+            "bytes": self.bytes_written,
+            "dropped_bytes": self.dropped_bytes,
+            "queued": self._queue.qsize(),
+            "seconds": time.monotonic() - self.started_at,
+        }
+
+    def _file_stem(self, record: Optional[NowPlaying]) -> str:
+        if record is not None:
+            # Kopija - isti zapis ide i u NowPlaying pipeline
+            record = self.parser.parse(NowPlaying(record.raw, self.stream_url, record.source))
+            if record.title:
+                name = f"{record.artist} - {record.title}" if record.artist else record.title
+                return safe_filename(name)
+        return safe_filename(f"{self.station} {time.strftime('%Y-%m-%d %H-%M-%S')}")
+
+    # === WRITER THREAD ===
+
+    def _set_codec(self, codec: Optional[str]):
+        self.codec = codec
+        self.extension = EXTENSIONS.get(codec, UNKNOWN_EXTENSION)
+        self.splittable = codec not in UNSPLITTABLE
+
+    def _unique_path(self, stem: str, extension: str) -> str:
+        path = os.path.join(self.directory, f"{stem}.{extension}")
+        number = 2
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"{stem} ({number}).{extension}")
+            number += 1
+        return path
+
+    def _open(self, stem: str):
+        self._close_file()
+        path = self._unique_path(stem, self.extension)
+        self._file = open(path, "wb", buffering=WRITE_BUFFER_BYTES)
+        self.files.append(path)
+        print(f"⏺️  Snimam: {path}")
+        if not self.splittable:
+            self._cue = open(self._unique_path(stem, "cue"), "w", encoding="utf-8")
+            self._cue.write(f'PERFORMER "{self.station}"\nFILE "{os.path.basename(path)}" WAVE\n')
+            self._cue_tracks = 0
+
+    def _add_cue_track(self, stem: str):
+        # Live stream: vreme od početka snimka je i pozicija u fajlu
+        seconds = time.monotonic() - self.started_at
+        minutes, rest = divmod(seconds, 60)
+        self._cue_tracks += 1
+        self._cue.write(f'  TRACK {self._cue_tracks:02d} AUDIO\n    TITLE "{stem}"\n'
+                        f'    INDEX 01 {int(minutes):02d}:{int(rest):02d}:{int(rest % 1 * 75):02d}\n')
+        self._cue.flush()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._cue is not None:
+            self._cue.close()
+            self._cue = None
+
+    def _run(self):
+        pending = None  # fajl se otvara tek sa prvim bajtovima (bez praznih fajlova)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            while True:
+                if self._stop_requested.is_set() and self._queue.empty():
+                    break  # stop() nije stao u pun red - ovo je bio poslednji chunk
+                kind, payload = self._queue.get()
+                if kind == "stop":
+                    break
+                if kind == "codec":
+                    self._set_codec(payload)
+                    continue
+                if kind == "track":
+                    if self._file is None or self.splittable:
+                        pending = payload
+                    else:
+                        self._add_cue_track(payload)
+                    continue
+                if pending is not None:
+                    self._open(pending)
+                    if self._cue is not None:
+                        self._add_cue_track(pending)
+                    pending = None
+                self._file.write(payload)
+                self.bytes_written += len(payload)
+        except OSError as e:
+            print(f"❌ Greška pri snimanju: {e}")
+            self._stopped = True
+        finally:
+            self._close_file()
+            with self._lock:
+                self._finished = True
+                callback = self._on_finished
+            self._report(callback)
+
+    def _report(self, callback: Optional[Callable[["StreamRecorder"], None]]):
+        if callback is None:
+            return
+        try:
+            callback(self)
+        except Exception as e:
+            print(f"Recorder callback error: {e}")
+
+
+def default_record_dir(station: str) -> str:
+    """~/Music/TrayWave/<stanica>"""
+    return os.path.join(Path.home(), "Music", "TrayWave", safe_filename(station))
@@ -0,0 +1,173 @@
+"""
+Local loopback HTTP relay - jedna upstream konekcija za plejer i metadata
+"""
+import asyncio
+import socket
+from typing import Dict, List, Optional, Tuple
+
+from traywave.core.ogg import CAPTURE_PATTERN, OggPageParser
+
+
+class AudioRelay:
+    """Minimalni HTTP server na 127.0.0.1 koji plejeru servira čist audio
+
+    Radi u asyncio petlji MetadataService-a. Upstream sesija ovde samo piše
+    audio bez ICY metadata blokova. Dok se plejer ne poveže, poslednjih
+    PREBUFFER_BYTES bajtova se čuva da bi start bio trenutan.
+
+    Ogg (Vorbis/Opus/FLAC) se ne dekodira bez header stranica sa početka
+    pesme, pa ih relay čuva (OggPageParser) i šalje svakom novom klijentu
+    pre live toka - i plejeru koji se poveže kasno ili ponovo.
+    """
+
+    PREBUFFER_BYTES = 64 * 1024
+    MAX_CLIENT_BUFFER = 4 * 1024 * 1024
+    HEADERS_TIMEOUT = 15.0
+
+    def __init__(self):
+        # Socket se otvara odmah (sa bilo kog thread-a) da bi URL bio poznat
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(4)
+        self._sock.setblocking(False)
+        self.port = self._sock.getsockname()[1]
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: List[asyncio.StreamWriter] = []
+        self._aligning: List[asyncio.StreamWriter] = []  # Ogg: čekaju početak stranice
+        self._prebuffer = bytearray()
+        self._headers: Dict[str, str] = {}
+        self._headers_ready: Optional[asyncio.Event] = None
+        self._ogg: Optional[OggPageParser] = None
+        self._closed = False
+
+    @property
+    def url(self) -> str:
+        """Loopback URL koji se prosleđuje QMediaPlayer-u"""
+        return f"http://127.0.0.1:{self.port}/stream"
+
+    async def serve(self):
+        """Počni da prihvataš konekcije (poziva se u asyncio petlji)"""
+        self._headers_ready = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle_client, sock=self._sock)
+
+    def set_headers(self, content_type: Optional[str], extra: Optional[Dict[str, str]] = None,
+                    ogg: bool = False):
+        """Postavi response headere (poziva se kad stigne upstream response)
+
+        ogg - upstream je Ogg: prate se header stranice za kasne klijente.
+        """
+        headers = {"Content-Type": content_type or "application/octet-stream"}
+        if extra:
+            headers.update(extra)
+        self._headers = headers
+        self._ogg = OggPageParser(keep_headers=True) if ogg else None
+        if self._headers_ready:
+            self._headers_ready.set()
+
+    def write(self, data):
+        """Prosledi audio svim povezanim klijentima"""
+        if self._ogg is not None:
+            self._ogg.feed(data)
+        if not self._clients and not self._aligning:
+            self._prebuffer += data
+            overflow = len(self._prebuffer) - self.PREBUFFER_BYTES
+            if overflow > 0:
+                del self._prebuffer[:overflow]
+            return
+
+        data = bytes(data)
+        clients = list(self._clients)
+        if self._aligning:
+            self._align(data)
+        for writer in clients:
+            if writer.transport.get_write_buffer_size() > self.MAX_CLIENT_BUFFER:
+                # Plejer ne čita - ne gomilaj audio u memoriji
+                self._drop(writer)
+                continue
+            writer.write(data)
+
+    def _align(self, data: bytes):
+        """Klijenti koji su dobili samo headere kreću od prve cele stranice"""
+        page = data.find(CAPTURE_PATTERN)
+        if page < 0:
+            return
+        for writer in self._aligning:
+            writer.write(data[page:])
+            self._clients.append(writer)
+        self._aligning = []
+
+    def mark_track(self, title: str):
+        """Počela je nova pesma (obični relay ne čuva istoriju)"""
+
+    def close(self):
+        """Zatvori server i sve klijente"""
+        self._closed = True
+        if self._headers_ready:
+            self._headers_ready.set()
+        if self._server:
+            self._server.close()
+        else:
+            self._sock.close()
+        for writer in self._clients + self._aligning:
+            writer.transport.abort()
+        self._clients = []
+        self._aligning = []
+
+    def _start_bytes(self) -> Tuple[bytes, bool]:
+        """(ono što nov klijent dobija pre live toka, da li live odmah nastavlja)
+
+        Ne nastavlja samo kad Ogg klijent dobije same headere - live chunk
+        je usred stranice, pa klijent čeka početak sledeće (_align).
+        """
+        prebuffer = self._prebuffer
+        ogg = self._ogg
+        if ogg is None or not ogg.header_pages:
+            return bytes(prebuffer), True
+        start = ogg.offset - len(prebuffer)  # pozicija prvog bajta prebuffer-a u streamu
+        if start <= ogg.link_start:
+            # Početak pesme je još u baferu - headeri su već tu
+            return bytes(prebuffer[ogg.link_start - start:]), True
+        # Headeri, pa audio od prve cele stranice posle njih
+        page = prebuffer.find(CAPTURE_PATTERN, max(0, ogg.headers_end - start))
+        tail = bytes(prebuffer[page:]) if page >= 0 else b""
+        return b"".join(ogg.header_pages) + tail, bool(tail)
+
+    def _drop(self, writer: asyncio.StreamWriter):
+        if writer in self._clients:
+            self._clients.remove(writer)
+        if writer in self._aligning:
+            self._aligning.remove(writer)
+        writer.transport.abort()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Pročitaj HTTP request plejera, pošalji header i ostani povezan"""
+        try:
+            await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.HEADERS_TIMEOUT)
+            await asyncio.wait_for(self._headers_ready.wait(), self.HEADERS_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+            writer.transport.abort()
+            return
+        if self._closed:
+            writer.transport.abort()
+            return
+
+        head = "HTTP/1.0 200 OK\r\n"
+        for key, value in self._headers.items():
+            head += f"{key}: {value}\r\n"
+        head += "Connection: close\r\n\r\n"
+        writer.write(head.encode("latin-1", errors="replace"))
+        start, aligned = self._start_bytes()
+        if start:
+            writer.write(start)
+        self._prebuffer.clear()
+        (self._clients if aligned else self._aligning).append(writer)
+
+        # Čekaj da plejer zatvori konekciju
+        try:
+            while await reader.read(4096):
+                pass
+        except OSError:
+            pass
+        self._drop(writer)
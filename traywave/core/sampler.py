@@ -0,0 +1,184 @@
+"""
+"What's on now" sampler - kratki metadata snapshot-ovi za listu stanica
+"""
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from traywave.core.http_stream import open_stream
+from traywave.core.icy import IcyDemuxer
+from traywave.core.metadata_service import MetadataService, is_ogg_stream
+from traywave.core.now_playing import NowPlaying, TitleParser
+from traywave.core.ogg import OggPageParser, comments_to_title
+from traywave.core.playlist import PlaylistResolver, is_playlist_url
+
+
+class StationSnapshot:
+    """Rezultat jednog snapshot-a (šta trenutno svira na stanici)"""
+
+    __slots__ = ("url", "artist", "title", "fetched_at", "bytes_read", "latency")
+
+    def __init__(self, url: str, artist: str = "", title: Optional[str] = None,
+                 bytes_read: int = 0, latency: float = 0.0):
+        self.url = url
+        self.artist = artist
+        self.title = title
+        self.fetched_at = time.monotonic()
+        self.bytes_read = bytes_read
+        self.latency = latency
+
+    @property
+    def display_text(self) -> str:
+        """Tekst za prikaz u meniju"""
+        if not self.title:
+            return ""
+        return f"{self.artist} - {self.title}" if self.artist else self.title
+
+
+class NowPlayingSampler:
+    """Konektuje se na stanicu, čita do prvog ICY bloka i odmah se diskonektuje
+
+    get() nikad ne čeka mrežu: vraća keširan (možda zastareo) snapshot i u
+    pozadini zakazuje osvežavanje (stale-while-revalidate). Istovremeno
+    radi najviše MAX_CONCURRENCY snapshot-ova, a svaki sme da skine najviše
+    MAX_SNAPSHOT_BYTES bajtova.
+    """
+
+    TTL = 120.0
+    NEGATIVE_TTL = 900.0  # stanice bez ICY metadata se ređe proveravaju
+    MAX_CONCURRENCY = 4
+    MAX_SNAPSHOT_BYTES = 128 * 1024
+    SNAPSHOT_TIMEOUT = 8.0
+
+    def __init__(self, service: MetadataService,
+                 on_update: Optional[Callable[[str], None]] = None,
+                 parser: Optional[TitleParser] = None,
+                 resolver: Optional[PlaylistResolver] = None):
+        self.service = service
+        self.on_update = on_update
+        self.parser = parser or TitleParser()
+        self.resolver = resolver
+        self._cache: Dict[str, StationSnapshot] = {}
+        self._in_flight: Set[str] = set()  # samo iz petlje servisa
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Budžet (ukupno za sesiju aplikacije)
+        self.snapshots = 0
+        self.total_bytes = 0
+        self.total_latency = 0.0
+
+    def get(self, url: str) -> Optional[StationSnapshot]:
+        """Vrati keširan snapshot i osveži ga u pozadini ako je zastareo"""
+        snapshot = self._cache.get(url)
+        if snapshot is None or self._is_stale(snapshot):
+            self.service.call_soon(self._schedule, url)
+        return snapshot
+
+    def peek(self, url: str) -> Optional[StationSnapshot]:
+        """Vrati keširan snapshot bez osvežavanja"""
+        return self._cache.get(url)
+
+    def prefetch(self, urls: Iterable[str]):
+        """Zakaži snapshot-ove za više stanica (npr. cela kategorija)"""
+        for url in urls:
+            self.get(url)
+
+    def invalidate(self, url: str):
+        """Izbaci stanicu iz keša"""
+        self._cache.pop(url, None)
+
+    def _is_stale(self, snapshot: StationSnapshot) -> bool:
+        ttl = self.TTL if snapshot.title else self.NEGATIVE_TTL
+        return time.monotonic() - snapshot.fetched_at > ttl
+
+    def get_stats(self) -> dict:
+        """Potrošnja mreže i prosečno kašnjenje po snapshot-u"""
+        count = max(1, self.snapshots)
+        return {
+            "snapshots": self.snapshots,
+            "total_bytes": self.total_bytes,
+            "avg_bytes": self.total_bytes // count,
+            "avg_latency_ms": int(self.total_latency * 1000 / count),
+        }
+
+    # === PETLJA SERVISA ===
+
+    def _schedule(self, url: str):
+        if url in self._in_flight:
+            return
+        self._in_flight.add(url)
+        asyncio.ensure_future(self._refresh(url))
+
+    async def _refresh(self, url: str):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENCY)
+        try:
+            async with self._semaphore:
+                snapshot = await self._take_snapshot(url)
+        finally:
+            self._in_flight.discard(url)
+
+        self._cache[url] = snapshot
+        self.snapshots += 1
+        self.total_bytes += snapshot.bytes_read
+        self.total_latency += snapshot.latency
+
+        if self.on_update:
+            try:
+                self.on_update(url)
+            except Exception as e:
+                print(f"Sampler callback error: {e}")
+
+    async def _take_snapshot(self, url: str) -> StationSnapshot:
+        """Pročitaj stream do prvog StreamTitle-a"""
+        started = time.monotonic()
+        bytes_read = 0
+        response = None
+        try:
+            target = None
+            if self.resolver:
+                target = self.resolver.lookup(url)
+                if target is None and is_playlist_url(url) and not self.resolver.is_fresh(url):
+                    target = await self.resolver.resolve_now(url)
+            response = await open_stream(target or url, {"Icy-MetaData": "1"}, self.SNAPSHOT_TIMEOUT)
+            metaint = int(response.headers.get("icy-metaint", 0) or 0)
+            ogg = None
+            if not metaint and is_ogg_stream(url, response.headers.get("content-type", "")):
+                # Ogg: komentari su u prvim stranicama posle konekcije
+                ogg = OggPageParser()
+            elif not metaint or metaint >= self.MAX_SNAPSHOT_BYTES:
+                return StationSnapshot(url, latency=time.monotonic() - started)
+
+            demuxer = IcyDemuxer(metaint) if metaint else None
+            decoder = self.service.charsets.decoder_for(url)
+            deadline = started + self.SNAPSHOT_TIMEOUT
+            while bytes_read < self.MAX_SNAPSHOT_BYTES:
+                budget = min(16384, self.MAX_SNAPSHOT_BYTES - bytes_read)
+                chunk = await asyncio.wait_for(
+                    response.read(budget), max(0.1, deadline - time.monotonic())
+                )
+                if not chunk:
+                    break
+                bytes_read += len(chunk)
+
+                if ogg is not None:
+                    for comments in ogg.feed(chunk):
+                        artist, title = comments_to_title(comments)
+                        if title:
+                            return StationSnapshot(url, artist, title, bytes_read,
+                                                   time.monotonic() - started)
+                    continue
+
+                for meta_bytes in demuxer.feed(chunk):
+                    raw = decoder.decode(meta_bytes.rstrip(b"\x00"))
+                    record = self.parser.parse(NowPlaying(raw, url, "icy"))
+                    if record.title:
+                        return StationSnapshot(url, record.artist, record.title, bytes_read,
+                                               time.monotonic() - started)
+        except Exception as e:
+            print(f"⚠️  Snapshot greška ({url}): {e}")
+        finally:
+            if response is not None:
+                response.close(abort=True)
+
+        return StationSnapshot(url, bytes_read=bytes_read, latency=time.monotonic() - started)
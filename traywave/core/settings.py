@@ -0,0 +1,183 @@
+"""
+Jedinstveno skladište podešavanja - ~/.config/traywave/settings.db
+
+Svaka sekcija ("config", "ui", "stations"...) je JSON u jednom redu SQLite
+tabele. Male, uvek potrebne sekcije se čitaju jednim upitom pri startu,
+katalog stanica tek kad ga neko zatraži. Upis ide kroz transakcije, pa
+prekid usred upisa ne ostavlja pola fajla.
+"""
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+SCHEMA_VERSION = 1
+HOT_SECTIONS = ("config", "ui")  # čitaju se odmah, jednim upitom
+CACHE_SECTIONS = ("probes", "resolved", "charsets", "telemetry")  # nekad <ime>.json
+
+_shared: Optional["SettingsStore"] = None
+_shared_lock = threading.Lock()
+
+
+def default_config_dir() -> str:
+    return os.path.join(Path.home(), ".config", "traywave")
+
+
+def shared_settings() -> "SettingsStore":
+    """Skladište koje dele ConfigManager, StationsManager i UI"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SettingsStore()
+        return _shared
+
+
+class SettingsStore:
+    """Sekcije podešavanja u jednom SQLite fajlu
+
+    Sekcija je JSON vrednost (obično dict). get() vraća keširanu vrednost,
+    put() je upisuje odmah - ili na kraju batch() bloka, sve u jednoj
+    transakciji. Može se koristiti iz više thread-ova.
+    """
+
+    def __init__(self, path: Optional[str] = None, legacy_dir: Optional[str] = None):
+        self.config_dir = os.path.dirname(path) if path else default_config_dir()
+        self.path = path or os.path.join(self.config_dir, "settings.db")
+        self.legacy_dir = legacy_dir or self.config_dir
+        os.makedirs(self.config_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._cache: Dict[str, object] = {}
+        self._pending: Dict[str, str] = {}
+        self._batch_depth = 0
+        self.commits = 0
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._upgrade()
+        self._load_hot()
+        self._migrate_legacy()
+
+    # === API ===
+
+    def get(self, section: str, default=None):
+        """Vrednost sekcije (sekcije van HOT_SECTIONS se čitaju tek sad)"""
+        with self._lock:
+            if section not in self._cache:
+                row = self._db.execute("SELECT data FROM sections WHERE name = ?",
+                                       (section,)).fetchone()
+                self._cache[section] = self._decode(section, row[0]) if row else None
+            value = self._cache[section]
+        return default if value is None else value
+
+    def has(self, section: str) -> bool:
+        return self.get(section) is not None
+
+    def put(self, section: str, value):
+        """Zapamti sekciju (u batch-u se upisuje na kraju bloka)"""
+        data = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._cache[section] = value
+            self._pending[section] = data
+            if self._batch_depth == 0:
+                self._commit()
+
+    @contextmanager
+    def batch(self):
+        """Svi put() u bloku idu u jednu transakciju
+
+            with settings.batch():
+                settings.put("config", config)
+                settings.put("ui", ui)
+
+        Drugi thread-ovi čekaju kraj bloka. Blokovi mogu da se ugnezde.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._commit()
+
+    def close(self):
+        with self._lock:
+            self._commit()
+            self._db.close()
+
+    # === INTERNO ===
+
+    def _commit(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO sections (name, data) VALUES (?, ?)",
+                pending.items()
+            )
+            self._db.execute("COMMIT")
+            self.commits += 1
+        except sqlite3.Error as e:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            print(f"⚠️  Ne mogu da sačuvam podešavanja ({', '.join(pending)}): {e}")
+
+    def _upgrade(self):
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sections (name TEXT PRIMARY KEY, data TEXT NOT NULL)"
+            )
+        if version != SCHEMA_VERSION:
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _load_hot(self):
+        placeholders = ",".join("?" * len(HOT_SECTIONS))
+        rows = self._db.execute(
+            f"SELECT name, data FROM sections WHERE name IN ({placeholders})", HOT_SECTIONS
+        ).fetchall()
+        for name, data in rows:
+            self._cache[name] = self._decode(name, data)
+
+    def _decode(self, section: str, data: str):
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            print(f"⚠️  Oštećena sekcija podešavanja '{section}': {e}")
+            return None
+
+    def _migrate_legacy(self):
+        """Prvi start posle nadogradnje: preuzmi config.json i ~/.traywave_style.json
+
+        Isto i za keševe koji su imali svoje JSON fajlove (probes, resolved,
+        charsets, telemetry). Stari fajlovi ostaju na disku netaknuti.
+        stations.json preuzima StationsManager, a config.json ConfigManager
+        (oba se i dalje uvoze kad se fajl promeni).
+        """
+        legacy = {
+            "config": os.path.join(self.legacy_dir, "config.json"),
+            "ui": os.path.join(Path.home(), ".traywave_style.json"),
+        }
+        for section in CACHE_SECTIONS:
+            legacy[section] = os.path.join(self.legacy_dir, f"{section}.json")
+        with self.batch():
+            for section, path in legacy.items():
+                if not os.path.exists(path) or self.has(section):
+                    continue
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        value = json.load(f)
+                except Exception as e:
+                    print(f"⚠️  Ne mogu da preuzmem {path}: {e}")
+                    continue
+                if isinstance(value, dict):
+                    print(f"📦 Preuzimam {path} u {os.path.basename(self.path)}")
+                    self.put(section, value)
+                    if section == "config":
+                        # Polazna tačka za izmene fajla (ConfigManager.import_config_file)
+                        self.put("config_file", {"mtime": os.stat(path).st_mtime, "values": value})
@@ -2,10 +2,17 @@
 Radio stanice iz Radio Browser API (radio-browser.info)
 Auto-generisano sa verifikovanim stream-ovima
 """
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+import hashlib
 import json
 import os
-from typing import Dict, List, Tuple
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+from traywave.core.catalog import Station, StationCatalog
+from traywave.core.catalog_sqlite import SqliteCatalog
+from traywave.core.settings import SettingsStore, shared_settings
+from traywave.core.watcher import FileWatcher
 
 DEFAULT_STATIONS = {
     # ============ EX-YU ============
@@ -31,78 +38,390 @@ DEFAULT_STATIONS = {
 }
 
 
+class CategoryDiff:
+    """Šta se promenilo u jednoj kategoriji (stanice se porede po URL-u)"""
+    
+    __slots__ = ("category", "added", "removed", "renamed", "reordered")
+    
+    def __init__(self, category: str):
+        self.category = category
+        self.added: List[Tuple[str, str]] = []    # (ime, url)
+        self.removed: List[str] = []              # url
+        self.renamed: List[Tuple[str, str]] = []  # (novo ime, url)
+        self.reordered = False
+    
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.renamed or self.reordered)
+    
+    def __repr__(self) -> str:
+        return (f"CategoryDiff({self.category!r}, +{len(self.added)} -{len(self.removed)} "
+                f"~{len(self.renamed)}{', reordered' if self.reordered else ''})")
+
+
+def diff_catalog(old: Dict[str, list], new: Dict[str, list]
+                 ) -> Tuple[List[str], List[str], List[CategoryDiff]]:
+    """(dodate kategorije, uklonjene kategorije, izmene postojećih)"""
+    added = [category for category in new if category not in old]
+    removed = [category for category in old if category not in new]
+    changed = []
+    for category, stations in new.items():
+        if category not in old:
+            continue
+        before = {url: name for name, url in old[category]}
+        after = {url: name for name, url in stations}
+        diff = CategoryDiff(category)
+        diff.added = [(name, url) for url, name in after.items() if url not in before]
+        diff.removed = [url for url in before if url not in after]
+        diff.renamed = [(name, url) for url, name in after.items()
+                        if url in before and before[url] != name]
+        kept_before = [url for url in before if url in after]
+        kept_after = [url for url in after if url in before]
+        diff.reordered = kept_before != kept_after
+        if diff:
+            changed.append(diff)
+    return added, removed, changed
+
+
 class StationsManager(QObject):
-    """Menadžer za radio stanice sa perzistencijom"""
+    """Menadžer za radio stanice sa perzistencijom
+
+    Katalog (StationCatalog - jedan zapis po stanici, kategorije kao tagovi)
+    je sekcija "stations" u SettingsStore-u i čita se tek na prvi pristup.
+    self.stations je pogled u starom obliku {kategorija: [(ime, url)]},
+    samo za čitanje - izmene idu kroz add_*/remove_*.
+    
+    Sa "catalog_backend": "sqlite" katalog je u tabelama settings.db
+    (SqliteCatalog): ništa se ne učitava unapred, izmene se upisuju red po
+    red, a search() ide kroz FTS5.
+    
+    Izvor istine je settings.db. stations.json je njegov izvoz (EXPORT_DELAY_MS
+    posle poslednjeg save_stations() u pozadinskom thread-u, i flush() pri
+    izlasku) i format za uvoz: uvozi se samo kad mu se sadržaj razlikuje od poslednjeg
+    izvoza/uvoza, tj. kad ga neko drugi promeni (ručno ili deploy-em) - pri
+    sledećem učitavanju, a uz watch() odmah, sa izmenama po kategoriji
+    umesto celog kataloga.
+    """
     
     # OBAVEZNO - definicija signala NA NIVOU KLASE
     stations_changed = pyqtSignal()
+    category_added = pyqtSignal(str)
+    category_removed = pyqtSignal(str)
+    category_changed = pyqtSignal(object)  # CategoryDiff
+    _export_finished = pyqtSignal()  # iz thread-a izvoza
+    
+    # Niz izmena u dijalogu = jedan izvoz. Na 50k stanica izvoz traje ~0.8 s
+    # pa ide van GUI thread-a (sa snimkom iz baze, ne iz živog kataloga)
+    EXPORT_DELAY_MS = 1000
     
-    def __init__(self, config_dir=None):
+    def __init__(self, config_dir=None, settings: Optional[SettingsStore] = None):
         super().__init__()
-        self.config_dir = config_dir or os.path.expanduser("~/.config/traywave")
+        self.settings = settings or shared_settings()
+        self.config_dir = config_dir or self.settings.config_dir
         self.stations_file = os.path.join(self.config_dir, "stations.json")
-        self.stations = DEFAULT_STATIONS.copy()
-        self.load_stations()
+        self._catalog: Optional[Union[StationCatalog, SqliteCatalog]] = None
+        self._view: Optional[Dict[str, list]] = None
+        # stations.json koji je poslednji uvezen ili izvezen
+        self._source_mtime: Optional[float] = None
+        self._source_hash: Optional[str] = None
+        self._export_pending = False
+        self._saves = 0  # broj save_stations() - da li je izvoz u toku zastareo
+        self._export_thread: Optional[threading.Thread] = None
+        self._export_result: Optional[Tuple[Optional[bytes], Optional[float], int]] = None
+        self._export_timer = QTimer(self)
+        self._export_timer.setSingleShot(True)
+        self._export_timer.setInterval(self.EXPORT_DELAY_MS)
+        self._export_timer.timeout.connect(self._export_in_background)
+        self._export_finished.connect(self._finish_export)
+    
+    @property
+    def catalog(self) -> Union[StationCatalog, SqliteCatalog]:
+        if self._catalog is None:
+            self.load_stations()
+        return self._catalog
+    
+    @property
+    def stations(self) -> Dict[str, List[Tuple[str, str]]]:
+        if self._view is None:
+            self._view = self.catalog.to_categories()
+        return self._view
+    
+    @stations.setter
+    def stations(self, value: Dict[str, list]):
+        self._set_catalog(StationCatalog.from_categories(value))
+    
+    def _set_catalog(self, catalog: Union[StationCatalog, SqliteCatalog]):
+        self._catalog = catalog
+        self._view = None
+    
+    def _backend(self) -> str:
+        return self.settings.get("config", {}).get("catalog_backend", "json")
     
     def load_stations(self):
-        """Učitaj stanice iz fajla"""
-        if os.path.exists(self.stations_file):
-            try:
-                with open(self.stations_file, 'r', encoding='utf-8') as f:
-                    loaded_stations = json.load(f)
-                    if loaded_stations:
-                        self.stations = loaded_stations
-            except Exception as e:
-                print(f"Greška pri učitavanju stanica: {e}")
-                self.stations = DEFAULT_STATIONS.copy()
+        """Učitaj stanice iz podešavanja (i uvezi stations.json ako je menjan)"""
+        self._wait_export()  # naš izvoz u toku nije spoljna izmena
+        stored = self.settings.get("stations")
+        stored = stored if isinstance(stored, dict) else {}
+        in_sqlite = stored.get("backend") == "sqlite"
+        if self._backend() == "sqlite":
+            catalog = SqliteCatalog(self.settings.path)
+            if not in_sqlite:
+                # Prvi start sa SQLite katalogom - prebaci postojeći u tabele
+                catalog.import_categories(self._json_catalog(stored).to_categories())
+        elif in_sqlite:
+            # Povratak na JSON - preuzmi katalog iz tabela
+            catalog = StationCatalog.from_categories(SqliteCatalog(self.settings.path).to_categories())
+        else:
+            catalog = self._json_catalog(stored)
+        self._set_catalog(catalog)
+        # Stanje izvoza je u svojoj sekciji; starije verzije su ga držale u "stations"
+        source = self.settings.get("stations_source") or {
+            "mtime": stored.get("source_mtime"), "hash": stored.get("source_hash"),
+            "export_pending": stored.get("export_pending"),
+        }
+        self._source_mtime = source.get("mtime")
+        self._source_hash = source.get("hash")
+        self._export_pending = bool(source.get("export_pending"))
+        if in_sqlite != isinstance(catalog, SqliteCatalog):
+            self._store()
+        if not self._import_if_changed() and self._export_pending:
+            self._export_in_background()  # izlaz pre izvoza - dovrši ga
     
     def save_stations(self):
-        """Sačuvaj stanice u fajl"""
-        os.makedirs(self.config_dir, exist_ok=True)
+        """Sačuvaj stanice u podešavanja i izvezi ih u stations.json"""
         try:
-            with open(self.stations_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stations, f, indent=2, ensure_ascii=False)
+            self._export_pending = True
+            self._saves += 1
+            self._store()
+            self._export_timer.start()
             self.stations_changed.emit()
             return True
         except Exception as e:
             print(f"Greška pri čuvanju stanica: {e}")
             return False
     
+    def flush(self):
+        """Odmah izvezi izmene koje čekaju (pri izlasku, na pozivajućem thread-u)"""
+        self._wait_export()
+        if self._export_pending:
+            self.export_stations()
+    
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.stations_file).st_mtime
+        except OSError:
+            return None
+    
+    def watch(self, watcher: FileWatcher):
+        """Uvozi stations.json čim se promeni i javi šta je izmenjeno"""
+        watcher.watch(self.stations_file, self._on_file_changed)
+    
+    @staticmethod
+    def _json_catalog(stored: dict) -> StationCatalog:
+        catalog = StationCatalog.from_records(stored) if stored else None
+        if catalog is None or not catalog.categories():
+            catalog = StationCatalog.from_categories(DEFAULT_STATIONS)
+        return catalog
+    
+    def _read_if_changed(self) -> Optional[bytes]:
+        """Sadržaj stations.json ako nije isti kao poslednji uvoz/izvoz"""
+        mtime = self._file_mtime()
+        if mtime is None or mtime == self._source_mtime:
+            return None
+        try:
+            with open(self.stations_file, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            print(f"Greška pri učitavanju stanica: {e}")
+            return None
+        if hashlib.sha1(raw).hexdigest() == self._source_hash:
+            # Dodirnut ali isti (touch, kopija našeg izvoza) - baza ostaje
+            self._source_mtime = mtime
+            self._store_source()
+            return None
+        return raw
+    
+    def _import_if_changed(self) -> bool:
+        raw = self._read_if_changed()
+        return raw is not None and self._import_file(raw)
+    
+    def _on_file_changed(self, path: str):
+        if self._export_thread is not None:
+            return  # naš izvoz - _finish_export() proverava fajl posle njega
+        old = self.stations
+        if not self._import_if_changed():
+            return
+        added, removed, changed = diff_catalog(old, self.stations)
+        if not (added or removed or changed):
+            return
+        print(f"🔁 stations.json: +{len(added)} -{len(removed)} ~{len(changed)} kategorija")
+        for category in removed:
+            self.category_removed.emit(category)
+        for category in added:
+            self.category_added.emit(category)
+        for diff in changed:
+            self.category_changed.emit(diff)
+    
+    def _import_file(self, raw: bytes) -> bool:
+        """Preuzmi stations.json u podešavanja"""
+        try:
+            loaded_stations = json.loads(raw.decode('utf-8'))
+        except Exception as e:
+            print(f"Greška pri učitavanju stanica: {e}")
+            return False
+        if not loaded_stations or not isinstance(loaded_stations, dict):
+            return False
+        print(f"📦 Uvozim {self.stations_file}")
+        self.catalog.import_categories(loaded_stations)
+        self._view = None
+        with self.settings.batch():
+            self._remember_source(raw)
+            self._store()
+        return True
+    
+    def _remember_source(self, raw: bytes, mtime: Optional[float] = None, current: bool = True):
+        # Fajl i baza su sad isti - izvoz koji čeka više nije potreban.
+        # current=False: fajl je naš, ali baza je u međuvremenu izmenjena
+        if current:
+            self._export_timer.stop()
+            self._export_pending = False
+        self._source_mtime = self._file_mtime() if mtime is None else mtime
+        self._source_hash = hashlib.sha1(raw).hexdigest()
+        self._store_source()
+    
+    def export_stations(self, path: Optional[str] = None) -> bool:
+        """Izvezi katalog u stations.json format (odmah, na pozivajućem thread-u)"""
+        path = path or self.stations_file
+        if path == self.stations_file:
+            self._wait_export()
+        try:
+            raw = self._write_export(self.catalog.to_categories(), path)
+        except Exception as e:
+            print(f"Greška pri izvozu stanica: {e}")
+            return False
+        if path == self.stations_file:
+            # Sopstveni izvoz se ne uvozi ponovo (ni kad watcher javi izmenu)
+            self._remember_source(raw)
+        return True
+    
+    @staticmethod
+    def _write_export(categories: Dict[str, list], path: str) -> bytes:
+        raw = json.dumps(categories, indent=2, ensure_ascii=False).encode('utf-8')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp, path)
+        return raw
+    
+    def _export_in_background(self):
+        """Izvoz iz tajmera: stations.json se gradi i piše u posebnom thread-u"""
+        if self._export_thread is not None:
+            self._export_timer.start()  # prethodni izvoz još piše - ovaj posle njega
+            return
+        if isinstance(self.catalog, SqliteCatalog):
+            source = self.catalog.path  # tabele, kroz sopstvenu konekciju (WAL)
+        else:
+            source = self.settings.get("stations")  # zapisi iz poslednjeg _store()
+        self._export_thread = threading.Thread(
+            target=self._export_worker, args=(source, self._saves),
+            name="traywave-stations-export", daemon=True
+        )
+        self._export_thread.start()
+    
+    def _export_worker(self, source: Union[str, dict], saves: int):
+        raw = mtime = None
+        try:
+            if isinstance(source, str):
+                catalog = SqliteCatalog(source)
+                try:
+                    categories = catalog.to_categories()
+                finally:
+                    catalog.close()
+            else:
+                categories = StationCatalog.from_records(source).to_categories()
+            raw = self._write_export(categories, self.stations_file)
+            mtime = self._file_mtime()
+        except Exception as e:
+            print(f"Greška pri izvozu stanica: {e}")
+        self._export_result = (raw, mtime, saves)
+        self._export_finished.emit()
+    
+    def _finish_export(self):
+        """Izvoz iz pozadine je gotov (GUI thread - signal ili _wait_export())"""
+        result, self._export_result = self._export_result, None
+        if result is None:
+            return
+        self._export_thread = None
+        raw, mtime, saves = result
+        if raw is None:
+            return  # izvoz ostaje na čekanju do sledećeg save_stations()/flush()
+        self._remember_source(raw, mtime, current=saves == self._saves)
+        if self._file_mtime() != mtime:
+            self._on_file_changed(self.stations_file)  # menjan spolja dok smo pisali
+    
+    def _wait_export(self):
+        if self._export_thread is not None:
+            self._export_thread.join()
+            self._finish_export()
+    
+    def _store(self):
+        if isinstance(self.catalog, SqliteCatalog):
+            data = {"backend": "sqlite"}  # stanice su već u tabelama, red po red
+        else:
+            data = self.catalog.to_records()
+        with self.settings.batch():
+            self.settings.put("stations", data)
+            self._store_source()
+    
+    def _store_source(self):
+        # Posebna sekcija - izvoz/uvoz ne prepisuje ceo JSON katalog
+        self.settings.put("stations_source", {
+            "mtime": self._source_mtime,
+            "hash": self._source_hash,
+            "export_pending": self._export_pending,
+        })
+    
+    def search(self, query: str, limit: int = 50) -> List[Station]:
+        """Stanice po imenu ili kategoriji"""
+        return self.catalog.search(query, limit)
+    
+    def find_station(self, url: str) -> Optional[Station]:
+        """Zapis stanice po URL-u (bilo koji zapis iste adrese)"""
+        return self.catalog.find_url(url)
+    
     def add_category(self, name: str) -> bool:
         """Dodaj novu kategoriju"""
-        if name in self.stations:
+        if not self.catalog.add_category(name):
             return False
-        self.stations[name] = []
+        self._view = None
         return True
     
     def remove_category(self, name: str) -> bool:
         """Ukloni kategoriju"""
-        if name not in self.stations:
+        if not self.catalog.remove_category(name):
             return False
-        del self.stations[name]
+        self._view = None
         return True
     
     def add_station(self, category: str, name: str, url: str) -> bool:
-        """Dodaj stanicu u kategoriju"""
-        if category not in self.stations:
+        """Dodaj stanicu u kategoriju (postojeća stanica samo dobija kategoriju)"""
+        catalog = self.catalog
+        if not catalog.has_category(category) or catalog.has_name_in(name, category):
             return False
-        for existing_name, existing_url in self.stations[category]:
-            if existing_name == name or existing_url == url:
-                return False
-        self.stations[category].append((name, url))
-        return True
+        _, added = catalog.add(name, url, category)
+        if added:
+            self._view = None
+        return added
     
     def remove_station(self, category: str, index: int) -> bool:
         """Ukloni stanicu iz kategorije"""
-        if category not in self.stations:
-            return False
-        if index < 0 or index >= len(self.stations[category]):
+        if self.catalog.remove_at(category, index) is None:
             return False
-        self.stations[category].pop(index)
+        self._view = None
         return True
     
     def refresh_stations(self):
-        """Osveži stanice sa diska"""
+        """Osveži stanice iz podešavanja (i stations.json ako je menjan spolja)"""
         try:
             self.load_stations()
             self.stations_changed.emit()
@@ -113,8 +432,10 @@ class StationsManager(QObject):
     
     def get_categories(self) -> List[str]:
         """Dobij listu imena kategorija"""
-        return list(self.stations.keys())
+        return self.catalog.categories()
     
     def get_stations(self, category: str) -> List[Tuple[str, str]]:
         """Dobij stanice za kategoriju"""
-        return self.stations.get(category, [])
+        if self._view is not None:
+            return self._view.get(category, [])
+        return self.catalog.pairs_in(category)
@@ -0,0 +1,145 @@
+"""
+Playback telemetry - vremena faza od play() do zvuka, percentili po stanici
+"""
+import math
+import time
+from typing import Dict, List, Optional
+
+from traywave.core.settings import SettingsStore, shared_settings
+
+# Faze redom kojim se očekuju (ms od play() poziva)
+PHASES = ("source_set", "loading", "connected", "buffering", "buffered",
+          "playing", "first_audio", "first_metadata")
+
+MAX_SAMPLES = 32        # rolling prozor po fazi i stanici
+SAVE_INTERVAL = 30.0    # najčešće upisivanje na disk (sekunde)
+
+
+def percentile(samples: List[int], p: float) -> Optional[int]:
+    """Nearest-rank percentil (None za praznu listu)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class PlaybackTrace:
+    """Vremenske oznake jednog play() poziva"""
+
+    __slots__ = ("url", "station", "warm", "started_at", "marks")
+
+    def __init__(self, url: str, station: str, warm: bool = False,
+                 started_at: Optional[float] = None):
+        self.url = url
+        self.station = station
+        self.warm = warm
+        self.started_at = started_at if started_at is not None else time.monotonic()
+        self.marks: Dict[str, int] = {}
+
+    def mark(self, phase: str) -> bool:
+        """Zabeleži prvi prolaz kroz fazu, vrati True ako je nova"""
+        if phase in self.marks:
+            return False
+        self.marks[phase] = int((time.monotonic() - self.started_at) * 1000)
+        return True
+
+    @property
+    def complete(self) -> bool:
+        """Ima i zvuk i prvi naslov - nema više šta da se meri"""
+        return "first_audio" in self.marks and "first_metadata" in self.marks
+
+
+class PlaybackTelemetry:
+    """Rolling uzorci po stanici i fazi, sekcija "telemetry"
+
+    Topli startovi (plejer iz PlayerPool-a) se vode odvojeno, pod
+    'warm:<faza>', da ne bi sakrili spore stanice.
+    """
+
+    def __init__(self, settings: Optional[SettingsStore] = None):
+        self.settings = settings or shared_settings()
+        self._stations: Dict[str, dict] = self._load()
+        self._dirty = False
+        self._saved_at = 0.0
+
+    def _load(self) -> Dict[str, dict]:
+        return dict(self.settings.get("telemetry", {}).get("stations", {}))
+
+    def flush(self):
+        """Upiši u podešavanja ako ima promena"""
+        if not self._dirty:
+            return
+        self.settings.put("telemetry", {"version": 1, "stations": self._stations})
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def record(self, trace: PlaybackTrace):
+        """Dodaj uzorke završenog (ili prekinutog) trace-a"""
+        if not trace.marks:
+            return
+        entry = self._entry(trace.url, trace.station)
+        entry["plays"] += 1
+        prefix = "warm:" if trace.warm else ""
+        for phase, ms in trace.marks.items():
+            samples = entry["phases"].setdefault(prefix + phase, [])
+            samples.append(ms)
+            del samples[:-MAX_SAMPLES]
+
+        parts = ", ".join(f"{phase} {ms}" for phase, ms in trace.marks.items())
+        print(f"⏱️  {trace.station} ({'warm' if trace.warm else 'cold'}): {parts} ms")
+
+        self._changed()
+
+    def record_stall(self, url: str, station: str):
+        """Plejer je ostao bez bafera posle prvog zvuka"""
+        self._entry(url, station)["stalls"] += 1
+        self._changed()
+
+    def _entry(self, url: str, station: str) -> dict:
+        entry = self._stations.setdefault(url, {"name": station, "plays": 0,
+                                                "stalls": 0, "phases": {}})
+        entry["name"] = station
+        return entry
+
+    def _changed(self):
+        self._dirty = True
+        if time.monotonic() - self._saved_at > SAVE_INTERVAL:
+            self.flush()
+
+    # === API ===
+
+    def station_stats(self, url: str) -> Dict[str, dict]:
+        """{faza: {"p50", "p95", "n"}} za stanicu"""
+        entry = self._stations.get(url)
+        if not entry:
+            return {}
+        return {
+            phase: {"p50": percentile(samples, 50), "p95": percentile(samples, 95),
+                    "n": len(samples)}
+            for phase, samples in entry["phases"].items()
+        }
+
+    def summary(self, phase: str = "first_audio") -> List[dict]:
+        """Sve stanice sortirane od najsporije (po p95 za fazu)"""
+        rows = []
+        for url, entry in self._stations.items():
+            samples = entry["phases"].get(phase, [])
+            if not samples:
+                continue
+            rows.append({
+                "url": url,
+                "name": entry.get("name", url),
+                "plays": entry.get("plays", 0),
+                "stalls": entry.get("stalls", 0),
+                "n": len(samples),
+                "p50": percentile(samples, 50),
+                "p95": percentile(samples, 95),
+            })
+        rows.sort(key=lambda row: row["p95"], reverse=True)
+        return rows
+
+    def clear(self):
+        """Obriši svu statistiku"""
+        self._stations = {}
+        self._dirty = True
+        self.flush()
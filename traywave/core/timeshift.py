@@ -0,0 +1,271 @@
+"""
+Time-shift buffer - live stream u memory-mapped ring fajlu, reprodukcija sa bilo koje pozicije
+"""
+import asyncio
+import bisect
+import mmap
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from traywave.core.relay import AudioRelay
+
+CHUNK_BYTES = 64 * 1024
+CHECKPOINT_INTERVAL = 1.0   # sekunde između tačaka indeksa (vreme -> pozicija)
+MAX_TRACKS = 256
+
+_REQUEST_LINE = re.compile(rb"^GET\s+(\S+)")
+
+
+class RingFile:
+    """Fiksna mmap-ovana datoteka u koju se piše u krug
+
+    Pozicije su apsolutne (ukupno upisanih bajtova), pa se lako proveri da
+    li je nešto već prepisano. Memorija ne raste: kernel drži najviše
+    capacity bajtova stranica, i to fajl-backed (mogu da se izbace).
+    """
+
+    def __init__(self, capacity: int, directory: Optional[str] = None):
+        self.capacity = capacity
+        self.total = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="traywave-", suffix=".ring", dir=directory)
+        try:
+            os.ftruncate(fd, capacity)
+            self._map = mmap.mmap(fd, capacity)
+        finally:
+            os.close(fd)
+        self._path: Optional[str] = path
+        try:
+            # Fajl nestaje sa diska čim se mmap zatvori (i posle pada programa)
+            os.unlink(path)
+            self._path = None
+        except OSError:
+            pass
+
+    @property
+    def oldest(self) -> int:
+        """Najstarija pozicija koja još nije prepisana"""
+        return max(0, self.total - self.capacity)
+
+    def write(self, data):
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        size = len(view)
+        if size >= self.capacity:
+            self.total += size - self.capacity
+            view = view[size - self.capacity:]
+            size = self.capacity
+
+        start = self.total % self.capacity
+        first = min(size, self.capacity - start)
+        self._map[start:start + first] = view[:first]
+        if first < size:
+            self._map[0:size - first] = view[first:]
+        self.total += size
+
+    def read(self, position: int, size: int) -> bytes:
+        """Pročitaj do size bajtova od apsolutne pozicije (koja nije prepisana)"""
+        position = max(position, self.oldest)
+        size = min(size, self.total - position)
+        if size <= 0:
+            return b""
+        start = position % self.capacity
+        first = min(size, self.capacity - start)
+        if first == size:
+            return self._map[start:start + size]
+        return self._map[start:self.capacity] + self._map[0:size - first]
+
+    def close(self):
+        self._map.close()
+        if self._path:
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
+
+
+class TimeshiftIndex:
+    """Tačke (vreme prijema, pozicija) na svaku sekundu i granice pesama
+
+    Piše ga petlja servisa, čita GUI thread - zato lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._times: List[float] = []
+        self._positions: List[int] = []
+        self._tracks: deque = deque(maxlen=MAX_TRACKS)  # (pozicija, vreme, naslov)
+
+    def note(self, position: int, now: float):
+        if self._times and now - self._times[-1] < CHECKPOINT_INTERVAL:
+            return
+        with self._lock:
+            self._times.append(now)
+            self._positions.append(position)
+
+    def add_track(self, position: int, now: float, title: str):
+        with self._lock:
+            self._tracks.append((position, now, title))
+
+    def prune(self, oldest: int):
+        """Zaboravi tačke koje pokazuju na prepisan deo ringa"""
+        with self._lock:
+            index = bisect.bisect_left(self._positions, oldest)
+            if index > 64:
+                del self._times[:index]
+                del self._positions[:index]
+            while self._tracks and self._tracks[0][0] < oldest:
+                self._tracks.popleft()
+
+    def position_at(self, when: float) -> Optional[int]:
+        """Pozicija bajta primljenog u trenutku when (monotonic)"""
+        with self._lock:
+            if not self._times:
+                return None
+            index = bisect.bisect_right(self._times, when) - 1
+            return self._positions[max(0, index)]
+
+    def time_at(self, position: int) -> Optional[float]:
+        """Kada je primljen bajt na poziciji"""
+        with self._lock:
+            if not self._positions:
+                return None
+            index = bisect.bisect_right(self._positions, position) - 1
+            return self._times[max(0, index)]
+
+    def tracks(self) -> List[Tuple[int, float, str]]:
+        with self._lock:
+            return list(self._tracks)
+
+
+class TimeshiftRelay(AudioRelay):
+    """AudioRelay koji sve pamti u RingFile i plejeru servira od bilo koje pozicije
+
+    URL '/stream?pos=N' počinje od apsolutne pozicije N (ili od najstarije
+    ako je N već prepisana); bez pos kreće malo iza live ivice. Klijent se
+    ne izbacuje kad ne čita - plejer na pauzi drži kursor, a upstream i
+    dalje puni ring.
+    """
+
+    def __init__(self, capacity: int, directory: Optional[str] = None):
+        super().__init__()
+        self.ring = RingFile(capacity, directory or os.path.join(Path.home(), ".cache", "traywave"))
+        self.index = TimeshiftIndex()
+        self.started_at = time.monotonic()
+        self._last_title: Optional[str] = None
+        self._waiters: List[asyncio.Future] = []
+
+    def url_at(self, position: Optional[int] = None) -> str:
+        """Loopback URL koji počinje od date pozicije (None = live)"""
+        return self.url if position is None else f"{self.url}?pos={position}"
+
+    @property
+    def live_position(self) -> int:
+        return self.ring.total
+
+    @property
+    def buffered_seconds(self) -> float:
+        """Koliko sekundi unazad može da se premota"""
+        oldest_time = self.index.time_at(self.ring.oldest)
+        if oldest_time is None:
+            return 0.0
+        return max(0.0, time.monotonic() - oldest_time)
+
+    def position_for_delay(self, seconds: float) -> int:
+        """Pozicija koja je bila live pre 'seconds' sekundi"""
+        position = self.index.position_at(time.monotonic() - seconds)
+        if position is None:
+            return self.ring.total
+        return max(position, self.ring.oldest)
+
+    def track_start(self, before: int) -> Optional[int]:
+        """Početak pesme koja svira na poziciji 'before'"""
+        start = None
+        for position, _, _ in self.index.tracks():
+            if position <= before:
+                start = position
+        return start if start is not None and start >= self.ring.oldest else None
+
+    def title_at(self, position: int) -> Optional[str]:
+        """Metadata (raw) pesme koja svira na poziciji, None ako se ne zna"""
+        title = None
+        for start, _, track_title in self.index.tracks():
+            if start > position:
+                break
+            title = track_title
+        return title
+
+    # === AudioRelay ===
+
+    def write(self, data):
+        self.ring.write(data)
+        self.index.note(self.ring.total, time.monotonic())
+        self.index.prune(self.ring.oldest)
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def mark_track(self, title: str):
+        if title == self._last_title:
+            return
+        self._last_title = title
+        self.index.add_track(self.ring.total, time.monotonic(), title)
+
+    def close(self):
+        super().close()
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters = []
+        self.ring.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Pošalji header pa audio iz ringa od tražene pozicije"""
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.HEADERS_TIMEOUT)
+            await asyncio.wait_for(self._headers_ready.wait(), self.HEADERS_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, OSError):
+            writer.transport.abort()
+            return
+        if self._closed:
+            writer.transport.abort()
+            return
+
+        cursor = max(self.ring.oldest, self.ring.total - self.PREBUFFER_BYTES)
+        match = _REQUEST_LINE.match(request)
+        if match:
+            query = parse_qs(urlsplit(match.group(1).decode("latin-1")).query)
+            if query.get("pos", [""])[0].isdigit():
+                cursor = int(query["pos"][0])
+
+        head = "HTTP/1.0 200 OK\r\n"
+        for key, value in self._headers.items():
+            head += f"{key}: {value}\r\n"
+        head += "Connection: close\r\n\r\n"
+        writer.write(head.encode("latin-1", errors="replace"))
+        self._clients.append(writer)
+
+        try:
+            while not self._closed:
+                cursor = max(cursor, self.ring.oldest)
+                if cursor >= self.ring.total:
+                    waiter = asyncio.get_event_loop().create_future()
+                    self._waiters.append(waiter)
+                    await waiter
+                    continue
+                chunk = self.ring.read(cursor, CHUNK_BYTES)
+                cursor += len(chunk)
+                writer.write(chunk)
+                # Plejer na pauzi ne čita - drain čeka, kursor stoji
+                await writer.drain()
+        except (ConnectionError, OSError, ValueError):
+            pass
+        self._drop(writer)
@@ -0,0 +1,91 @@
+"""
+Praćenje izmena konfiguracionih fajlova (QFileSystemWatcher / inotify)
+"""
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer
+
+DEBOUNCE_MS = 300  # editori i deploy alati pišu u više koraka
+
+
+def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class FileWatcher(QObject):
+    """Javlja kad se fajl promeni, jednom po nizu događaja
+
+    Prati i fajl i njegov direktorijum: alati koji pišu temp fajl pa ga
+    preimenuju (os.replace, config management) brišu stari inode i
+    QFileSystemWatcher tada prestaje da prati putanju. Događaji se spajaju
+    u jedan posle DEBOUNCE_MS tišine, a callback se zove samo ako se
+    mtime/veličina/inode zaista promenio.
+    """
+
+    def __init__(self, debounce_ms: int = DEBOUNCE_MS, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.debounce_ms = debounce_ms
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_event)
+        self._watcher.directoryChanged.connect(self._on_directory_event)
+        self._callbacks: Dict[str, List[Callable[[str], None]]] = {}
+        self._signatures: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        self._timers: Dict[str, QTimer] = {}
+
+    def watch(self, path: str, callback: Callable[[str], None]):
+        """callback(path) posle svake stvarne izmene (i kad fajl tek nastane)"""
+        path = os.path.abspath(path)
+        if path not in self._callbacks:
+            self._callbacks[path] = []
+            self._signatures[path] = _signature(path)
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(self.debounce_ms)
+            timer.timeout.connect(lambda p=path: self._settle(p))
+            self._timers[path] = timer
+            self._add_paths(path)
+        self._callbacks[path].append(callback)
+
+    def unwatch(self, path: str):
+        path = os.path.abspath(path)
+        if self._callbacks.pop(path, None) is None:
+            return
+        self._signatures.pop(path, None)
+        self._timers.pop(path).stop()
+        if path in self._watcher.files():
+            self._watcher.removePath(path)
+
+    def _add_paths(self, path: str):
+        directory = os.path.dirname(path)
+        if os.path.isdir(directory) and directory not in self._watcher.directories():
+            self._watcher.addPath(directory)
+        if os.path.exists(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+
+    def _on_event(self, path: str):
+        timer = self._timers.get(path)
+        if timer is not None:
+            timer.start()  # ponovo od nule - čeka se kraj niza upisa
+
+    def _on_directory_event(self, directory: str):
+        # Ne zna se koji fajl - proveri samo one iz tog direktorijuma
+        for path in self._callbacks:
+            if os.path.dirname(path) == directory:
+                self._on_event(path)
+
+    def _settle(self, path: str):
+        self._add_paths(path)  # posle rename-a putanja ima nov inode
+        signature = _signature(path)
+        if signature is None or signature == self._signatures.get(path):
+            return
+        self._signatures[path] = signature
+        for callback in list(self._callbacks.get(path, [])):
+            try:
+                callback(path)
+            except Exception as e:
+                print(f"⚠️  Greška pri obradi izmene {path}: {e}")
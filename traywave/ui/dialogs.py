@@ -4,7 +4,8 @@ Dialog windows (settings, style picker, about, etc.)
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
     QListWidget, QPushButton, QMessageBox, QInputDialog,
-    QFrame, QTabWidget, QWidget, QScrollArea, QGroupBox, QCheckBox, QSpinBox
+    QFrame, QTabWidget, QWidget, QScrollArea, QGroupBox, QCheckBox, QSpinBox,
+    QTableWidget, QTableWidgetItem, QHeaderView
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
@@ -502,6 +503,7 @@ class StyleSettingsDialog(QDialog):
         tabs.addTab(self._create_stations_tab(), "📻 Stations")
         tabs.addTab(self._create_appearance_tab(), "🎨 Appearance")
         tabs.addTab(self._create_general_tab(), "🔧 General")
+        tabs.addTab(self._create_stats_tab(), "📊 Stats")
         layout.addWidget(tabs)
         
         # Buttons
@@ -768,6 +770,32 @@ class StyleSettingsDialog(QDialog):
         sleep_layout.addWidget(self.sleep_quit_check)
         
         layout.addWidget(sleep_group)
+        
+        # Playback group
+        playback_group = QGroupBox("Playback")
+        playback_layout = QHBoxLayout(playback_group)
+        playback_layout.addWidget(QLabel("Crossfade between stations:"))
+        self.crossfade_spin = QSpinBox()
+        self.crossfade_spin.setRange(0, 5000)
+        self.crossfade_spin.setSingleStep(250)
+        self.crossfade_spin.setSuffix(" ms")
+        self.crossfade_spin.setSpecialValueText("Off")
+        self.crossfade_spin.setValue(self.tray_wave.engine.config.get("crossfade_ms", 0))
+        playback_layout.addWidget(self.crossfade_spin)
+        playback_layout.addSpacing(16)
+        playback_layout.addWidget(QLabel("Time-shift buffer:"))
+        self.timeshift_spin = QSpinBox()
+        self.timeshift_spin.setRange(0, 120)
+        self.timeshift_spin.setSingleStep(5)
+        self.timeshift_spin.setSuffix(" min")
+        self.timeshift_spin.setSpecialValueText("Off")
+        self.timeshift_spin.setToolTip("Pause and rewind live MP3/AAC streams.\n"
+                                       "Uses a ring file in ~/.cache/traywave per player.")
+        self.timeshift_spin.setValue(self.tray_wave.engine.config.get("timeshift_minutes", 0))
+        playback_layout.addWidget(self.timeshift_spin)
+        playback_layout.addStretch()
+        
+        layout.addWidget(playback_group)
         layout.addStretch()
         
         # Load current sleep timer state from engine
@@ -775,6 +803,84 @@ class StyleSettingsDialog(QDialog):
         
         return widget
     
+    def _create_stats_tab(self):
+        """Create playback statistics tab (time to first audio per station)"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        
+        info = QLabel("Cold starts, slowest first (p95 time to first audio). "
+                      "Warm starts from the player pool are not included.")
+        info.setWordWrap(True)
+        layout.addWidget(info)
+        
+        self.reconnect_label = QLabel()
+        layout.addWidget(self.reconnect_label)
+        
+        self.stats_table = QTableWidget(0, 7)
+        self.stats_table.setHorizontalHeaderLabels([
+            "Station", "Plays", "Audio p50", "Audio p95",
+            "Title p50", "Title p95", "Stalls"
+        ])
+        self.stats_table.verticalHeader().setVisible(False)
+        self.stats_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        header = self.stats_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, 7):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.stats_table)
+        
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.load_stats)
+        clear_btn = QPushButton("Clear Statistics")
+        clear_btn.clicked.connect(self.clear_stats)
+        buttons.addStretch()
+        buttons.addWidget(clear_btn)
+        buttons.addWidget(refresh_btn)
+        layout.addLayout(buttons)
+        
+        self.load_stats()
+        return widget
+    
+    def load_stats(self):
+        """Fill statistics table from engine telemetry"""
+        engine = self.tray_wave.engine
+        reconnect = engine.get_reconnect_stats()
+        self.reconnect_label.setText(
+            f"This session: {reconnect['outages']} dropouts, "
+            f"{reconnect['reconnects']} reconnect attempts, "
+            f"{reconnect['downtime']:.0f} s without audio"
+            + ("" if reconnect["online"] else "  (offline)")
+        )
+        
+        telemetry = engine.telemetry
+        rows = telemetry.summary("first_audio")
+        
+        def ms(value):
+            return f"{value} ms" if value is not None else "-"
+        
+        self.stats_table.setRowCount(len(rows))
+        for index, row in enumerate(rows):
+            title = telemetry.station_stats(row["url"]).get("first_metadata", {})
+            values = [row["name"], str(row["plays"]), ms(row["p50"]), ms(row["p95"]),
+                      ms(title.get("p50")), ms(title.get("p95")), str(row["stalls"])]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 0:
+                    item.setToolTip(row["url"])
+                self.stats_table.setItem(index, column, item)
+    
+    def clear_stats(self):
+        """Clear all playback statistics"""
+        reply = QMessageBox.question(
+            self, "Clear Statistics",
+            "Delete all playback statistics?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.tray_wave.engine.telemetry.clear()
+            self.load_stats()
+    
     def _update_sleep_controls(self, state):
         """Enable/disable sleep timer controls based on checkbox"""
         enabled = (state == Qt.CheckState.Checked.value)
@@ -803,24 +909,31 @@ class StyleSettingsDialog(QDialog):
         """Apply the selected settings"""
         print(f"🔄 Applying style: {self.selected_style}")
         
-        # Apply style
-        if self.selected_style != self.tray_wave.current_style:
-            print(f"🔄 Style will change from '{self.tray_wave.current_style}' to '{self.selected_style}'")
-            self.tray_wave.change_menu_style(self.selected_style)
-        else:
-            # OSVEŽI MENU ČAK I AKO SE NIJE PROMENILA TEMA
-            # (u slučaju da su se dodale stanice)
-            self.tray_wave._rebuild_menu()
-        
-        # Apply sleep timer settings
-        if self.sleep_enable.isChecked():
-            minutes = self.sleep_minutes_spin.value()
-            quit_app = self.sleep_quit_check.isChecked()
-            self.tray_wave.engine.set_sleep_timer(minutes, quit_app)
-            print(f"⏰ Sleep timer set: {minutes} min, quit: {quit_app}")
-        else:
-            self.tray_wave.engine.cancel_sleep_timer()
-            print("⏰ Sleep timer disabled")
+        # Stil, sleep timer, crossfade i time-shift se upisuju jednom transakcijom
+        with self.tray_wave.settings.batch():
+            # Apply style
+            if self.selected_style != self.tray_wave.current_style:
+                print(f"🔄 Style will change from '{self.tray_wave.current_style}' to '{self.selected_style}'")
+                self.tray_wave.change_menu_style(self.selected_style)
+            else:
+                # OSVEŽI MENU ČAK I AKO SE NIJE PROMENILA TEMA
+                # (u slučaju da su se dodale stanice)
+                self.tray_wave._rebuild_menu()
+        
+            # Apply sleep timer settings
+            if self.sleep_enable.isChecked():
+                minutes = self.sleep_minutes_spin.value()
+                quit_app = self.sleep_quit_check.isChecked()
+                self.tray_wave.engine.set_sleep_timer(minutes, quit_app)
+                print(f"⏰ Sleep timer set: {minutes} min, quit: {quit_app}")
+            else:
+                self.tray_wave.engine.cancel_sleep_timer()
+                print("⏰ Sleep timer disabled")
+        
+            # Crossfade i time-shift se primenjuju od sledeće promene stanice
+            self.tray_wave.engine.config.set("crossfade_ms", self.crossfade_spin.value())
+            self.tray_wave.engine.config.set("timeshift_minutes", self.timeshift_spin.value())
+            self.tray_wave.engine.config.flush()
         
         # EMITUJ SIGNAL DA SU STANICE PROMENJENE
         self.stations_modified.emit()
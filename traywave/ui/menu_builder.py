@@ -2,6 +2,7 @@
 Menu builder - constructs the tray menu
 """
 from PyQt6.QtWidgets import QMenu, QWidgetAction
+from PyQt6.QtGui import QAction
 from PyQt6.QtCore import Qt
 from .widgets.menu_header import MenuHeader
 from .styles.style_manager import StyleManager
@@ -14,10 +15,25 @@ class MenuBuilder:
         self.tray = tray_app
         self.style_manager = StyleManager()
         self.menu_header = None
+        self.station_actions = {}  # url -> [(QAction, display name)]
+        self.category_menus = {}  # kategorija -> QMenu
+        self.category_actions = {}  # kategorija -> {url: QAction}
+        self.menu = None
+        self.style = None
+        self._categories_end = None  # separator posle kategorija
+        # Delovi koji zavise od reprodukcije - refresh_state() ih menja na mestu
+        self.record_action = None
+        self.timeshift_menu = None
+        self.pause_action = None
+        self.live_action = None
+        self._checked_url = None
     
     def build_menu(self, current_style: str) -> QMenu:
         """Build the complete menu with given style"""
         print(f"🎨 Building menu with style: {current_style}")
+        self.station_actions = {}
+        self.category_menus = {}
+        self.category_actions = {}
         
         # Create new menu
         menu = QMenu()
@@ -39,7 +55,7 @@ class MenuBuilder:
         menu.addSeparator()
         
         self._add_radio_categories(menu, style)
-        menu.addSeparator()
+        self._categories_end = menu.addSeparator()
         
         self._add_style_submenu(menu, style, current_style)
         self._add_sleep_timer_submenu(menu, style)
@@ -49,6 +65,7 @@ class MenuBuilder:
         menu.addSeparator()
         
         self._add_controls(menu)
+        self._add_timeshift_submenu(menu, style)
         menu.addSeparator()
         
         self._add_about(menu)
@@ -57,15 +74,59 @@ class MenuBuilder:
         self._add_quit(menu)
         
         print(f"   ✅ Menu built with {len(menu.actions())} actions")
+        self.menu = menu
+        self.style = style
+        self._checked_url = None
+        self.refresh_state()
         return menu
     
+    def refresh_state(self):
+        """Stanje reprodukcije u postojećem meniju (header, stanica, snimanje, time-shift)
+        
+        Zove se na svaku promenu stanja u engine-u - pauza, seek, snimanje,
+        bitrate - pa ne pravi meni iznova.
+        """
+        if self.menu is None:
+            return
+        engine = self.tray.engine
+        self.update_header(
+            station=engine.current_station,
+            artist=self.tray.now_playing_artist,
+            title=self.tray.now_playing_title,
+            details=engine.stream_details()
+        )
+        
+        url = engine.current_url if engine.current_station else None
+        if url != self._checked_url:
+            for action, _ in self.station_actions.get(self._checked_url, []):
+                action.setChecked(False)
+            for action, _ in self.station_actions.get(url, []):
+                action.setChecked(True)
+            self._checked_url = url
+        
+        if engine.is_recording():
+            self.record_action.setText("⏹️ Stop recording")
+            self.record_action.setVisible(True)
+        else:
+            self.record_action.setText("⏺️ Record")
+            self.record_action.setVisible(bool(engine.current_station))
+        
+        self.timeshift_menu.menuAction().setVisible(engine.can_timeshift())
+        self._refresh_timeshift()
+    
+    def _refresh_timeshift(self):
+        engine = self.tray.engine
+        self.pause_action.setText("▶️ Resume" if engine.is_paused() else "⏸️ Pause")
+        self.live_action.setEnabled(engine.is_paused() or engine.timeshift_delay >= 1)
+    
     def _add_header(self, menu: QMenu, style: dict):
         """Add custom header widget"""
         self.menu_header = MenuHeader()
         self.menu_header.update_content(
             station=self.tray.engine.current_station,
             artist=self.tray.now_playing_artist,
-            title=self.tray.now_playing_title
+            title=self.tray.now_playing_title,
+            details=self.tray.engine.stream_details()
         )
         self.menu_header.setStyleSheet(style['header_css'])
         
@@ -79,7 +140,8 @@ class MenuBuilder:
             if stations:
                 self._add_category_submenu(menu, category, stations, style)
     
-    def _add_category_submenu(self, menu: QMenu, category: str, stations: list, style: dict):
+    def _add_category_submenu(self, menu: QMenu, category: str, stations: list, style: dict,
+                              before: QAction = None):
         """Add a single category submenu"""
         # Shorten category name if too long
         display_name = category[:20] + "..." if len(category) > 20 else category
@@ -90,15 +152,132 @@ class MenuBuilder:
         category_menu.setMinimumWidth(220)
         category_menu.setMaximumWidth(300)
         
+        self.category_menus[category] = category_menu
+        self.category_actions[category] = {}
+        
         # Add stations
         for name, url in stations:
-            display_station = name[:35] + "..." if len(name) > 35 else name
-            category_menu.addAction(
-                display_station, 
-                lambda u=url, n=name: self.tray.engine.play(u, n)
-            )
+            self._add_station_action(category, name, url)
+        
+        # "What's on now" - osveži snapshot-ove kad se podmeni otvori
+        category_menu.aboutToShow.connect(
+            lambda c=category: self._on_category_about_to_show(
+                self.tray.stations_manager.get_stations(c))
+        )
+        category_menu.aboutToHide.connect(self.tray.engine.player_pool.cancel_hover)
         
-        menu.addMenu(category_menu)
+        if before is not None:
+            menu.insertMenu(before, category_menu)
+        else:
+            menu.addMenu(category_menu)
+    
+    def _add_station_action(self, category: str, name: str, url: str, before: QAction = None):
+        """Dodaj stanicu u podmeni kategorije"""
+        category_menu = self.category_menus[category]
+        display_station = name[:35] + "..." if len(name) > 35 else name
+        action = QAction(display_station, category_menu)
+        action.setCheckable(True)
+        action.setChecked(url == self._checked_url)
+        action.triggered.connect(lambda checked=False, u=url, n=name: self.tray.engine.play(u, n))
+        # Stanica pod kursorom se zagreva (prebuffer) pre klika
+        action.hovered.connect(lambda u=url: self.tray.engine.prewarm(u))
+        if before is not None:
+            category_menu.insertAction(before, action)
+        else:
+            category_menu.addAction(action)
+        self.category_actions[category][url] = action
+        self.station_actions.setdefault(url, []).append((action, display_station))
+        self._apply_snapshot(url)
+    
+    def _remove_station_action(self, category: str, url: str):
+        action = self.category_actions[category].pop(url, None)
+        if action is None:
+            return
+        self.category_menus[category].removeAction(action)
+        entries = [entry for entry in self.station_actions.get(url, []) if entry[0] is not action]
+        if entries:
+            self.station_actions[url] = entries
+        else:
+            self.station_actions.pop(url, None)
+        action.deleteLater()
+    
+    # ============ Izmene kataloga bez ponovnog pravljenja menija ============
+    
+    def add_category(self, category: str):
+        """Nova kategorija - ubaci podmeni na njeno mesto u katalogu"""
+        stations = self.tray.stations_manager.get_stations(category)
+        if self.menu is None or not stations or category in self.category_menus:
+            return
+        before = self._categories_end
+        categories = self.tray.stations_manager.get_categories()
+        for following in categories[categories.index(category) + 1:]:
+            if following in self.category_menus:
+                before = self.category_menus[following].menuAction()
+                break
+        self._add_category_submenu(self.menu, category, stations, self.style, before)
+    
+    def remove_category(self, category: str):
+        """Kategorija je obrisana (ili ispražnjena) - skloni njen podmeni"""
+        category_menu = self.category_menus.get(category)
+        if category_menu is None:
+            return
+        for url in list(self.category_actions[category]):
+            self._remove_station_action(category, url)
+        del self.category_menus[category]
+        del self.category_actions[category]
+        self.menu.removeAction(category_menu.menuAction())
+        category_menu.deleteLater()
+    
+    def update_category(self, diff):
+        """Primeni CategoryDiff na postojeći podmeni"""
+        category = diff.category
+        stations = self.tray.stations_manager.get_stations(category)
+        if category not in self.category_menus:
+            self.add_category(category)
+            return
+        if not stations or diff.reordered:
+            # Prazna kategorija se ne prikazuje; novi redosled - složi podmeni iznova
+            self.remove_category(category)
+            self.add_category(category)
+            return
+        
+        for url in diff.removed:
+            self._remove_station_action(category, url)
+        for name, url in diff.renamed:
+            self._remove_station_action(category, url)
+        changed = {url for _, url in diff.added} | {url for _, url in diff.renamed}
+        actions = self.category_actions[category]
+        for index, (name, url) in enumerate(stations):
+            if url not in changed or url in actions:
+                continue
+            before = next((actions[u] for _, u in stations[index + 1:] if u in actions), None)
+            self._add_station_action(category, name, url, before)
+    
+    def _on_category_about_to_show(self, stations: list):
+        """Zatraži snapshot-ove za stanice u kategoriji (ne čeka mrežu)"""
+        sampler = self.tray.sampler
+        if sampler and self.tray.engine.config.get("show_now_on", True):
+            sampler.prefetch(url for _, url in stations)
+    
+    def update_station_snapshot(self, url: str):
+        """Sampler je doneo novi snapshot za stanicu"""
+        self._apply_snapshot(url)
+    
+    def _apply_snapshot(self, url: str):
+        """Dopiši trenutnu pesmu uz ime stanice"""
+        sampler = self.tray.sampler
+        if not sampler or not self.tray.engine.config.get("show_now_on", True):
+            return
+        snapshot = sampler.peek(url)
+        song = snapshot.display_text if snapshot else ""
+        if len(song) > 40:
+            song = song[:40] + "..."
+        for action, display_station in self.station_actions.get(url, []):
+            try:
+                action.setText(f"{display_station}  ·  {song}" if song else display_station)
+            except RuntimeError:
+                # Akcija je obrisana zajedno sa starim menijem
+                pass
     
     def _add_style_submenu(self, menu: QMenu, style: dict, current_style: str):
         """Add style selector submenu"""
@@ -148,6 +327,46 @@ class MenuBuilder:
         """Add playback controls"""
         menu.addAction("Stop", self.tray.engine.stop)
         self.tray.mute_action = menu.addAction("Mute", self.tray._toggle_mute)
+        self.record_action = menu.addAction("⏺️ Record", self._toggle_recording)
+    
+    def _toggle_recording(self):
+        engine = self.tray.engine
+        if engine.is_recording():
+            engine.stop_recording()
+        else:
+            engine.start_recording()
+    
+    def _add_timeshift_submenu(self, menu: QMenu, style: dict):
+        """Add pause/rewind submenu (vidljiv samo za stanice sa time-shift baferom)"""
+        engine = self.tray.engine
+        shift_menu = QMenu("⏪ Time-shift ▶", menu)
+        shift_menu.setStyleSheet(style['css'])
+        shift_menu.setFixedWidth(200)
+        # Kašnjenje raste dok je pauzirano - proveri "Back to live" pri otvaranju
+        shift_menu.aboutToShow.connect(self._refresh_timeshift)
+        
+        self.pause_action = shift_menu.addAction("⏸️ Pause", self._toggle_pause)
+        shift_menu.addSeparator()
+        
+        for seconds, label in [(30, "30 s"), (120, "2 min"), (600, "10 min")]:
+            shift_menu.addAction(
+                f"⏪ Back {label}",
+                lambda s=seconds: engine.seek_back(s)
+            )
+        shift_menu.addAction("⏮️ Start of this song", engine.seek_track_start)
+        shift_menu.addSeparator()
+        
+        self.live_action = shift_menu.addAction("⏩ Back to live", engine.go_live)
+        
+        menu.addMenu(shift_menu)
+        self.timeshift_menu = shift_menu
+    
+    def _toggle_pause(self):
+        engine = self.tray.engine
+        if engine.is_paused():
+            engine.resume()
+        else:
+            engine.pause()
     
     def _add_about(self, menu: QMenu):
         """Add about action"""
@@ -157,7 +376,7 @@ class MenuBuilder:
         """Add quit action"""
         menu.addAction("Quit", self.tray._quit)
     
-    def update_header(self, station=None, artist=None, title=None):
+    def update_header(self, station=None, artist=None, title=None, details=None):
         """Update menu header content"""
         if self.menu_header:
-            self.menu_header.update_content(station, artist, title)
\ No newline at end of file
+            self.menu_header.update_content(station, artist, title, details)
\ No newline at end of file
@@ -3,7 +3,7 @@ Style manager - loads themes and generates CSS
 """
 import json
 import os
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
 from pathlib import Path
 
 
@@ -11,6 +11,7 @@ class StyleManager:
     """Manages menu themes and CSS generation"""
     
     def __init__(self):
+        self.themes_path: Optional[Path] = None
         self.themes = self._load_themes()
         self._cache = {}  # Cache generated CSS
     
@@ -32,6 +33,7 @@ class StyleManager:
                     with open(path, 'r', encoding='utf-8') as f:
                         themes = json.load(f)
                         print(f"✓ Loaded themes from: {path}")
+                        self.themes_path = Path(str(path))
                         return themes
                 except Exception as e:
                     print(f"⚠️  Failed to load themes from {path}: {e}")
@@ -169,6 +171,17 @@ class StyleManager:
         self._cache.clear()
         self.themes = self._load_themes()
     
+    def watch(self, watcher, on_reload: Callable[[], None]):
+        """Ponovo učitaj teme kad se themes.json promeni (watcher: FileWatcher)"""
+        if self.themes_path is None:
+            return
+        
+        def reload(path: str):
+            self.reload_themes()
+            on_reload()
+        
+        watcher.watch(str(self.themes_path), reload)
+    
     def get_all_styles(self) -> Dict[str, Dict[str, str]]:
         """Get all styles as dict (for compatibility)"""
         return {
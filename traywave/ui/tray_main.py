@@ -2,14 +2,16 @@
 Main tray icon application
 """
 import os
-import json
 from PyQt6.QtWidgets import QSystemTrayIcon, QApplication
 from PyQt6.QtGui import QIcon, QCursor, QShortcut, QKeySequence
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 
 # Fixed imports - use absolute imports from traywave package
 from traywave.core.engine import AudioEngine
 from traywave.core.stations import StationsManager
+from traywave.core.sampler import NowPlayingSampler
+from traywave.core.settings import shared_settings
+from traywave.core.watcher import FileWatcher
 from traywave.ui.popups import VolumePopup
 from traywave.ui.dialogs import StyleSettingsDialog, AboutDialog
 from traywave.utils.geometry import is_mouse_in_tray_area
@@ -20,6 +22,9 @@ from traywave.ui.menu_positioning import MenuPositioner
 class TrayWave(QSystemTrayIcon):
     """Main system tray application"""
     
+    # Emituje se iz thread-a metadata servisa, Qt ga prebacuje u GUI thread
+    sampler_updated = pyqtSignal(str)
+    
     def __init__(self):
         super().__init__()
         
@@ -28,23 +33,45 @@ class TrayWave(QSystemTrayIcon):
         if app:
             app.setAttribute(Qt.ApplicationAttribute.AA_DontUseNativeMenuBar, True)
         
-        # Core components
-        self.stations_manager = StationsManager()
+        # Core components - config, stil i stanice dele jedno skladište
+        self.settings = shared_settings()
+        self.stations_manager = StationsManager(settings=self.settings)
         self.engine = AudioEngine()
         self.popup = VolumePopup(self.engine)
         
+        # "What's on now" sampler za podmenije kategorija
+        self.sampler = NowPlayingSampler(
+            self.engine.metadata_service,
+            on_update=self.sampler_updated.emit,
+            parser=self.engine.title_parser,
+            resolver=self.engine.resolver
+        )
+        
         # Menu builder
         self.menu_builder = MenuBuilder(self)
+        self.sampler_updated.connect(self.menu_builder.update_station_snapshot)
         
         # Setup callbacks
         self.engine.on_icon_changed(self._update_icon)
-        self.engine.on_station_changed(self._rebuild_menu)
+        # Stanje reprodukcije (pauza, seek, snimanje, bitrate) menja postojeći
+        # meni; ceo meni se pravi iznova samo kad se promeni katalog ili stil
+        self.engine.on_station_changed(self._on_playback_state_changed)
         self.engine.on_metadata_changed(self._on_metadata_changed)
         self.engine.on_sleep_timer_changed(self._on_sleep_timer_changed)
         
         # Poveži signal za promenu stanica
         self.stations_manager.stations_changed.connect(self._rebuild_menu)
         
+        # stations.json, config.json i themes.json se prate - izmena kategorije menja samo
+        # njen podmeni, izmena tema ponovo pravi meni
+        self.file_watcher = FileWatcher(parent=self)
+        self.stations_manager.category_added.connect(self.menu_builder.add_category)
+        self.stations_manager.category_removed.connect(self.menu_builder.remove_category)
+        self.stations_manager.category_changed.connect(self.menu_builder.update_category)
+        self.stations_manager.watch(self.file_watcher)
+        self.engine.config.watch(self.file_watcher)
+        self.menu_builder.style_manager.watch(self.file_watcher, self._on_themes_reloaded)
+        
         # Current playback state
         self.now_playing_artist = None
         self.now_playing_title = None
@@ -58,7 +85,6 @@ class TrayWave(QSystemTrayIcon):
         self._icon_source_logged = False
         
         # Style management
-        self.config_file = os.path.expanduser("~/.traywave_style.json")
         self.current_style = self._load_style()
         self.menu = None
         self.mute_action = None
@@ -88,22 +114,13 @@ class TrayWave(QSystemTrayIcon):
     
     def _load_style(self) -> str:
         """Load saved style from config"""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    return config.get('style', 'teal')
-        except:
-            pass
-        return 'teal'
+        return self.settings.get("ui", {}).get("style", "teal")
     
     def _save_style(self, style_name: str):
         """Save style to config"""
-        try:
-            with open(self.config_file, 'w') as f:
-                json.dump({'style': style_name}, f)
-        except:
-            pass
+        ui = dict(self.settings.get("ui", {}))
+        ui["style"] = style_name
+        self.settings.put("ui", ui)
     
     # ============ Menu Management ============
     
@@ -131,6 +148,16 @@ class TrayWave(QSystemTrayIcon):
         
         print(f"✅ Menu rebuilt")
     
+    def _on_playback_state_changed(self):
+        """Engine javlja promenu stanice ili stanja reprodukcije"""
+        self.menu_builder.refresh_state()
+        self._update_tooltip()
+    
+    def _on_themes_reloaded(self):
+        """themes.json je izmenjen - primeni nove boje"""
+        print("🎨 themes.json changed, reloading styles")
+        self._rebuild_menu()
+    
     def change_menu_style(self, style_name: str):
         """Change menu style"""
         if style_name == self.current_style:
@@ -313,7 +340,8 @@ class TrayWave(QSystemTrayIcon):
             self.menu_builder.update_header(
                 station=self.engine.current_station,
                 artist=artist,
-                title=title
+                title=title,
+                details=self.engine.stream_details()
             )
     
     # ============ UI Actions ============
@@ -368,14 +396,16 @@ class TrayWave(QSystemTrayIcon):
     def _update_tooltip(self):
         """Update tray tooltip"""
         if self.engine.current_station:
+            details = self.engine.stream_details()
+            station = f"{self.engine.current_station} ({details})" if details else self.engine.current_station
             if self.now_playing_title:
                 if self.now_playing_artist:
                     song_info = f"{self.now_playing_artist} - {self.now_playing_title}"
                 else:
                     song_info = self.now_playing_title
-                status = f"Playing: {self.engine.current_station}\n{song_info}"
+                status = f"Playing: {station}\n{song_info}"
             else:
-                status = f"Playing: {self.engine.current_station}"
+                status = f"Playing: {station}"
         else:
             status = "Stopped"
         
@@ -389,5 +419,6 @@ class TrayWave(QSystemTrayIcon):
     
     def _quit(self):
         """Quit application"""
-        self.engine.stop()
+        self.engine.shutdown()
+        self.stations_manager.flush()
         QApplication.quit()
\ No newline at end of file
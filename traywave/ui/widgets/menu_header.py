@@ -31,6 +31,11 @@ class MenuHeader(QWidget):
         self.station_label.setFont(QFont("", 11, QFont.Weight.DemiBold))
         self.station_label.setWordWrap(True)
         
+        # Stream details (codec, bitrate)
+        self.details_label = QLabel("")
+        self.details_label.setFont(QFont("", 8))
+        self.details_label.setVisible(False)
+        
         # Song label
         self.song_label = QLabel("")
         self.song_label.setFont(QFont("", 10))
@@ -39,9 +44,10 @@ class MenuHeader(QWidget):
         
         layout.addWidget(self.now_playing_label)
         layout.addWidget(self.station_label)
+        layout.addWidget(self.details_label)
         layout.addWidget(self.song_label)
     
-    def update_content(self, station=None, artist=None, title=None):
+    def update_content(self, station=None, artist=None, title=None, details=None):
         """Update header content with current playback info"""
         # Update station
         if station:
@@ -50,6 +56,10 @@ class MenuHeader(QWidget):
         else:
             self.station_label.setText("📻 TrayWave")
         
+        # Update stream details
+        self.details_label.setText(details or "")
+        self.details_label.setVisible(bool(station and details))
+        
         # Update song info
         if title:
             if artist:
@@ -63,5 +73,7 @@ class MenuHeader(QWidget):
     def clear(self):
         """Clear all content"""
         self.station_label.setText("📻 TrayWave")
+        self.details_label.setText("")
+        self.details_label.setVisible(False)
         self.song_label.setText("")
         self.song_label.setVisible(False)
\ No newline at end of file